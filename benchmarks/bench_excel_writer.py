@@ -0,0 +1,99 @@
+"""
+Excel writer benchmark: streaming (write-only) vs pandas ExcelWriter
+✅ 뉴스 시트 형태의 합성 데이터(기본 10만 행)를 백엔드별 별도 프로세스에서 기록
+✅ 소요 시간 / 최대 RSS 비교 후 두 파일의 시트 이름과 열 제목 확인
+
+Usage:
+    python benchmarks/bench_excel_writer.py [--rows 100000]
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import argparse
+import tempfile
+import subprocess
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+
+def build_frame(n_rows):
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    companies = np.array(['NVIDIA', 'AMD', 'Intel', 'Micron', 'SK Hynix', 'Samsung'])
+    return pd.DataFrame({
+        'Company': companies[rng.integers(0, len(companies), n_rows)],
+        'Country': np.where(rng.random(n_rows) > 0.5, 'US', 'KR'),
+        'Title': [f'Datacenter AI headline number {i} with some extra words' for i in range(n_rows)],
+        'Description': [f'Summary text for article {i}, trimmed to a few sentences.' for i in range(n_rows)],
+        'Score': rng.choice([1, 6, 10], n_rows),
+        'Relevance': rng.random(n_rows) * 50,
+        'Publisher': 'Reuters',
+        'Date': pd.Timestamp('2026-01-01') + pd.to_timedelta(rng.integers(0, 86400 * 7, n_rows), unit='s'),
+        'Link': [f'https://example.com/news/{i}' for i in range(n_rows)],
+    })
+
+
+def child(backend, n_rows, path):
+    """백엔드 1개로 기록하고 시간/최대 RSS를 JSON으로 출력"""
+    from excel_writer import WorkbookWriter
+
+    df = build_frame(n_rows)
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    with WorkbookWriter(path, backend=backend) as book:
+        book.write_sheet('News', df)
+        book.write_sheet('Top', df.head(100))
+    elapsed = time.perf_counter() - started
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux ru_maxrss 단위는 KB
+    print(json.dumps({'seconds': elapsed, 'peak_rss_kb': peak_rss, 'base_rss_kb': base_rss}))
+
+
+def sheet_headers(path):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True)
+    headers = {ws.title: [c.value for c in next(ws.iter_rows(max_row=1))] for ws in wb.worksheets}
+    wb.close()
+    return headers
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark workbook backends')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--child', choices=['streaming', 'pandas'], help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.rows, args.path)
+        return
+
+    print(f"Rows: {args.rows}")
+    files = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in ('pandas', 'streaming'):
+            path = os.path.join(tmp, f'{backend}.xlsx')
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', backend,
+                 '--rows', str(args.rows), '--path', path],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            files[backend] = path
+            print(f"  {backend:<10} {result['seconds']:7.2f}s   peak RSS {result['peak_rss_kb'] / 1024:7.1f} MB "
+                  f"(+{(result['peak_rss_kb'] - result['base_rss_kb']) / 1024:.1f} MB while writing)   "
+                  f"{os.path.getsize(path) / 1024 / 1024:.1f} MB file")
+
+        same = sheet_headers(files['pandas']) == sheet_headers(files['streaming'])
+        print(f"  sheet names and headers identical: {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Keyword scorer benchmark: compiled trie regex vs per-keyword substring loop
+✅ 키워드 수 / 기사 수를 늘려 가며 채점 시간 비교 (정규식 스캔 / 키워드별 검사 / 자동 선택)
+✅ 등급 점수가 기존 방식과 같은지, 두 채점 경로의 키워드별 횟수가 같은지 확인
+
+Usage:
+    python benchmarks/bench_keyword_scorer.py [--keywords 20 150 500 3000] [--articles 20000]
+"""
+
+import os
+import sys
+import time
+import random
+import string
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from keyword_scorer import KeywordScorer  # noqa: E402
+
+
+def loop_score(title, keywords_dict):
+    """기존 채점 방식 (키워드별 부분 문자열 검사, 첫 매칭에서 중단)"""
+    text = title.lower()
+    for keyword in keywords_dict.get('high', []):
+        if keyword.lower() in text:
+            return 10
+    for keyword in keywords_dict.get('medium', []):
+        if keyword.lower() in text:
+            return 6
+    return 1
+
+
+def loop_hits(title, keywords_dict):
+    """전체 키워드 등장 횟수를 루프로 셀 때의 비용"""
+    text = title.lower()
+    return {k: text.count(k.lower()) for tier in keywords_dict.values() for k in tier if k.lower() in text}
+
+
+def random_word(rng, length):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+
+def build_inputs(n_keywords, n_articles, seed=0):
+    rng = random.Random(seed)
+    vocab = [random_word(rng, rng.randint(4, 10)) for _ in range(max(n_keywords * 2, 200))]
+    keywords = rng.sample(vocab, n_keywords)
+    split = max(n_keywords // 2, 1)
+    keywords_dict = {'high': keywords[:split], 'medium': keywords[split:]}
+    titles = [' '.join(rng.choice(vocab) for _ in range(rng.randint(6, 14))) for _ in range(n_articles)]
+    return keywords_dict, titles
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark keyword relevance scoring')
+    parser.add_argument('--keywords', type=int, nargs='+', default=[20, 150, 500, 3000])
+    parser.add_argument('--articles', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'keywords':>8} {'articles':>9} {'compile':>9} {'regex':>9} {'per-kw':>9} {'auto':>9} "
+          f"{'loop score':>11} {'loop hits':>10}  same")
+    for n_keywords in args.keywords:
+        keywords_dict, titles = build_inputs(n_keywords, args.articles)
+
+        scorer, t_compile = timed(lambda: KeywordScorer(keywords_dict))
+        regex, t_regex = timed(lambda: KeywordScorer(keywords_dict, loop_max_keywords=0).score_batch(titles))
+        per_kw, t_per_kw = timed(
+            lambda: KeywordScorer(keywords_dict, loop_max_keywords=n_keywords).score_batch(titles))
+        auto, t_auto = timed(lambda: scorer.score_batch(titles))
+        loop, t_loop = timed(lambda: [loop_score(t, keywords_dict) for t in titles])
+        _, t_hits = timed(lambda: [loop_hits(t, keywords_dict) for t in titles])
+
+        same = [r['score'] for r in auto] == loop and \
+            [r['keyword_hits'] for r in regex] == [r['keyword_hits'] for r in per_kw]
+        print(f"{n_keywords:>8} {args.articles:>9} {t_compile:>8.3f}s {t_regex:>8.3f}s {t_per_kw:>8.3f}s "
+              f"{t_auto:>8.3f}s {t_loop:>10.3f}s {t_hits:>9.3f}s  {same}")
+
+
+if __name__ == '__main__':
+    main()
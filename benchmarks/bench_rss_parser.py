@@ -0,0 +1,90 @@
+"""
+RSS parser benchmark: streaming iterparse vs feedparser
+✅ Google News 검색 RSS 형태의 합성 피드로 파싱 시간 / 피크 메모리 비교
+✅ 두 경로의 결과가 같은지 확인
+
+Usage:
+    python benchmarks/bench_rss_parser.py [--items 100] [--max-items 20] [--repeat 20]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from rss_parser import parse_google_news_stream, parse_google_news_feedparser  # noqa: E402
+
+
+def build_feed(n_items):
+    """Google News 검색 RSS와 같은 구조의 피드 (description은 이스케이프된 HTML)"""
+    now = datetime.utcnow().replace(microsecond=0)
+    items = []
+    for i in range(n_items):
+        pub = now - timedelta(hours=i * 3)
+        link = f'https://news.google.com/rss/articles/CBMi{i:06d}?oc=5'
+        items.append(
+            '<item>'
+            f'<title>Datacenter AI chip demand story number {i} - Publisher {i % 7}</title>'
+            f'<link>{link}</link>'
+            f'<guid isPermaLink="false">CBMi{i:06d}</guid>'
+            f'<pubDate>{format_datetime(pub.replace(tzinfo=None))}</pubDate>'
+            f'<description>&lt;a href="{link}" target="_blank"&gt;Datacenter AI chip demand '
+            f'story number {i}&lt;/a&gt;&amp;nbsp;&amp;nbsp;&lt;font color="#6f6f6f"&gt;'
+            f'Publisher {i % 7}&lt;/font&gt;</description>'
+            f'<source url="https://publisher{i % 7}.example.com">Publisher {i % 7}</source>'
+            '</item>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+        '<generator>NFE/5.0</generator><title>"datacenter" - Google News</title>'
+        '<link>https://news.google.com/search?q=datacenter</link><language>en-US</language>'
+        + ''.join(items) +
+        '</channel></rss>'
+    ).encode('utf-8')
+
+
+def measure(func, content, max_items, cutoff, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func(content, set(), max_items, cutoff)
+    elapsed = (time.perf_counter() - started) / repeat
+
+    tracemalloc.start()
+    func(content, set(), max_items, cutoff)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Google News RSS parsing')
+    parser.add_argument('--items', type=int, default=100, help='items per feed')
+    parser.add_argument('--max-items', type=int, default=20, help='accepted items before early stop')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    content = build_feed(args.items)
+    cutoff = datetime.utcnow() - timedelta(days=7)
+    print(f"Feed: {args.items} items, {len(content) / 1024:.1f}KB, max_items={args.max_items}")
+
+    results = {}
+    for name, func in (('feedparser', parse_google_news_feedparser),
+                       ('iterparse', parse_google_news_stream)):
+        news, elapsed, peak = measure(func, content, args.max_items, cutoff, args.repeat)
+        results[name] = news
+        print(f"  {name:<10} {elapsed * 1000:8.2f} ms/feed   peak {peak / 1024:8.1f} KB   "
+              f"{len(news)} items")
+
+    same = [(n['title'], n['link'], n['publisher'], n['date'][:19]) for n in results['feedparser']] == \
+           [(n['title'], n['link'], n['publisher'], n['date'][:19]) for n in results['iterparse']]
+    print(f"  results identical (title/link/publisher/date): {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Selection backtest benchmark: vectorized month-end replay vs per-month indicator recompute
+✅ 합성 가격 패널(기본 400종목 × 10년, 거래소별 휴장일/중간 상장·폐지 포함)과 합성 후보 Pool
+✅ 벡터화 백테스트 1회 vs 월말마다 compute_indicators + 점수 계산 루프
+✅ 두 방식의 세부영역별 선정 종목이 모두 같은지 확인
+
+Usage:
+    python benchmarks/bench_selection_backtest.py [--tickers 400] [--years 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from indicators import compute_indicators  # noqa: E402
+from selection_model import MIN_BARS, selection_score, volume_trend_value  # noqa: E402
+from selection_backtest import MAX_STALE_SESSIONS, run_backtest, month_end_rows  # noqa: E402
+
+
+def build_inputs(n_tickers, years, pool_size=4):
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range(end='2026-09-30', periods=252 * years)
+    tickers = [f'T{i:04d}' + ('.KS' if i % 3 == 0 else '') for i in range(n_tickers)]
+    returns = rng.normal(0.0004, 0.02, (len(index), n_tickers))
+    close = pd.DataFrame(100 * np.exp(np.cumsum(returns, axis=0)), index=index, columns=tickers)
+    volume = pd.DataFrame(rng.uniform(1e5, 1e7, close.shape), index=index, columns=tickers)
+
+    # .KS 종목은 다른 휴장일, 일부 종목은 중간 상장
+    holidays = rng.choice(len(index), 15 * years, replace=False)
+    close.iloc[holidays, [i for i, t in enumerate(tickers) if t.endswith('.KS')]] = np.nan
+    for col in rng.choice(n_tickers, n_tickers // 10, replace=False):
+        close.iloc[:rng.integers(0, len(index) // 2), col] = np.nan
+    # 일부 종목은 중간에 상장폐지
+    for col in rng.choice(n_tickers, n_tickers // 20, replace=False):
+        close.iloc[rng.integers(len(index) // 2, len(index)):, col] = np.nan
+
+    pools = {
+        f'S{s:03d}': [{'name': t, 'ticker': t, 'exchange': 'US'} for t in tickers[s:s + pool_size]]
+        for s in range(0, n_tickers, pool_size)
+    }
+    market_caps = {t: float(rng.uniform(5e8, 5e11)) for t in tickers}
+    return close, volume, market_caps, pools
+
+
+def reference_picks(close, volume, market_caps, pools):
+    """월말마다 그 날까지 잘라서 지표 엔진으로 재계산 (기존 방식을 반복)"""
+    latest = close.ffill().iloc[-1]
+    picks = {}
+    for row in month_end_rows(close.index):
+        ind = compute_indicators(close.iloc[:row + 1], volume.iloc[:row + 1])
+        # 월말에서 마지막 봉까지 거리 (역순 첫 유효 봉)
+        stale = pd.Series(close.iloc[:row + 1].notna().to_numpy()[::-1].argmax(axis=0), index=close.columns)
+        ind = ind[(ind['bars'] >= MIN_BARS) & (stale <= MAX_STALE_SESSIONS)]
+        caps = pd.Series(market_caps).reindex(ind.index) / latest.reindex(ind.index) * ind['price']
+        scores = pd.Series(selection_score(
+            caps.to_numpy(), volume_trend_value(ind['avg_volume_20'], ind['avg_volume_60']),
+            ind['return_3m'].to_numpy(), ind['return_6m'].to_numpy(),
+            (ind['ma_20'] > ind['ma_60']).to_numpy(), ind['rsi'].to_numpy(),
+            ind['price'].to_numpy(), ind['ma_20'].to_numpy()), index=ind.index, dtype=float)
+        for sub_sector, candidates in pools.items():
+            pool = scores.reindex([c['ticker'] for c in candidates]).dropna()
+            if len(pool):
+                picks[(close.index[row], sub_sector)] = pool.idxmax()
+    return picks
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the selection backtester')
+    parser.add_argument('--tickers', type=int, default=400)
+    parser.add_argument('--years', type=int, default=10)
+    args = parser.parse_args()
+
+    close, volume, market_caps, pools = build_inputs(args.tickers, args.years)
+    print(f"Panel: {close.shape[0]} days × {close.shape[1]} tickers, {len(pools)} sub-sectors, "
+          f"{len(month_end_rows(close.index))} month-ends")
+
+    started = time.perf_counter()
+    result = run_backtest(close, volume, market_caps, pools=pools)
+    vectorized = time.perf_counter() - started
+    print(f"  vectorized   {vectorized:7.3f}s")
+
+    started = time.perf_counter()
+    expected = reference_picks(close, volume, market_caps, pools)
+    loop = time.perf_counter() - started
+    print(f"  per-month    {loop:7.3f}s   ({loop / vectorized:.0f}x)")
+
+    got = {(row.date, row.sub_sector): row.ticker for row in result.picks.itertuples()}
+    print(f"  picks identical: {got == expected} ({len(got)} picks)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Selection sweep benchmark: broadcast rescoring vs per-config if/elif loop
+✅ 합성 후보(기본 12개월 × 16개 세부영역 × 3종목)와 기본 조합 그리드(약 2만 개)
+✅ 벡터화 전체 조합 vs 조합별 파이썬 구간표 루프(앞쪽 --sample 개만 실행 후 환산)
+✅ 표본 조합의 세부영역별 1위가 같은지 확인
+
+Usage:
+    python benchmarks/bench_selection_sweep.py [--months 12] [--sample 200]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from selection_model import technical_points  # noqa: E402
+from selection_sweep import LADDERS, BASE_WEIGHTS, build_grid, run_sweep  # noqa: E402
+
+
+def build_candidates(months, sub_sectors=16, pool_size=3):
+    rng = np.random.default_rng(0)
+    rows = []
+    for date in pd.date_range('2026-01-01', periods=months, freq='MS').strftime('%Y-%m-%d'):
+        for s in range(sub_sectors):
+            for k in range(pool_size):
+                price = rng.uniform(20, 500)
+                ma_20, ma_60 = price * rng.uniform(0.9, 1.1, 2)
+                rows.append({
+                    'date': date, 'sub_sector': f'S{s:02d}', 'ticker': f'T{s:02d}{k}',
+                    'market_cap': rng.uniform(5e8, 3e11), 'volume_trend': rng.uniform(0.5, 2.0),
+                    'return_3m': rng.uniform(-30, 50), 'return_6m': rng.uniform(-30, 70),
+                    'golden_cross': ma_20 > ma_60, 'rsi': rng.uniform(20, 80),
+                    'price': price, 'ma_20': ma_20,
+                })
+    return pd.DataFrame(rows)
+
+
+def ladder(value, thresholds, points, floor):
+    for threshold, point in zip(thresholds, points):
+        if value >= threshold:
+            return point
+    return floor
+
+
+def loop_winners(candidates, weights, scales):
+    """조합마다 행마다 구간표를 돌려 점수 → 세부영역별 1위 (기존 방식)"""
+    records = candidates.to_dict('records')
+    winners = []
+    for w, s in zip(weights, scales):
+        factors = w / BASE_WEIGHTS
+        best = {}
+        for row in records:
+            score = factors[-1] * float(technical_points(row['golden_cross'], row['rsi'], row['price'], row['ma_20']))
+            for i, (name, tiers, floor) in enumerate(LADDERS):
+                score += ladder(row[name], [t * s[i] for t, _ in tiers],
+                                [p * factors[i] for _, p in tiers], floor * factors[i])
+            key = (row['date'], row['sub_sector'])
+            if key not in best or score > best[key][0]:
+                best[key] = (score, row['ticker'])
+        winners.append([ticker for _, ticker in best.values()])
+    return np.array(winners, dtype=object)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the selection weight/threshold sweep')
+    parser.add_argument('--months', type=int, default=12)
+    parser.add_argument('--sample', type=int, default=200)
+    args = parser.parse_args()
+
+    candidates = build_candidates(args.months)
+    weights, scales = build_grid()
+    print(f"Candidates: {len(candidates)} rows, configs: {len(weights)}")
+
+    started = time.perf_counter()
+    result = run_sweep(candidates, weights, scales)
+    vectorized = time.perf_counter() - started
+    print(f"  vectorized        {vectorized:7.2f}s")
+
+    sample = min(args.sample, len(weights))
+    started = time.perf_counter()
+    expected = loop_winners(candidates, weights[:sample], scales[:sample])
+    loop = (time.perf_counter() - started) * len(weights) / sample
+    print(f"  per-config loop   {loop:7.2f}s (estimated from {sample} configs, {loop / vectorized:.0f}x)")
+    print(f"  sample winners identical: {bool((result.winners[:sample] == expected).all())}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+동시 조회 실행기
+✅ 작업 수 제한 스레드 풀 (FETCH_WORKERS)
+✅ 업스트림 호스트별 토큰 버킷 속도 제한
+✅ 작업별 타임아웃 (제출 시각 기준 마감), 결과는 입력 순서대로 반환 (진행 상황 출력 순서 유지)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+FETCH_WORKERS = int(os.environ.get('FETCH_WORKERS', 8))
+FETCH_TIMEOUT = float(os.environ.get('FETCH_TIMEOUT', 30))
+
+# 호스트별 (초당 요청 수, 버스트 크기)
+HOST_RATE_LIMITS = {
+    'yahoo': (5.0, 10),
+    'papago': (5.0, 5),
+    'naver_search': (8.0, 8),
+    'google_news': (4.0, 4),
+    'telegram': (1.0, 3),
+}
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 (acquire는 토큰이 생길 때까지 대기)"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        """토큰이 있으면 소비하고 0, 없으면 다음 토큰까지 남은 초 반환"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(host):
+    """호스트별 공유 토큰 버킷 (설정이 없는 호스트는 None → 제한 없음)"""
+    if host not in HOST_RATE_LIMITS:
+        return None
+    with _limiters_lock:
+        if host not in _limiters:
+            rate, capacity = HOST_RATE_LIMITS[host]
+            _limiters[host] = TokenBucket(rate, capacity)
+        return _limiters[host]
+
+
+def run_concurrent(func, items, host=None, max_workers=None, timeout=None, on_result=None):
+    """
+    items 각각에 func(item)을 동시에 실행
+
+    Args:
+        host: 속도 제한을 적용할 업스트림 호스트 키 (HOST_RATE_LIMITS)
+        timeout: 작업별 제한 시간(초). 작업은 빈 자리와 속도 제한 토큰이 있을 때만
+            제출하고 제출 시각부터 마감을 재므로 대기 시간은 포함되지 않는다.
+            초과한 작업은 TimeoutError로 처리하고 결과를 버린다
+        on_result: on_result(idx, item, result, error) — 입력 순서대로 호출
+
+    Returns:
+        [(result, error), ...] 입력 순서
+
+    Note:
+        실행 중인 스레드는 강제 종료할 수 없다. 마감을 넘긴 작업은 버려진 채
+        func이 반환할 때까지 백그라운드에서 계속 돌고, 그 자리는 새 스레드가 채운다.
+        따라서 func 자체에 네트워크 타임아웃이 있어야 한다 (인터프리터 종료 시에도
+        concurrent.futures가 남은 스레드를 기다림).
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    max_workers = max_workers or FETCH_WORKERS
+    timeout = timeout or FETCH_TIMEOUT
+    limiter = get_rate_limiter(host) if host else None
+
+    outcomes = [None] * len(items)
+    reported = 0
+    pending = deque(enumerate(items))
+    in_flight = {}  # future → (idx, 마감 시각)
+
+    def fill():
+        """빈 자리만큼 제출 (토큰은 제출 전에 확보). 토큰이 모자라면 다음 토큰까지 남은 초 반환"""
+        while pending and len(in_flight) < max_workers:
+            if limiter:
+                delay = limiter.try_acquire()
+                if delay > 0:
+                    return delay
+            idx, item = pending.popleft()
+            in_flight[executor.submit(func, item)] = (idx, time.monotonic() + timeout)
+        return None
+
+    # 스레드 상한은 항목 수: 버려진 작업이 스레드를 붙잡고 있어도 새 작업은 새 스레드에서 시작
+    executor = ThreadPoolExecutor(max_workers=len(items))
+    try:
+        while pending or in_flight:
+            token_wait = fill()
+            now = time.monotonic()
+            waits = [deadline - now for _, deadline in in_flight.values()]
+            if token_wait is not None:
+                waits.append(token_wait)
+            if in_flight:
+                done, _ = wait(in_flight, timeout=max(min(waits), 0), return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(token_wait)
+                done = ()
+
+            for future in done:
+                idx, _ = in_flight.pop(future)
+                try:
+                    outcomes[idx] = (future.result(), None)
+                except Exception as e:
+                    outcomes[idx] = (None, e)
+
+            # 마감을 넘긴 작업은 취소(아직 시작 전이면) 또는 결과를 무시
+            now = time.monotonic()
+            for future, (idx, deadline) in list(in_flight.items()):
+                if deadline <= now:
+                    future.cancel()
+                    del in_flight[future]
+                    outcomes[idx] = (None, TimeoutError(f'{timeout:g}초 초과'))
+
+            while reported < len(items) and outcomes[reported] is not None:
+                if on_result:
+                    on_result(reported, items[reported], *outcomes[reported])
+                reported += 1
+    finally:
+        # 버린 작업은 기다리지 않음 (스레드는 func이 반환하면 스스로 종료)
+        executor.shutdown(wait=False, cancel_futures=True)
+    return outcomes
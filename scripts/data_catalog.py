@@ -0,0 +1,245 @@
+"""
+Catalog of run outputs under market_data/ and analysis_reports/ (market_data/catalog.json)
+✅ 실행마다 데이터셋/날짜/행 수/종목 목록/스키마 버전/파일 경로 기록 (임시 파일 → rename)
+✅ 최신 실행, 종목이 특정 시그널에 등장한 날짜, 누락된 날짜를 데이터 파일 없이 조회
+✅ CLI: python scripts/data_catalog.py {list,latest,ticker,missing,rebuild} ...
+"""
+
+import os
+import sys
+import json
+import argparse
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from report_signals import EXCEL_SIGNAL_SHEETS
+from snapshot_archive import PART_FILE, _date_key, _partition_dir, list_dates
+
+CATALOG_FILE = 'market_data/catalog.json'
+CATALOG_VERSION = 1
+
+# 데이터셋별 행 스키마 버전 (열 구성이 바뀌면 올림)
+SCHEMA_VERSIONS = {
+    'datacenter_stocks': 1,
+    'stock_selection': 1,
+    'news': 1,
+}
+
+
+def load_catalog(path=CATALOG_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {'version': CATALOG_VERSION, 'datasets': {}}
+
+
+def save_catalog(catalog, path=CATALOG_FILE):
+    """원자적 저장 (임시 파일 → rename)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    catalog['version'] = CATALOG_VERSION
+    catalog['updated_at'] = datetime.now().isoformat(timespec='seconds')
+    tmp_file = path + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_file, path)
+
+
+def record_run(dataset, date, rows, tickers, files, signals=None, extra=None, path=CATALOG_FILE):
+    """
+    실행 1건 기록 (같은 데이터셋/날짜는 덮어씀)
+
+    Args:
+        files: 이번 실행이 만든 파일 경로 목록 (None이나 없는 파일은 제외)
+        signals: {시그널 이름: [ticker, ...]} — 시그널별 등장 종목
+        extra: 데이터셋별 추가 정보 (예: 선정 종목)
+    """
+    catalog = load_catalog(path)
+    entry = {
+        'rows': int(rows),
+        'tickers': sorted(set(tickers)),
+        'schema_version': SCHEMA_VERSIONS.get(dataset, 1),
+        'files': [f for f in files if f and os.path.exists(f)],
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    if signals is not None:
+        entry['signals'] = {name: sorted(set(t)) for name, t in signals.items()}
+    if extra:
+        entry.update(extra)
+    catalog.setdefault('datasets', {}).setdefault(dataset, {})[_date_key(date)] = entry
+    save_catalog(catalog, path)
+    return entry
+
+
+# ============================================================================
+# LOOKUPS
+# ============================================================================
+
+def _runs(catalog, dataset):
+    return catalog.get('datasets', {}).get(dataset, {})
+
+
+def latest(catalog, dataset):
+    """가장 최근 실행 (date, entry) 또는 None"""
+    runs = _runs(catalog, dataset)
+    if not runs:
+        return None
+    date = max(runs)
+    return date, runs[date]
+
+
+def _signal_name(signal):
+    """엑셀 시트 이름(Up_Stocks 등)이면 시그널 이름으로 변환 (대소문자 무시)"""
+    sheets = {sheet.lower(): name for sheet, name, _, _ in EXCEL_SIGNAL_SHEETS}
+    return sheets.get(signal.lower(), signal)
+
+
+def _match_signal(entry, signal):
+    """시그널 이름 또는 엑셀 시트 이름(Up_Stocks, Volume_Spike 등)을 대소문자 무시로 매칭"""
+    wanted = _signal_name(signal).lower()
+    for name, tickers in entry.get('signals', {}).items():
+        if name.lower() == wanted:
+            return tickers
+    return []
+
+
+def dates_with_ticker(catalog, dataset, ticker, signal=None):
+    """종목이 포함된(signal이 주어지면 해당 시그널에 등장한) 날짜 목록"""
+    dates = []
+    for date, entry in sorted(_runs(catalog, dataset).items()):
+        tickers = _match_signal(entry, signal) if signal else entry.get('tickers', [])
+        if ticker in tickers:
+            dates.append(date)
+    return dates
+
+
+def missing_days(catalog, dataset, start, end=None, weekdays_only=True):
+    """기간 내 실행 기록이 없는 날짜 (기본: 주말 제외)"""
+    runs = _runs(catalog, dataset)
+    day = datetime.strptime(_date_key(start), '%Y-%m-%d')
+    last = datetime.strptime(_date_key(end or datetime.now()), '%Y-%m-%d')
+    missing = []
+    while day <= last:
+        key = day.strftime('%Y-%m-%d')
+        if key not in runs and not (weekdays_only and day.weekday() >= 5):
+            missing.append(key)
+        day += timedelta(days=1)
+    return missing
+
+
+def _read_partition(part, columns):
+    """
+    파티션에서 있는 열만 읽음 (읽기 실패 시 경고 후 None)
+
+    보관소 초기에 기록된 파티션에는 없는 열이 있을 수 있으므로 (예: 초기 news 파티션의
+    ticker) 스키마를 먼저 보고 없는 열은 빼고 읽는다.
+    """
+    try:
+        names = set(pq.read_schema(part).names)
+        frame = pd.read_parquet(part, columns=[c for c in columns if c in names])
+    except Exception as e:
+        print(f"  [WARN] catalog rebuild {part}: {str(e)[:80]}")
+        return None
+    missing = [c for c in columns if c not in names]
+    if missing:
+        print(f"  [WARN] catalog rebuild {part}: no column {', '.join(missing)}")
+    return frame
+
+
+def rebuild_from_archive(path=CATALOG_FILE):
+    """
+    Parquet 보관소(market_data/archive)를 읽어 카탈로그 재구성
+
+    기존 항목의 파일 목록은 유지하고 행 수/종목/시그널만 보관소 기준으로 갱신한다.
+    ticker 열이 없는 파티션은 행 수만 갱신하고 종목 목록은 기존 값을 유지한다.
+    """
+    catalog = load_catalog(path)
+    datasets = catalog.setdefault('datasets', {})
+    for dataset in SCHEMA_VERSIONS:
+        for date in list_dates(dataset):
+            part = f'{_partition_dir(dataset, date)}/{PART_FILE}'
+            frame = _read_partition(part, ['ticker'])
+            if frame is None:
+                continue
+            entry = datasets.setdefault(dataset, {}).setdefault(date, {'files': []})
+            entry['rows'] = int(len(frame))
+            entry['schema_version'] = SCHEMA_VERSIONS.get(dataset, 1)
+            if 'ticker' in frame.columns:
+                entry['tickers'] = sorted(set(frame['ticker'].dropna()))
+            else:
+                entry.setdefault('tickers', [])
+            if part not in entry['files']:
+                entry['files'].append(part)
+
+    for date in list_dates('datacenter_signals'):
+        part = f"{_partition_dir('datacenter_signals', date)}/{PART_FILE}"
+        frame = _read_partition(part, ['ticker', 'signal'])
+        if frame is None or not {'ticker', 'signal'} <= set(frame.columns):
+            continue
+        entry = datasets.setdefault('datacenter_stocks', {}).setdefault(date, {'files': []})
+        entry['signals'] = {name: sorted(set(group)) for name, group in frame.groupby('signal')['ticker']}
+
+    save_catalog(catalog, path)
+    return catalog
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query the market_data catalog')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('list', help='데이터셋별 실행 수와 기간')
+
+    p_latest = sub.add_parser('latest', help='최근 실행')
+    p_latest.add_argument('dataset')
+
+    p_ticker = sub.add_parser('ticker', help='종목이 등장한 날짜')
+    p_ticker.add_argument('ticker')
+    p_ticker.add_argument('--dataset', default='datacenter_stocks')
+    p_ticker.add_argument('--signal', help='시그널 이름 또는 시트 이름 (예: Volume_Spike)')
+
+    p_missing = sub.add_parser('missing', help='기록이 없는 날짜')
+    p_missing.add_argument('dataset')
+    p_missing.add_argument('--start', required=True)
+    p_missing.add_argument('--end')
+    p_missing.add_argument('--all-days', action='store_true', help='주말 포함')
+
+    sub.add_parser('rebuild', help='Parquet 보관소에서 카탈로그 재구성')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'rebuild':
+        catalog = rebuild_from_archive()
+        for dataset, runs in sorted(catalog['datasets'].items()):
+            print(f"{dataset}: {len(runs)} runs")
+        return
+
+    catalog = load_catalog()
+    if args.command == 'list':
+        for dataset, runs in sorted(catalog.get('datasets', {}).items()):
+            if runs:
+                print(f"{dataset}: {len(runs)} runs ({min(runs)} ~ {max(runs)})")
+    elif args.command == 'latest':
+        found = latest(catalog, args.dataset)
+        if not found:
+            print(f"no runs for {args.dataset}")
+            return 1
+        date, entry = found
+        print(json.dumps({'date': date, **entry}, indent=2, ensure_ascii=False))
+    elif args.command == 'ticker':
+        for date in dates_with_ticker(catalog, args.dataset, args.ticker, args.signal):
+            print(date)
+    elif args.command == 'missing':
+        for date in missing_days(catalog, args.dataset, args.start, args.end,
+                                 weekdays_only=not args.all_days):
+            print(date)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
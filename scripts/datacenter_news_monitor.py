@@ -5,19 +5,27 @@ Datacenter News Monitor v11.0 - GitHub Actions Compatible
 """
 
 import yfinance as yf
-import requests
 import os
-import json
 from datetime import datetime, timedelta
-import time
+import asyncio
 import warnings
 from collections import defaultdict
 from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-import feedparser
 from urllib.parse import quote
-import re
-import pandas as pd
+import http_client
+from concurrent_fetch import run_concurrent
+from translation_cache import TranslationCache, cache_key
+from seen_link_store import SeenLinkStore
+from http_cache import HttpCache, FRESH, OK, NOT_MODIFIED, ERROR
+from news_query_planner import plan_queries, attribute_companies
+from rss_parser import parse_google_news
+from keyword_scorer import KeywordScorer
+from near_duplicates import collapse_near_duplicates
+from url_canonical import canonical_url
+from excel_writer import WorkbookWriter
+from snapshot_archive import write_snapshot, records_to_frame, save_json
+from data_catalog import record_run
 
 warnings.filterwarnings('ignore')
 
@@ -77,43 +85,150 @@ KOREAN_KEYWORDS = {
 # TRANSLATION - NAVER PAPAGO
 # ============================================================================
 
-def translate_with_papago(text, max_length=4900):
-    """네이버 파파고로 영문 → 한글 번역"""
+translation_cache = TranslationCache()
+
+
+# 배치 요청 한 번에 담을 최대 문자 수 (Papago 요청 한도 5000자 이내)
+PAPAGO_BATCH_CHARS = 4500
+# 번역 후에도 유지되는 구분자: 줄바꿈
+PAPAGO_DELIMITER = '\n'
+# 기사 제목/설명 번역 길이 한도
+TITLE_MAX_CHARS = 300
+DESCRIPTION_MAX_CHARS = 200
+
+
+def _needs_translation(text):
     if not text or len(text.strip()) == 0:
-        return text
-    
+        return False
     korean_chars = sum(1 for c in text if '가' <= c <= '힣')
     if len(text) > 0 and korean_chars / len(text) > 0.3:
-        return text
-    
-    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
-        return text
-    
-    try:
-        text = text.strip()
-        if len(text) > max_length:
-            text = text[:max_length-3] + "..."
-        
-        url = "https://openapi.naver.com/v1/papago/n2mt"
-        headers = {
-            "X-Naver-Client-Id": NAVER_CLIENT_ID,
-            "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
-            "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"
-        }
-        data = {"source": "en", "target": "ko", "text": text}
-        
-        response = requests.post(url, headers=headers, data=data, timeout=10)
-        
-        if response.status_code == 200:
-            result = response.json()
-            translated = result.get('message', {}).get('result', {}).get('translatedText', '')
-            if translated and len(translated.strip()) > 0:
-                return translated
-        
-        return text
-        
-    except:
-        return text
+        return False
+    return bool(NAVER_CLIENT_ID and NAVER_CLIENT_SECRET)
+
+
+def _truncate(text, max_length):
+    text = text.strip()
+    if len(text) > max_length:
+        text = text[:max_length-3] + "..."
+    return text
+
+
+def _papago_request(text):
+    """Papago 1회 호출, 실패 시 None"""
+    url = "https://openapi.naver.com/v1/papago/n2mt"
+    headers = {
+        "X-Naver-Client-Id": NAVER_CLIENT_ID,
+        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
+        "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"
+    }
+    data = {"source": "en", "target": "ko", "text": text}
+    
+    response = http_client.post(url, headers=headers, data=data, timeout=10)
+    
+    if response.status_code == 200:
+        result = response.json()
+        translated = result.get('message', {}).get('result', {}).get('translatedText', '')
+        if translated and len(translated.strip()) > 0:
+            return translated
+    return None
+
+
+def _pack_batches(texts):
+    """줄바꿈으로 이어 붙였을 때 PAPAGO_BATCH_CHARS를 넘지 않도록 순서대로 묶음"""
+    batches = []
+    size = 0
+    for text in texts:
+        if batches and size + len(PAPAGO_DELIMITER) + len(text) <= PAPAGO_BATCH_CHARS:
+            batches[-1].append(text)
+            size += len(PAPAGO_DELIMITER) + len(text)
+        else:
+            batches.append([text])
+            size = len(text)
+    return batches
+
+
+def _translate_packed(batch):
+    """묶음 1회 번역 → 항목별 번역 목록 (줄 수가 맞지 않으면 None)"""
+    translated = _papago_request(PAPAGO_DELIMITER.join(batch))
+    if not translated:
+        return None
+    lines = translated.strip().split(PAPAGO_DELIMITER)
+    if len(lines) != len(batch) or not all(line.strip() for line in lines):
+        return None
+    return [line.strip() for line in lines]
+
+
+def translate_batch(requests_list):
+    """
+    여러 텍스트를 묶어서 번역
+    
+    Args:
+        requests_list: [(text, max_length), ...]
+    
+    Returns:
+        (입력 순서의 번역 목록, {'requests', 'batches', 'fallbacks'})
+        캐시 적중/번역 불필요 항목은 요청하지 않고, 묶음 응답을 나눌 수 없으면
+        해당 묶음만 항목별로 다시 요청한다. 끝내 실패한 항목은 손대지 않은 원문을
+        그대로 돌려준다. 요청은 'papago' 속도 제한 하에 동시 실행.
+    """
+    results = list(text for text, _ in requests_list)
+    pending = {}  # 잘린 원문 → [(index, cache key), ...]
+    for idx, (text, max_length) in enumerate(requests_list):
+        if not _needs_translation(text):
+            continue
+        key = cache_key(text.strip(), 'en', 'ko', max_length)
+        cached = translation_cache.get(key, text.strip())
+        if cached is not None:
+            results[idx] = cached
+            continue
+        # 묶음 안에서 구분자와 겹치지 않도록 줄바꿈은 공백으로
+        source = _truncate(text, max_length).replace('\n', ' ')
+        pending.setdefault(source, []).append((idx, key))
+
+    stats = {'requests': 0, 'batches': 0, 'fallbacks': 0}
+    if not pending:
+        return results, stats
+
+    translated = {}
+    batches = _pack_batches(list(pending))
+    outcomes = run_concurrent(_translate_packed, batches, host='papago')
+    stats['requests'] += len(batches)
+    stats['batches'] = len(batches)
+
+    retry = []
+    for batch, (lines, error) in zip(batches, outcomes):
+        if lines is None:
+            retry.extend(batch)
+        else:
+            translated.update(zip(batch, lines))
+
+    if retry:
+        stats['fallbacks'] = len(retry)
+        stats['requests'] += len(retry)
+        for source, (line, error) in zip(retry, run_concurrent(_papago_request, retry, host='papago')):
+            if line:
+                translated[source] = line
+
+    # 캐시는 스레드 안전하지 않으므로 결과 반영은 여기서 한 번에
+    for source, targets in pending.items():
+        if source in translated:
+            for idx, key in targets:
+                results[idx] = translated[source]
+                translation_cache.put(key, translated[source])
+    return results, stats
+
+
+def translation_workload(news_by_company):
+    """선정된 US 기사의 번역 대상 → (고유 텍스트 수, 문자 수)"""
+    texts = set()
+    for news_list in news_by_company.values():
+        for news in news_list:
+            if news['country'] != 'US':
+                continue
+            texts.add(_truncate(news['title'], TITLE_MAX_CHARS))
+            if news.get('description'):
+                texts.add(_truncate(news['description'], DESCRIPTION_MAX_CHARS))
+    return len(texts), sum(len(text) for text in texts)
 
 
 # ============================================================================
@@ -121,112 +236,86 @@ def translate_with_papago(text, max_length=4900):
 # ============================================================================
 
 def load_seen_links():
-    """Load previously seen news links"""
-    history_file = f'{MARKET_DATA_DIR}/news_history.json'
-    try:
-        with open(history_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return set(data.get('seen_links', []))
-    except:
-        return set()
+    """Open the seen-link store (migrates news_history.json on first run)"""
+    store = SeenLinkStore()
+    if store.migrated:
+        print(f"  Migrated {store.migrated} links from news_history.json")
+    if store.expired:
+        print(f"  Expired {store.expired} links older than {store.ttl_days} days")
+    return store
 
 
 def save_seen_links(links):
-    """Save seen news links"""
-    history_file = f'{MARKET_DATA_DIR}/news_history.json'
+    """Flush newly seen links to the store"""
     try:
-        data = {
-            'last_updated': datetime.now().isoformat(),
-            'seen_links': list(links)
-        }
-        with open(history_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-    except:
-        pass
+        links.close()
+    except Exception as e:
+        print(f"  [ERROR] Seen links: {str(e)}")
 
 
-def calculate_score(title, keywords_dict):
-    """Calculate relevance score"""
-    text = title.lower()
-    score = 0
-    matched_keywords = []
-    
-    for keyword in keywords_dict.get('high', []):
-        if keyword.lower() in text:
-            score += 10
-            matched_keywords.append(keyword)
-            break
-    
-    if score == 0:
-        for keyword in keywords_dict.get('medium', []):
-            if keyword.lower() in text:
-                score += 6
-                matched_keywords.append(keyword)
-                break
-    
-    return max(score, 1), matched_keywords
+_scorers = {}
+
+
+def get_scorer(keywords_dict):
+    """키워드 사전별 컴파일된 채점기 (최초 1회 생성)"""
+    scorer = _scorers.get(id(keywords_dict))
+    if scorer is None:
+        scorer = _scorers[id(keywords_dict)] = KeywordScorer(keywords_dict)
+    return scorer
+
+
+def score_news_item(news_item, keywords_dict):
+    """기사 1건 채점 (필드 구성은 score_news_items와 동일)"""
+    scorer = get_scorer(keywords_dict)
+    title_result = scorer.score(news_item['title'])
+    text_result = scorer.score(f"{news_item['title']} {news_item.get('description', '')}")
+    news_item['score'] = title_result['score']
+    news_item['matched_keywords'] = title_result['matched_keywords']
+    news_item['relevance'] = text_result['relevance']
+    news_item['keyword_hits'] = text_result['keyword_hits']
+
+
+def score_news_items(news_items, keywords_dict):
+    """
+    기사 일괄 채점
+
+    score/matched_keywords는 제목 기준(기존 등급 점수), keyword_hits/relevance는
+    제목+설명 기준 키워드별 등장 횟수와 가중 점수
+    """
+    scorer = get_scorer(keywords_dict)
+    by_title = scorer.score_batch([n['title'] for n in news_items])
+    by_text = scorer.score_batch([f"{n['title']} {n.get('description', '')}" for n in news_items])
+    for news_item, title_result, text_result in zip(news_items, by_title, by_text):
+        news_item['score'] = title_result['score']
+        news_item['matched_keywords'] = title_result['matched_keywords']
+        news_item['relevance'] = text_result['relevance']
+        news_item['keyword_hits'] = text_result['keyword_hits']
 
 
 # ============================================================================
 # NEWS COLLECTION
 # ============================================================================
 
-def get_google_news_rss(search_term, seen_links):
-    """Collect news using Google News RSS"""
+http_cache = HttpCache()
+
+
+def get_google_news_rss(search_term, seen_links, max_items=20):
+    """Collect news using Google News RSS (seen_links is read-only here)"""
     news_list = []
     
     try:
         encoded_term = quote(search_term)
         rss_url = f"https://news.google.com/rss/search?q={encoded_term}&hl=en-US&gl=US&ceid=US:en"
         
-        feed = feedparser.parse(rss_url)
-        
-        if not feed.entries:
+        status, response = http_cache.fetch(rss_url, 'google', timeout=15)
+        if status != OK:
+            # TTL 내 재요청 / 304 / 오류: 파싱 없이 새 항목 없음
             return []
         
+        # 검색 RSS는 관련도순이라 기준일 이전 기사가 중간에 섞여 있음 → 건너뛰기만 함
         week_ago = datetime.now() - timedelta(days=7)
-        
-        for entry in feed.entries[:20]:
-            try:
-                title = entry.get('title', '').strip()
-                link = entry.get('link', '').strip()
-                
-                if not title or not link or len(title) < 10:
-                    continue
-                    
-                if link in seen_links:
-                    continue
-                
-                published = entry.get('published_parsed')
-                if published:
-                    pub_date = datetime(*published[:6])
-                    if pub_date < week_ago:
-                        continue
-                else:
-                    pub_date = datetime.now()
-                
-                summary = entry.get('summary', '').strip()
-                summary = re.sub(r'<[^>]+>', '', summary)
-                summary = re.sub(r'http[s]?://\S+', '', summary)
-                summary = summary.strip()[:300]
-                
-                if len(summary) < 20:
-                    summary = ''
-                
-                publisher = entry.get('source', {}).get('title', 'Google News')
-                
-                news_list.append({
-                    'title': title,
-                    'description': summary,
-                    'link': link,
-                    'publisher': publisher,
-                    'date': pub_date.isoformat(),
-                    'source': 'Google News'
-                })
-                seen_links.add(link)
-                
-            except:
-                continue
+        news_list = parse_google_news(response.content, seen_links, max_items, week_ago,
+                                      canonical=canonical_url)
         
     except Exception as e:
         print(f"      [ERROR] Google News: {str(e)}")
@@ -234,89 +323,227 @@ def get_google_news_rss(search_term, seen_links):
     return news_list
 
 
-def get_us_news(search_terms, seen_links):
-    """Get US company news"""
-    all_news = []
-    
-    for term in search_terms[:2]:
-        news = get_google_news_rss(term, seen_links)
-        all_news.extend(news)
-        print(f"      [{term}] {len(news)} articles")
-        time.sleep(1)
-    
-    return all_news
+# Naver 검색 API 페이지 제한 (display 최대 100, start 최대 1000)
+NAVER_PAGE_SIZE = 100
+NAVER_MAX_START = 1000
 
 
-def get_naver_news(search_term, seen_links):
-    """Get Korean news from Naver API"""
-    news_list = []
-    
+def _parse_naver_item(item):
+    """Naver 검색 결과 1건 → 기사 dict (제목/링크가 없거나 너무 짧으면 None)"""
+    title = item.get('title', '').replace('<b>', '').replace('</b>', '').strip()
+    link = item.get('originallink', item.get('link', '')).strip()
+    if not title or not link or len(title) < 10:
+        return None
+
     try:
-        if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
-            return []
-        
-        url = "https://openapi.naver.com/v1/search/news.json"
-        headers = {
-            "X-Naver-Client-Id": NAVER_CLIENT_ID,
-            "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
-        }
-        params = {"query": search_term, "display": 20, "sort": "date"}
-        
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        
-        if response.status_code != 200:
-            return []
+        pub_date = datetime.strptime(item.get('pubDate', ''), '%a, %d %b %Y %H:%M:%S %z')
+        pub_date = pub_date.replace(tzinfo=None)
+    except ValueError:
+        pub_date = datetime.now()
+
+    publisher = 'Naver'
+    if item.get('originallink'):
+        try:
+            publisher = item['originallink'].split('/')[2]
+        except IndexError:
+            pass
+
+    return {
+        'title': title,
+        'description': item.get('description', '').replace('<b>', '').replace('</b>', '').strip(),
+        'link': link,
+        'canonical_url': canonical_url(link),
+        'publisher': publisher,
+        'date': pub_date.isoformat(),
+        'source': 'Naver API'
+    }
+
+
+def iter_naver_news(search_term, seen_links, max_items=20):
+    """
+    Stream Korean news from Naver API page by page (seen_links is read-only here)
+    
+    날짜 내림차순 결과이므로 7일 이전 기사나 이미 본 링크를 만나면
+    이후 페이지는 요청하지 않고 종료한다.
+    """
+    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+        return
+    
+    url = "https://openapi.naver.com/v1/search/news.json"
+    headers = {
+        "X-Naver-Client-Id": NAVER_CLIENT_ID,
+        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
+    }
+    week_ago = datetime.now() - timedelta(days=7)
+    page_size = min(max_items, NAVER_PAGE_SIZE)
+    yielded = 0
+    start = 1
+    
+    while start <= NAVER_MAX_START:
+        params = {"query": search_term, "display": page_size, "start": start, "sort": "date"}
+        status, response = http_cache.fetch(url, 'naver', params=params, headers=headers, timeout=10)
+        if status != OK:
+            return
         
         items = response.json().get('items', [])
-        week_ago = datetime.now() - timedelta(days=7)
         
         for item in items:
             try:
-                title = item.get('title', '').replace('<b>', '').replace('</b>', '').strip()
-                link = item.get('originallink', item.get('link', '')).strip()
-                
-                if not title or not link or len(title) < 10:
-                    continue
-                    
-                if link in seen_links:
-                    continue
-                
-                try:
-                    pub_date_str = item.get('pubDate', '')
-                    pub_date = datetime.strptime(pub_date_str, '%a, %d %b %Y %H:%M:%S %z')
-                    pub_date = pub_date.replace(tzinfo=None)
-                    if pub_date < week_ago:
-                        continue
-                except:
-                    pub_date = datetime.now()
-                
-                description = item.get('description', '').replace('<b>', '').replace('</b>', '').strip()
-                publisher = 'Naver'
-                if item.get('originallink'):
-                    try:
-                        publisher = item['originallink'].split('/')[2]
-                    except:
-                        pass
-                
-                news_list.append({
-                    'title': title,
-                    'description': description,
-                    'link': link,
-                    'publisher': publisher,
-                    'date': pub_date.isoformat(),
-                    'source': 'Naver API'
-                })
-                seen_links.add(link)
-                
-            except:
+                news = _parse_naver_item(item)
+            except Exception:
+                continue
+            if news is None:
                 continue
+            
+            if news['canonical_url'] in seen_links or news['link'] in seen_links:
+                # 이전 실행에서 이미 수집한 구간에 도달
+                return
+            if datetime.fromisoformat(news['date']) < week_ago:
+                return
+            
+            yield news
+            yielded += 1
+            if yielded >= max_items:
+                return
         
+        if len(items) < page_size:
+            return
+        start += page_size
+
+
+def get_naver_news(search_term, seen_links, max_items=20):
+    """
+    Get Korean news from Naver API (seen_links is read-only here)
+
+    페이지를 받는 대로 기사를 하나씩 채점하므로 채점이 페이지 요청과 겹쳐 진행된다.
+    """
+    news_list = []
+    try:
+        for news in iter_naver_news(search_term, seen_links, max_items):
+            score_news_item(news, KOREAN_KEYWORDS)
+            news_list.append(news)
     except Exception as e:
         print(f"      [ERROR] Naver: {str(e)}")
-    
     return news_list
 
 
+# ============================================================================
+# ASYNC COLLECTION ENGINE
+# ============================================================================
+
+# 소스별 동시 요청 수 / 요청 시작 간 최소 간격(초)
+SOURCE_CONCURRENCY = {'google': 4, 'naver': 2}
+SOURCE_MIN_INTERVAL = {'google': 0.25, 'naver': 0.1}
+
+# 검색어 1개당 가져올 최대 기사 수 (OR 쿼리는 묶인 검색어 수만큼 늘림)
+# Naver는 7일 경계/이미 본 링크에서 페이지 요청을 멈추므로 상한을 넉넉히 둔다
+ITEMS_PER_TERM = {'google': 20, 'naver': 50}
+
+SOURCE_FETCHERS = {
+    'google': get_google_news_rss,
+    'naver': get_naver_news,
+}
+
+
+class AsyncPacer:
+    """요청 시작 간격을 최소 interval초로 유지 (고정 sleep 대체)"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            loop = asyncio.get_running_loop()
+            delay = self.next_start - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.next_start = loop.time() + self.interval
+
+
+async def _gather_tasks(tasks, seen_links):
+    semaphores = {src: asyncio.Semaphore(n) for src, n in SOURCE_CONCURRENCY.items()}
+    pacers = {src: AsyncPacer(sec) for src, sec in SOURCE_MIN_INTERVAL.items()}
+
+    async def run(task):
+        source = task['source']
+        max_items = ITEMS_PER_TERM[source] * len(task['terms'])
+        async with semaphores[source]:
+            await pacers[source].wait()
+            return await asyncio.to_thread(SOURCE_FETCHERS[source], task['query'], seen_links, max_items)
+
+    return await asyncio.gather(*(run(task) for task in tasks))
+
+
+def collect_news(stocks, seen_links):
+    """
+    검색어를 OR 쿼리로 묶어 소스별 동시성 제한 하에 병렬 수집
+
+    수집 중에는 seen_links를 읽기만 하고, 결과 병합(중복 제거, 기업 귀속)은
+    쿼리 계획 순서대로 한 스레드에서 수행하므로 결과가 결정적이다.
+    """
+    plan = plan_queries(stocks)
+    total_terms = sum(len(task['terms']) for task in plan)
+    print(f"\n[PLAN] {total_terms} search terms → {len(plan)} requests")
+
+    results = asyncio.run(_gather_tasks(plan, seen_links))
+
+    all_news_by_company = defaultdict(list)
+    stats = {'google': 0, 'naver': 0}
+
+    for idx, (task, news) in enumerate(zip(plan, results), 1):
+        print(f"\n[{idx}/{len(plan)}] {task['source']}: {task['query']}")
+
+        per_company = defaultdict(int)
+        unmatched = 0
+        for news_item in news:
+            # 추적 파라미터/리다이렉트 래퍼가 달라도 같은 기사는 한 번만
+            key = news_item.get('canonical_url', news_item['link'])
+            if key in seen_links:
+                continue
+
+            # 묶인 쿼리에서 어느 기업도 언급하지 않는 기사는 추측하지 않고 제외
+            # (seen 처리하지 않으므로 다른 쿼리에서 다시 귀속될 수 있음)
+            matched = attribute_companies(news_item, task['stocks'])
+            if not matched:
+                unmatched += 1
+                continue
+            seen_links.add(key)
+
+            # 여러 기업이 언급되면 기업마다 사본으로 등록 (준중복 병합 시 'companies'로 합쳐짐)
+            for stock in matched:
+                item = news_item if stock is matched[0] else dict(news_item)
+                item['company'] = stock['name']
+                item['country'] = stock['country']
+                all_news_by_company[stock['name']].append(item)
+                per_company[stock['name']] += 1
+            stats[task['source']] += 1
+
+        for stock in task['stocks']:
+            print(f"      [{stock['name']}] {per_company[stock['name']]} articles")
+        if unmatched:
+            print(f"      [SKIP] {unmatched} articles mention none of the queried companies")
+
+    # 수집 중 채점되지 않은 기사(Google RSS)만 국가별 키워드로 한 번에 채점
+    collected = [n for news in all_news_by_company.values() for n in news if 'score' not in n]
+    score_news_items([n for n in collected if n['country'] == 'KR'], KOREAN_KEYWORDS)
+    score_news_items([n for n in collected if n['country'] != 'KR'], ENGLISH_KEYWORDS)
+
+    # 기업 순서는 STOCKS 순서로 고정
+    ordered = {s['name']: all_news_by_company[s['name']] for s in stocks if s['name'] in all_news_by_company}
+    return ordered, stats
+
+
+def select_top_news(news_by_company, top_n=2):
+    """기업별 상위 N개 기사 (score → relevance → 날짜 순)"""
+    filtered = {}
+    for company, news_list in news_by_company.items():
+        ranked = sorted(news_list, key=lambda x: (x['score'], x.get('relevance', 0), x['date']), reverse=True)
+        filtered[company] = ranked[:top_n]
+    return filtered
+
+
 # ============================================================================
 # DATA STORAGE
 # ============================================================================
@@ -333,31 +560,42 @@ def save_news_data(news_by_company, stats):
         'stats': stats,
         'news_by_company': {company: news_list for company, news_list in news_by_company.items()}
     }
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(json_data, f, indent=2, ensure_ascii=False)
-    print(f"  JSON saved: {json_file}")
+    json_file = save_json(json_file, json_data)
+    if json_file:
+        print(f"  JSON saved: {json_file}")
+    
+    # 날짜 파티션 Parquet 보관
+    tickers = {stock['name']: stock['ticker'] for stock in STOCKS}
+    archive_file = write_snapshot(
+        'news', records_to_frame([dict(news, company=company, ticker=tickers.get(company))
+                                  for company, news_list in news_by_company.items()
+                                  for news in news_list]))
+    if archive_file:
+        print(f"  Archive saved: {os.path.dirname(archive_file)}")
     
     # 2. Excel 저장 (analysis_reports/)
     excel_file = f'{ANALYSIS_DIR}/news_analysis_{date_str}.xlsx'
     
+    header = ['Company', 'Country', 'Title', 'Description', 'Score',
+              'Publisher', 'Source', 'Date', 'Link']
     rows = []
     for company, news_list in news_by_company.items():
         for news in news_list:
-            rows.append({
-                'Company': company,
-                'Country': news.get('country', 'US'),
-                'Title': news.get('translated_title', news.get('title', '')),
-                'Description': news.get('translated_description', news.get('description', '')),
-                'Score': news.get('score', 0),
-                'Publisher': news.get('publisher', ''),
-                'Source': news.get('source', ''),
-                'Date': news.get('date', ''),
-                'Link': news.get('link', '')
-            })
+            rows.append((
+                company,
+                news.get('country', 'US'),
+                news.get('translated_title', news.get('title', '')),
+                news.get('translated_description', news.get('description', '')),
+                news.get('score', 0),
+                news.get('publisher', ''),
+                news.get('source', ''),
+                news.get('date', ''),
+                news.get('link', '')
+            ))
     
     if rows:
-        df = pd.DataFrame(rows)
-        df.to_excel(excel_file, index=False, engine='openpyxl')
+        with WorkbookWriter(excel_file) as book:
+            book.write_rows('Sheet1', header, rows)
         print(f"  Excel saved: {excel_file}")
     
     # 3. Markdown 리포트 (analysis_reports/)
@@ -397,7 +635,7 @@ def save_news_data(news_by_company, stats):
     
     print(f"  Markdown saved: {md_file}")
     
-    return json_file, excel_file, md_file
+    return json_file, excel_file, md_file, archive_file
 
 
 def create_docx_report(news_by_company):
@@ -455,7 +693,7 @@ def send_telegram_message(text):
     """Send text message to Telegram"""
     try:
         url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        response = requests.post(url, data={"chat_id": TELEGRAM_CHAT_ID, "text": text}, timeout=10)
+        response = http_client.post(url, data={"chat_id": TELEGRAM_CHAT_ID, "text": text}, timeout=10)
         return response.status_code == 200
     except:
         return False
@@ -468,7 +706,7 @@ def send_telegram_document(file_path, caption=''):
             files = {'document': f}
             data = {'chat_id': TELEGRAM_CHAT_ID, 'caption': caption}
             url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendDocument"
-            response = requests.post(url, files=files, data=data, timeout=30)
+            response = http_client.post(url, files=files, data=data, timeout=30)
             return response.status_code == 200
     except:
         return False
@@ -498,35 +736,10 @@ def main():
     print("PHASE 1: NEWS COLLECTION")
     print("="*70)
     
-    all_news_by_company = defaultdict(list)
-    stats = {'google': 0, 'naver': 0}
-    
-    for idx, stock in enumerate(STOCKS, 1):
-        print(f"\n[{idx}/{len(STOCKS)}] {stock['name']} ({stock['country']})")
-        
-        if stock['country'] == 'US':
-            news = get_us_news(stock.get('search_terms', []), seen_links)
-            stats['google'] += len(news)
-        else:
-            news = []
-            for term in stock.get('search_terms', [stock['name']]):
-                naver_news = get_naver_news(term, seen_links)
-                news.extend(naver_news)
-                stats['naver'] += len(naver_news)
-                print(f"      [{term}] {len(naver_news)} articles")
-                time.sleep(0.3)
-        
-        keywords = KOREAN_KEYWORDS if stock['country'] == 'KR' else ENGLISH_KEYWORDS
-        
-        for news_item in news:
-            score, matched = calculate_score(news_item['title'], keywords)
-            news_item['score'] = score
-            news_item['matched_keywords'] = matched
-            news_item['company'] = stock['name']
-            news_item['country'] = stock['country']
-            all_news_by_company[stock['name']].append(news_item)
+    all_news_by_company, stats = collect_news(STOCKS, seen_links)
     
     save_seen_links(seen_links)
+    http_cache.save()
     
     print("\n" + "="*70)
     print("COLLECTION STATS")
@@ -534,12 +747,19 @@ def main():
     print(f"Google: {stats['google']}")
     print(f"Naver: {stats['naver']}")
     print(f"TOTAL: {sum(stats.values())}")
+    print(f"HTTP cache: {http_cache.stats[FRESH]} fresh hits / {http_cache.stats[OK]} misses / "
+          f"{http_cache.stats[NOT_MODIFIED]} not modified (304) / {http_cache.stats[ERROR]} errors")
     
-    # 상위 2개씩 선택
-    filtered = {}
-    for company, news_list in all_news_by_company.items():
-        news_list.sort(key=lambda x: (x['score'], x['date']), reverse=True)
-        filtered[company] = news_list[:2]
+    # 준중복 기사 병합 (여러 기업/소스에 실린 같은 기사) → 번역/저장 1회
+    before_dedup = select_top_news(all_news_by_company)
+    all_news_by_company, duplicates = collapse_near_duplicates(all_news_by_company)
+    filtered = select_top_news(all_news_by_company)
+    
+    # 빠진 자리는 다음 순위 기사가 채우므로 건수가 아니라 번역 대상 자체를 전후 비교
+    texts_before, chars_before = translation_workload(before_dedup)
+    texts_after, chars_after = translation_workload(filtered)
+    print(f"Near-duplicates collapsed: {len(duplicates)} "
+          f"(Papago texts {texts_before} → {texts_after}, chars {chars_before} → {chars_after})")
     
     final_count = sum(len(n) for n in filtered.values())
     print(f"Final (top 2 each): {final_count}")
@@ -550,21 +770,35 @@ def main():
     print("="*70)
     
     if NAVER_CLIENT_ID and NAVER_CLIENT_SECRET:
+        # 제목/설명을 한 번에 모아 묶음 번역 (기존: 기사마다 2회 호출 + 0.5초 대기)
+        requests_list = []
+        targets = []
         translation_count = 0
-        
         for company, news_list in filtered.items():
             for news in news_list:
                 if news['country'] == 'US':
-                    news['translated_title'] = translate_with_papago(news['title'], 300)
+                    requests_list.append((news['title'], TITLE_MAX_CHARS))
+                    targets.append((news, 'translated_title'))
                     if news.get('description'):
-                        news['translated_description'] = translate_with_papago(news['description'], 200)
+                        requests_list.append((news['description'], DESCRIPTION_MAX_CHARS))
+                        targets.append((news, 'translated_description'))
                     translation_count += 1
-                    time.sleep(0.5)
                 else:
                     news['translated_title'] = news['title']
                     news['translated_description'] = news.get('description', '')
         
-        print(f"Translated: {translation_count} articles")
+        translations, batch_stats = translate_batch(requests_list)
+        for (news, field), translated in zip(targets, translations):
+            news[field] = translated
+        
+        print(f"Translated: {translation_count} articles "
+              f"({batch_stats['requests']} Papago requests, {batch_stats['batches']} batches, "
+              f"{batch_stats['fallbacks']} per-item fallbacks)")
+        
+        cache_stats = translation_cache.stats()
+        print(f"Translation cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+              f"({cache_stats['hit_rate']}%), saved {cache_stats['saved_chars']} chars")
+        translation_cache.save()
     else:
         print("  Translation disabled")
         for company, news_list in filtered.items():
@@ -577,7 +811,7 @@ def main():
     print("PHASE 3: DATA STORAGE (JSON/Excel/Markdown)")
     print("="*70)
     
-    json_file, excel_file, md_file = save_news_data(filtered, stats)
+    json_file, excel_file, md_file, archive_file = save_news_data(filtered, stats)
     docx_file = create_docx_report(filtered)
     print(f"  DOCX saved: {docx_file}")
     
@@ -590,7 +824,8 @@ def main():
     summary += f"📊 수집: {final_count}개 기사\n"
     summary += f"Google: {stats['google']} | Naver: {stats['naver']}\n\n"
     summary += f"💾 저장:\n"
-    summary += f"- JSON: {os.path.basename(json_file)}\n"
+    if json_file:
+        summary += f"- JSON: {os.path.basename(json_file)}\n"
     summary += f"- Excel: {os.path.basename(excel_file)}\n"
     summary += f"- Markdown: {os.path.basename(md_file)}\n\n"
     summary += f"✅ GitHub에 push 완료\n"
@@ -602,6 +837,16 @@ def main():
     send_telegram_document(docx_file, '📰 뉴스 리포트 (요약)')
     print("  DOCX sent")
     
+    # 카탈로그 갱신 (기업명 → 티커)
+    tickers = {stock['name']: stock['ticker'] for stock in STOCKS}
+    record_run(
+        'news', datetime.now(), final_count, [tickers[c] for c in filtered if c in tickers],
+        [json_file, excel_file, md_file, archive_file, docx_file],
+        extra={'collected': stats},
+    )
+    
+    http_client.print_http_stats()
+    
     print("\n" + "="*70)
     print("✅ COMPLETE - Data saved to repo, summary sent to Telegram")
     print("="*70)
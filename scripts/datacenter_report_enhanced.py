@@ -3,13 +3,17 @@
 ✅ API → Data Collection → File Storage → Git Push → Telegram Summary Only
 """
 
-import yfinance as yf
 import pandas as pd
-import requests
 import os
-import json
 from datetime import datetime
 import warnings
+import http_client
+from price_cache import update_price_cache, load_history
+from indicator_state import load_states, save_states, refresh_states
+from report_signals import compute_signals, EXCEL_SIGNAL_SHEETS
+from excel_writer import WorkbookWriter
+from snapshot_archive import write_snapshot, save_json
+from data_catalog import record_run
 warnings.filterwarnings('ignore')
 
 print("="*70)
@@ -61,60 +65,33 @@ STOCKS = [
 print(f"📋 총 {len(STOCKS)}개 종목 모니터링\n")
 
 
-def calculate_rsi(prices, period=14):
-    """RSI(Relative Strength Index) 계산"""
+def get_stock_data(ticker, name, sector, ind):
+    """지표 행(ind: 지표 상태 또는 지표 엔진의 종목별 결과)으로 리포트 행 구성"""
     try:
-        if len(prices) < period:
-            return 50
-        
-        deltas = prices.diff()
-        gain = deltas.where(deltas > 0, 0)
-        loss = -deltas.where(deltas < 0, 0)
-        
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi.iloc[-1]
-    except:
-        return 50
-
-
-def get_stock_data(ticker, name, sector):
-    """주가 데이터 수집 및 지표 계산"""
-    try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period="1y")
-        
-        if hist.empty or len(hist) < 2:
+        if ind is None or ind['bars'] < 2:
             return None
         
-        current = hist['Close'].iloc[-1]
-        prev = hist['Close'].iloc[-2] if len(hist) >= 2 else current
+        bars = ind['bars']
+        current = ind['price']
         
         # 수익률 계산
-        change_1d = ((current / prev) - 1) * 100
-        change_1w = ((current / hist['Close'].iloc[-5]) - 1) * 100 if len(hist) >= 5 else 0
-        change_1m = ((current / hist['Close'].iloc[-21]) - 1) * 100 if len(hist) >= 21 else 0
+        change_1d = ind['change_1d']
+        change_1w = ind['change_1w'] if bars >= 5 else 0
+        change_1m = ind['change_1m'] if bars >= 21 else 0
         
         # 이동평균
-        ma_20 = hist['Close'].rolling(20).mean().iloc[-1] if len(hist) >= 20 else current
-        ma_60 = hist['Close'].rolling(60).mean().iloc[-1] if len(hist) >= 60 else current
+        ma_20 = ind['ma_20'] if bars >= 20 else current
+        ma_60 = ind['ma_60'] if bars >= 60 else current
         
         vs_ma20 = ((current / ma_20) - 1) * 100 if ma_20 else 0
         golden_cross = ma_20 > ma_60 if (ma_20 and ma_60) else False
         dead_cross = ma_20 < ma_60 if (ma_20 and ma_60) else False
         
         # 거래량
-        volume = hist['Volume'].iloc[-1]
-        avg_volume = hist['Volume'].rolling(20).mean().iloc[-1] if len(hist) >= 20 else volume
+        volume = ind['volume']
+        avg_volume = ind['avg_volume_20'] if bars >= 20 else volume
         volume_ratio = (volume / avg_volume * 100) if avg_volume else 100
         
-        # RSI 계산
-        rsi = calculate_rsi(hist['Close'], period=14)
-        
         return {
             'name': name,
             'ticker': ticker,
@@ -130,7 +107,7 @@ def get_stock_data(ticker, name, sector):
             'dead_cross': bool(dead_cross),
             'volume': int(volume),
             'volume_ratio': float(volume_ratio),
-            'rsi': float(rsi),
+            'rsi': float(ind['rsi']),
         }
     except Exception as e:
         print(f"  ❌ {name}: {str(e)[:50]}")
@@ -139,20 +116,59 @@ def get_stock_data(ticker, name, sector):
 
 print("📈 주가 데이터 수집 중...\n")
 
+# 새 봉만 받아 캐시에 병합하고, 종목별 지표 상태를 O(1)로 전진 (히스토리는 재구성 시에만 로드)
+tickers = [s['ticker'] for s in STOCKS]
+price_tails, fetch_failures, backfilled = update_price_cache(tickers)
+indicator_states = load_states()
+indicators = refresh_states(indicator_states, tickers, price_tails, backfilled, load_history)
+save_states(indicator_states)
+
 results = []
 for idx, stock in enumerate(STOCKS, 1):
     print(f"[{idx}/{len(STOCKS)}] {stock['name']:20s} ... ", end='')
-    data = get_stock_data(stock['ticker'], stock['name'], stock['sector'])
+    ind = indicators.loc[stock['ticker']] if stock['ticker'] in indicators.index else None
+    data = get_stock_data(stock['ticker'], stock['name'], stock['sector'], ind)
     if data:
         results.append(data)
         print("✅")
     else:
-        print("❌")
+        reason = fetch_failures.get(stock['ticker'])
+        print(f"❌ {str(reason)[:50]}" if reason else "❌")
 
 print(f"\n✅ 수집 완료: {len(results)}/{len(STOCKS)}개\n")
 
 df = pd.DataFrame(results)
 
+# 시그널은 한 번만 계산하고 아래 출력들은 이 결과만 사용
+signals = compute_signals(df)
+
+# (시그널, 제목, 정렬 순서 사용, 행 포맷)
+MARKDOWN_SECTIONS = [
+    ('up', '🔥 오늘 상승 종목', True,
+     lambda row: f"- {'🚀' if row['change_1d'] > 5 else '📈'} **{row['name']}**: {row['change_1d']:+.2f}% (${row['price']:.2f})"),
+    ('down', '📉 오늘 하락 종목', True,
+     lambda row: f"- 📉 **{row['name']}**: {row['change_1d']:+.2f}% (${row['price']:.2f})"),
+    ('golden_cross', '⭐ 골든크로스', False,
+     lambda row: f"- **{row['name']}**: MA20(${row['ma_20']:.2f}) > MA60(${row['ma_60']:.2f})"),
+    ('dead_cross', '💀 데드크로스', False,
+     lambda row: f"- **{row['name']}**"),
+    ('volume_spike', '📊 거래량 급증', True,
+     lambda row: f"- **{row['name']}**: {row['volume_ratio']:.0f}% (평균 대비)"),
+    ('rsi_overbought', '🔴 RSI 과매수', False,
+     lambda row: f"- **{row['name']}**: RSI {row['rsi']:.1f}"),
+    ('rsi_oversold', '🟢 RSI 과매도', False,
+     lambda row: f"- **{row['name']}**: RSI {row['rsi']:.1f}"),
+]
+
+# (시그널, 텔레그램 요약 라벨)
+TELEGRAM_SIGNALS = [
+    ('golden_cross', '⭐ 골든크로스'),
+    ('dead_cross', '💀 데드크로스'),
+    ('volume_spike', '📊 거래량급증'),
+    ('rsi_overbought', '🔴 RSI과매수'),
+    ('rsi_oversold', '🟢 RSI과매도'),
+]
+
 # ============================================================================
 # DATA STORAGE (JSON, Excel, Markdown)
 # ============================================================================
@@ -172,40 +188,31 @@ json_data = {
     'total_stocks': len(results),
     'stocks': results
 }
-with open(json_file, 'w', encoding='utf-8') as f:
-    json.dump(json_data, f, indent=2, ensure_ascii=False)
-print(f"✅ JSON: {json_file}")
+json_file = save_json(json_file, json_data)
+if json_file:
+    print(f"✅ JSON: {json_file}")
+
+# 날짜 파티션 Parquet 보관 (종목 행 + 종목별 시그널)
+archive_file = write_snapshot('datacenter_stocks', df, now)
+signal_rows = pd.concat(
+    [signals.rows(name)[['ticker', 'name']].assign(signal=name) for name in signals.results],
+    ignore_index=True
+)
+signal_archive_file = write_snapshot('datacenter_signals', signal_rows, now)
+if archive_file:
+    print(f"✅ Archive: {os.path.dirname(archive_file)}")
 
 # 2. Excel 저장 (analysis_reports/)
 excel_file = f'{ANALYSIS_DIR}/datacenter_analysis_{date_str}.xlsx'
 
-with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
+with WorkbookWriter(excel_file) as book:
     # Sheet 1: 전체 데이터
-    df_export = df.copy()
-    df_export.to_excel(writer, sheet_name='All_Stocks', index=False)
+    book.write_sheet('All_Stocks', df)
     
-    # Sheet 2: 상승 종목
-    up_stocks = df[df['change_1d'] > 0].sort_values('change_1d', ascending=False)
-    up_stocks.to_excel(writer, sheet_name='Up_Stocks', index=False)
-    
-    # Sheet 3: 하락 종목
-    down_stocks = df[df['change_1d'] < 0].sort_values('change_1d')
-    down_stocks.to_excel(writer, sheet_name='Down_Stocks', index=False)
-    
-    # Sheet 4: 골든크로스
-    golden = df[df['golden_cross'] == True]
-    if len(golden) > 0:
-        golden.to_excel(writer, sheet_name='Golden_Cross', index=False)
-    
-    # Sheet 5: 거래량 급증
-    volume_spike = df[df['volume_ratio'] > 200]
-    if len(volume_spike) > 0:
-        volume_spike.to_excel(writer, sheet_name='Volume_Spike', index=False)
-    
-    # Sheet 6: RSI 과매수/과매도
-    rsi_extreme = df[(df['rsi'] > 70) | (df['rsi'] < 30)]
-    if len(rsi_extreme) > 0:
-        rsi_extreme.to_excel(writer, sheet_name='RSI_Extreme', index=False)
+    # Sheet 2~: 시그널별 시트
+    for sheet_name, name, ranked, always in EXCEL_SIGNAL_SHEETS:
+        if always or signals.count(name) > 0:
+            book.write_sheet(sheet_name, signals.rows(name, ranked))
 
 print(f"✅ Excel: {excel_file}")
 
@@ -217,68 +224,19 @@ with open(md_file, 'w', encoding='utf-8') as f:
     f.write(f"**Generated:** {timestamp}\n\n")
     f.write(f"---\n\n")
     
-    # 상승 종목
-    up_stocks = df[df['change_1d'] > 0].sort_values('change_1d', ascending=False)
-    if len(up_stocks) > 0:
-        f.write(f"## 🔥 오늘 상승 종목 ({len(up_stocks)}개)\n\n")
-        for _, row in up_stocks.iterrows():
-            emoji = "🚀" if row['change_1d'] > 5 else "📈"
-            f.write(f"- {emoji} **{row['name']}**: {row['change_1d']:+.2f}% (${row['price']:.2f})\n")
-        f.write(f"\n")
-    
-    # 하락 종목
-    down_stocks = df[df['change_1d'] < 0].sort_values('change_1d')
-    if len(down_stocks) > 0:
-        f.write(f"## 📉 오늘 하락 종목 ({len(down_stocks)}개)\n\n")
-        for _, row in down_stocks.iterrows():
-            f.write(f"- 📉 **{row['name']}**: {row['change_1d']:+.2f}% (${row['price']:.2f})\n")
-        f.write(f"\n")
-    
-    # 골든크로스
-    golden = df[df['golden_cross'] == True]
-    if len(golden) > 0:
-        f.write(f"## ⭐ 골든크로스 ({len(golden)}개)\n\n")
-        for _, row in golden.iterrows():
-            f.write(f"- **{row['name']}**: MA20(${row['ma_20']:.2f}) > MA60(${row['ma_60']:.2f})\n")
-        f.write(f"\n")
-    
-    # 데드크로스
-    dead = df[df['dead_cross'] == True]
-    if len(dead) > 0:
-        f.write(f"## 💀 데드크로스 ({len(dead)}개)\n\n")
-        for _, row in dead.iterrows():
-            f.write(f"- **{row['name']}**\n")
-        f.write(f"\n")
-    
-    # 거래량 급증
-    volume_spike = df[df['volume_ratio'] > 200].sort_values('volume_ratio', ascending=False)
-    if len(volume_spike) > 0:
-        f.write(f"## 📊 거래량 급증 ({len(volume_spike)}개)\n\n")
-        for _, row in volume_spike.iterrows():
-            f.write(f"- **{row['name']}**: {row['volume_ratio']:.0f}% (평균 대비)\n")
-        f.write(f"\n")
-    
-    # RSI 과매수/과매도
-    rsi_overbought = df[df['rsi'] > 70]
-    if len(rsi_overbought) > 0:
-        f.write(f"## 🔴 RSI 과매수 ({len(rsi_overbought)}개)\n\n")
-        for _, row in rsi_overbought.iterrows():
-            f.write(f"- **{row['name']}**: RSI {row['rsi']:.1f}\n")
-        f.write(f"\n")
-    
-    rsi_oversold = df[df['rsi'] < 30]
-    if len(rsi_oversold) > 0:
-        f.write(f"## 🟢 RSI 과매도 ({len(rsi_oversold)}개)\n\n")
-        for _, row in rsi_oversold.iterrows():
-            f.write(f"- **{row['name']}**: RSI {row['rsi']:.1f}\n")
-        f.write(f"\n")
+    for name, title, ranked, fmt in MARKDOWN_SECTIONS:
+        if signals.count(name) > 0:
+            f.write(f"## {title} ({signals.count(name)}개)\n\n")
+            for _, row in signals.rows(name, ranked).iterrows():
+                f.write(fmt(row) + "\n")
+            f.write(f"\n")
     
     # 통계
     f.write(f"---\n\n")
     f.write(f"## 📊 Summary\n\n")
-    f.write(f"- 📈 상승: {len(up_stocks)}개\n")
-    f.write(f"- 📉 하락: {len(down_stocks)}개\n")
-    f.write(f"- ➖ 보합: {len(df[df['change_1d'] == 0])}개\n")
+    f.write(f"- 📈 상승: {signals.count('up')}개\n")
+    f.write(f"- 📉 하락: {signals.count('down')}개\n")
+    f.write(f"- ➖ 보합: {signals.count('flat')}개\n")
     f.write(f"- 📊 총 {len(results)}개 종목\n")
 
 print(f"✅ Markdown: {md_file}")
@@ -291,9 +249,9 @@ print("\n" + "="*70)
 print("📱 TELEGRAM SUMMARY")
 print("="*70)
 
-up_count = len(df[df['change_1d'] > 0])
-down_count = len(df[df['change_1d'] < 0])
-flat_count = len(df[df['change_1d'] == 0])
+up_count = signals.count('up')
+down_count = signals.count('down')
+flat_count = signals.count('flat')
 
 summary = f"📊 데이터센터 종목 분석 완료\n\n"
 summary += f"📈 상승: {up_count}개\n"
@@ -302,23 +260,14 @@ summary += f"➖ 보합: {flat_count}개\n"
 summary += f"📊 총 {len(results)}개 종목\n\n"
 
 # 주요 시그널 요약
-signals = []
-if len(df[df['golden_cross'] == True]) > 0:
-    signals.append(f"⭐ 골든크로스: {len(df[df['golden_cross'] == True])}개")
-if len(df[df['dead_cross'] == True]) > 0:
-    signals.append(f"💀 데드크로스: {len(df[df['dead_cross'] == True])}개")
-if len(df[df['volume_ratio'] > 200]) > 0:
-    signals.append(f"📊 거래량급증: {len(df[df['volume_ratio'] > 200])}개")
-if len(df[df['rsi'] > 70]) > 0:
-    signals.append(f"🔴 RSI과매수: {len(df[df['rsi'] > 70])}개")
-if len(df[df['rsi'] < 30]) > 0:
-    signals.append(f"🟢 RSI과매도: {len(df[df['rsi'] < 30])}개")
-
-if signals:
-    summary += f"🎯 주요 시그널:\n" + "\n".join(signals) + "\n\n"
+signal_lines = [f"{label}: {signals.count(name)}개" for name, label in TELEGRAM_SIGNALS if signals.count(name) > 0]
+
+if signal_lines:
+    summary += f"🎯 주요 시그널:\n" + "\n".join(signal_lines) + "\n\n"
 
 summary += f"💾 저장:\n"
-summary += f"- JSON: {os.path.basename(json_file)}\n"
+if json_file:
+    summary += f"- JSON: {os.path.basename(json_file)}\n"
 summary += f"- Excel: {os.path.basename(excel_file)}\n"
 summary += f"- Markdown: {os.path.basename(md_file)}\n\n"
 summary += f"✅ GitHub에 push 완료\n"
@@ -328,7 +277,7 @@ url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
 payload = {"chat_id": TELEGRAM_CHAT_ID, "text": summary}
 
 try:
-    response = requests.post(url, data=payload)
+    response = http_client.post(url, data=payload)
     if response.status_code == 200:
         print("✅ 텔레그램 전송 성공!")
     else:
@@ -336,6 +285,15 @@ try:
 except Exception as e:
     print(f"❌ 오류: {e}")
 
+# 카탈로그 갱신 (시그널별 종목 포함)
+record_run(
+    'datacenter_stocks', now, len(df), df['ticker'],
+    [json_file, excel_file, md_file, archive_file, signal_archive_file],
+    signals={name: list(signals.rows(name)['ticker']) for name in signals.results},
+)
+
+http_client.print_http_stats()
+
 print("\n" + "="*70)
 print("✅ 작업 완료 - Data saved to repo, summary sent to Telegram")
 print("="*70)
@@ -0,0 +1,122 @@
+"""
+Workbook output backend for the report scripts
+✅ streaming: openpyxl write-only 모드로 행 단위 기록 → 워크북 전체를 메모리에 두지 않음
+✅ 열별 셀 변환/서식은 시트마다 1회 계산
+✅ pandas: 기존 pd.ExcelWriter(engine='openpyxl') 경로 (EXCEL_BACKEND=pandas)
+✅ 두 백엔드 모두 같은 시트 이름 / 열 제목
+"""
+
+import os
+import math
+from datetime import datetime, date
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+
+EXCEL_BACKEND = os.environ.get('EXCEL_BACKEND', 'streaming')
+EXCEL_BACKENDS = ('streaming', 'pandas')
+
+DATETIME_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+
+
+def _plain(value):
+    """pandas to_excel과 같이 결측값은 빈 셀"""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _column_converter(series):
+    """열 dtype으로 (변환 함수, 셀 서식)을 한 번만 결정 (서식 None이면 기본 서식)"""
+    dtype = series.dtype
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return (lambda v: None if v is pd.NaT else v.to_pydatetime()), DATETIME_FORMAT
+    if pd.api.types.is_bool_dtype(dtype):
+        return bool, None
+    if pd.api.types.is_integer_dtype(dtype):
+        return int, None
+    if pd.api.types.is_float_dtype(dtype):
+        return (lambda v: None if v != v else float(v)), None
+    return _plain, None
+
+
+class WorkbookWriter:
+    """
+    시트 단위 워크북 기록기
+
+    with WorkbookWriter(path) as book:
+        book.write_sheet('All_Stocks', df)
+        book.write_rows('Sheet1', header, rows)
+    """
+
+    def __init__(self, path, backend=None):
+        self.path = path
+        self.backend = backend or EXCEL_BACKEND
+        if self.backend not in EXCEL_BACKENDS:
+            raise ValueError(f"EXCEL_BACKEND must be one of {EXCEL_BACKENDS}: {self.backend}")
+        if self.backend == 'pandas':
+            self.writer = pd.ExcelWriter(path, engine='openpyxl')
+        else:
+            self.workbook = Workbook(write_only=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if self.backend == 'pandas':
+            self.writer.close()
+        else:
+            self.workbook.save(self.path)
+
+    def write_sheet(self, sheet_name, df, index=False):
+        """DataFrame 1개를 시트로 기록 (index=True면 인덱스를 첫 열로)"""
+        if self.backend == 'pandas':
+            df.to_excel(self.writer, sheet_name=sheet_name, index=index)
+            return
+
+        if index:
+            df = df.reset_index()
+        converters = [_column_converter(df.iloc[:, i]) for i in range(df.shape[1])]
+        header = [str(col) for col in df.columns]
+        self._stream(sheet_name, header, df.itertuples(index=False, name=None), converters)
+
+    def write_rows(self, sheet_name, header, rows):
+        """
+        DataFrame 없이 행(튜플/리스트)을 바로 기록
+
+        열 dtype을 모르므로 값마다 결측값만 정리한다.
+        """
+        if self.backend == 'pandas':
+            pd.DataFrame(list(rows), columns=header).to_excel(
+                self.writer, sheet_name=sheet_name, index=False)
+            return
+        self._stream(sheet_name, list(header), rows, [(_plain, None)] * len(header))
+
+    def _stream(self, sheet_name, header, rows, converters):
+        sheet = self.workbook.create_sheet(title=sheet_name)
+        sheet.append(header)
+
+        formats = [fmt for _, fmt in converters]
+        funcs = [func for func, _ in converters]
+        if not any(formats):
+            for row in rows:
+                sheet.append([func(value) for func, value in zip(funcs, row)])
+            return
+
+        # 서식이 필요한 열만 WriteOnlyCell로 감쌈
+        for row in rows:
+            values = []
+            for func, fmt, value in zip(funcs, formats, row):
+                value = func(value)
+                if fmt and isinstance(value, (datetime, date)):
+                    cell = WriteOnlyCell(sheet, value=value)
+                    cell.number_format = fmt
+                    value = cell
+                values.append(value)
+            sheet.append(values)
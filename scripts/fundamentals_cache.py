@@ -0,0 +1,137 @@
+"""
+종목 펀더멘털(.info) TTL 캐시 (market_data/fundamentals_cache.json)
+✅ 티커별 시가총액 + 조회 시각 저장, TTL 내에는 Yahoo 호출 생략
+✅ stale-while-revalidate: 만료 후 FUNDAMENTALS_MAX_STALE_HOURS 이내 항목은 이전 값을 바로 쓰고
+   백그라운드에서 재조회, 값이 없거나 너무 오래된 항목만 기다려서 조회
+✅ 조회 실패/제한 시 마지막으로 알려진 값 유지
+✅ CI에서는 매일 실행되는 워크플로 공용 캐시(archive-)에 함께 저장 → 7일 미사용 삭제를 피함
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+
+import yfinance as yf
+
+from concurrent_fetch import run_concurrent
+
+FUNDAMENTALS_CACHE_FILE = 'market_data/fundamentals_cache.json'
+
+# 캐시 유효 시간 (환경 변수로 조정 가능)
+FUNDAMENTALS_TTL_HOURS = float(os.environ.get('FUNDAMENTALS_TTL_HOURS', 72))
+# 만료 후에도 이 시간까지는 이전 값을 바로 쓰고 백그라운드 재조회 (월간 실행 간격 + 여유)
+FUNDAMENTALS_MAX_STALE_HOURS = float(os.environ.get('FUNDAMENTALS_MAX_STALE_HOURS', 24 * 40))
+
+
+def load_fundamentals_cache():
+    """캐시 로드 ({ticker: {'market_cap', 'fetched_at', 'last_error'}})"""
+    try:
+        with open(FUNDAMENTALS_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_fundamentals_cache(cache):
+    """캐시 원자적 저장"""
+    os.makedirs(os.path.dirname(FUNDAMENTALS_CACHE_FILE), exist_ok=True)
+    tmp_file = FUNDAMENTALS_CACHE_FILE + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_file, FUNDAMENTALS_CACHE_FILE)
+
+
+def is_expired(entry, ttl_hours=FUNDAMENTALS_TTL_HOURS):
+    """항목이 없거나 TTL이 지났으면 True"""
+    if not entry or not entry.get('fetched_at'):
+        return True
+    try:
+        fetched_at = datetime.fromisoformat(entry['fetched_at'])
+    except ValueError:
+        return True
+    return datetime.now() - fetched_at > timedelta(hours=ttl_hours)
+
+
+def fetch_market_cap(ticker):
+    """Yahoo .info에서 시가총액 조회 (값이 없으면 예외)"""
+    market_cap = yf.Ticker(ticker).info.get('marketCap')
+    if not market_cap:
+        raise ValueError('marketCap 없음')
+    return float(market_cap)
+
+
+def _apply_result(cache, ticker, market_cap, error):
+    """조회 결과를 캐시에 반영하고 상태 반환 ('refreshed' / 'stale' / 'missing')"""
+    entry = cache.get(ticker, {})
+    if error is None:
+        entry['market_cap'] = market_cap
+        entry['fetched_at'] = datetime.now().isoformat(timespec='seconds')
+        entry.pop('last_error', None)
+        cache[ticker] = entry
+        return 'refreshed'
+
+    entry['last_error'] = str(error)[:100]
+    cache[ticker] = entry
+    return 'stale' if entry.get('market_cap') else 'missing'
+
+
+class Revalidation:
+    """
+    만료 항목의 백그라운드 재조회 핸들
+
+    조회는 별도 스레드에서 진행하고, 결과는 wait()를 부른 스레드에서 캐시에 반영한다
+    (그 전까지 캐시는 바뀌지 않으므로 호출 측은 이전 값을 그대로 읽을 수 있음).
+    """
+
+    def __init__(self, cache, tickers):
+        self.cache = cache
+        self.tickers = tickers
+        self.outcomes = []
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        if tickers:
+            self.thread.start()
+
+    def _run(self):
+        self.outcomes = run_concurrent(fetch_market_cap, self.tickers, host='yahoo')
+
+    def wait(self):
+        """재조회 완료까지 대기 후 캐시에 반영, {'revalidated', 'failed'} 반환"""
+        stats = {'revalidated': 0, 'failed': 0}
+        if not self.tickers:
+            return stats
+        self.thread.join()
+        for ticker, (market_cap, error) in zip(self.tickers, self.outcomes):
+            status = _apply_result(self.cache, ticker, market_cap, error)
+            stats['revalidated' if status == 'refreshed' else 'failed'] += 1
+        return stats
+
+
+def refresh_expired(cache, tickers, ttl_hours=FUNDAMENTALS_TTL_HOURS,
+                    max_stale_hours=FUNDAMENTALS_MAX_STALE_HOURS):
+    """
+    만료 항목 갱신 (stale-while-revalidate)
+
+    만료됐지만 max_stale_hours 이내인 항목은 이전 값을 쓰도록 두고 백그라운드에서
+    재조회한다. 값이 없거나 그보다 오래된 항목만 기다려서 조회한다 (실패 시 이전 값 유지).
+    호출 측은 점수 계산 후 revalidation.wait()로 결과를 반영하고 캐시를 저장한다.
+
+    Returns:
+        ({'fresh', 'revalidating', 'refreshed', 'stale', 'missing'}, Revalidation)
+    """
+    tickers = list(dict.fromkeys(tickers))
+    expired = [t for t in tickers if is_expired(cache.get(t), ttl_hours)]
+    servable = [t for t in expired
+                if cache.get(t, {}).get('market_cap') and not is_expired(cache[t], max_stale_hours)]
+    blocking = [t for t in expired if t not in set(servable)]
+    stats = {'fresh': len(tickers) - len(expired), 'revalidating': len(servable),
+             'refreshed': 0, 'stale': 0, 'missing': 0}
+
+    # 백그라운드 조회를 먼저 시작해 기다려야 하는 항목 조회와 겹치게 함
+    revalidation = Revalidation(cache, servable)
+
+    def on_result(idx, ticker, market_cap, error):
+        stats[_apply_result(cache, ticker, market_cap, error)] += 1
+
+    run_concurrent(fetch_market_cap, blocking, host='yahoo', on_result=on_result)
+    return stats, revalidation
@@ -0,0 +1,120 @@
+"""
+HTTP validator cache for feed/search fetches (market_data/http_cache.json)
+✅ URL별 ETag / Last-Modified 저장 → 다음 요청은 조건부 GET
+✅ 소스별 TTL 내 재요청은 네트워크 없이 "새 항목 없음" 처리
+✅ 304 응답은 파싱 없이 바로 "새 항목 없음"
+✅ fresh / miss / 304 카운트
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+
+import requests
+
+import http_client
+
+HTTP_CACHE_FILE = 'market_data/http_cache.json'
+
+# 소스별 TTL(초): 이 시간 안에 같은 요청을 다시 하면 이전 결과로 충분하다고 본다
+SOURCE_TTL_SECONDS = {
+    'google': int(os.environ.get('GOOGLE_NEWS_TTL', 3600)),
+    'naver': int(os.environ.get('NAVER_SEARCH_TTL', 1800)),
+}
+
+# 이 기간 동안 재요청이 없던 URL의 검증자는 저장 시 제거
+MAX_ENTRY_AGE_DAYS = 7
+
+# fetch() 결과 상태
+FRESH = 'fresh'
+NOT_MODIFIED = 'not_modified'
+OK = 'ok'
+ERROR = 'error'
+
+
+def request_key(url, params=None):
+    """쿼리 파라미터까지 포함한 캐시 키 (헤더의 인증 정보는 제외)"""
+    return requests.Request('GET', url, params=params).prepare().url
+
+
+class HttpCache:
+    """Conditional-GET cache shared by the collection threads"""
+
+    def __init__(self, path=HTTP_CACHE_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.stats = {FRESH: 0, OK: 0, NOT_MODIFIED: 0, ERROR: 0}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except Exception:
+            self.entries = {}
+
+    def _is_fresh(self, entry, source):
+        ttl = SOURCE_TTL_SECONDS.get(source, 0)
+        if not entry or not ttl or not entry.get('fetched_at'):
+            return False
+        fetched_at = datetime.fromisoformat(entry['fetched_at'])
+        return datetime.now() - fetched_at < timedelta(seconds=ttl)
+
+    def _count(self, status):
+        with self.lock:
+            self.stats[status] += 1
+
+    def fetch(self, url, source, params=None, headers=None, timeout=10):
+        """
+        조건부 GET
+
+        Returns:
+            (status, response) — status가 OK일 때만 response 본문을 파싱하면 된다
+        """
+        key = request_key(url, params)
+        with self.lock:
+            entry = dict(self.entries.get(key, {}))
+
+        if self._is_fresh(entry, source):
+            self._count(FRESH)
+            return FRESH, None
+
+        headers = dict(headers or {})
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = http_client.get(url, params=params, headers=headers, timeout=timeout)
+        except Exception:
+            self._count(ERROR)
+            raise
+
+        now = datetime.now().isoformat(timespec='seconds')
+        if response.status_code == 304:
+            with self.lock:
+                self.entries.setdefault(key, {})['fetched_at'] = now
+            self._count(NOT_MODIFIED)
+            return NOT_MODIFIED, response
+
+        if response.status_code != 200:
+            self._count(ERROR)
+            return ERROR, response
+
+        with self.lock:
+            self.entries[key] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched_at': now,
+            }
+        self._count(OK)
+        return OK, response
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        cutoff = (datetime.now() - timedelta(days=MAX_ENTRY_AGE_DAYS)).isoformat(timespec='seconds')
+        with self.lock:
+            data = {k: v for k, v in self.entries.items() if v.get('fetched_at', '') >= cutoff}
+        tmp_file = self.path + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_file, self.path)
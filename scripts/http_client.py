@@ -0,0 +1,125 @@
+"""
+공용 HTTP 클라이언트 (Naver 검색/Papago/Telegram/RSS)
+✅ 호스트별 keep-alive 세션 풀 재사용 → 요청마다 TCP+TLS 핸드셰이크 제거
+✅ 429/5xx 재시도 + 지수 백오프 (Retry-After 헤더 존중), POST는 429에서만 재시도
+✅ 엔드포인트별 요청 수/지연/바이트 카운터
+"""
+
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+HTTP_RETRY_TOTAL = int(os.environ.get('HTTP_RETRY_TOTAL', 3))
+HTTP_BACKOFF_FACTOR = float(os.environ.get('HTTP_BACKOFF_FACTOR', 0.5))
+HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', 10))
+RETRY_STATUS = (429, 500, 502, 503, 504)
+# POST(Telegram 전송, Papago 과금)는 처리 전에 거절되는 429에서만 재시도
+# (5xx/읽기 오류는 이미 전송·과금된 뒤일 수 있어 다시 보내지 않음)
+POST_RETRY_STATUS = (429,)
+
+# Telegram URL의 봇 토큰이 통계/로그에 남지 않도록 마스킹
+_BOT_TOKEN_RE = re.compile(r'/bot[^/]+')
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+_stats = defaultdict(lambda: {'requests': 0, 'errors': 0, 'seconds': 0.0, 'bytes': 0})
+_stats_lock = threading.Lock()
+
+
+class _Retry(Retry):
+    """GET/HEAD는 RETRY_STATUS 전체, POST는 POST_RETRY_STATUS에서만 재시도"""
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method.upper() == 'POST':
+            return status_code in POST_RETRY_STATUS
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def _new_session():
+    retry = _Retry(
+        total=HTTP_RETRY_TOTAL,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session(url):
+    """URL 호스트별 공유 세션 (최초 요청 시 생성)"""
+    parts = urlsplit(url)
+    key = f'{parts.scheme}://{parts.netloc}'
+    with _sessions_lock:
+        if key not in _sessions:
+            _sessions[key] = _new_session()
+        return _sessions[key]
+
+
+def endpoint_label(url):
+    """통계 키: 호스트 + 경로 (쿼리 제외, 봇 토큰 마스킹)"""
+    parts = urlsplit(url)
+    return parts.netloc + _BOT_TOKEN_RE.sub('/bot***', parts.path)
+
+
+def _record(endpoint, seconds, nbytes, error):
+    with _stats_lock:
+        stat = _stats[endpoint]
+        stat['requests'] += 1
+        stat['seconds'] += seconds
+        stat['bytes'] += nbytes
+        if error:
+            stat['errors'] += 1
+
+
+def request(method, url, endpoint=None, **kwargs):
+    """공유 세션으로 요청하고 엔드포인트별 카운터 기록 (예외는 호출 측으로 전달)"""
+    endpoint = endpoint or endpoint_label(url)
+    kwargs.setdefault('timeout', 10)
+    started = time.perf_counter()
+    try:
+        response = get_session(url).request(method, url, **kwargs)
+    except Exception:
+        _record(endpoint, time.perf_counter() - started, 0, True)
+        raise
+    _record(endpoint, time.perf_counter() - started, len(response.content), response.status_code >= 400)
+    return response
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def get_http_stats():
+    """{endpoint: {'requests', 'errors', 'seconds', 'bytes'}} 스냅샷"""
+    with _stats_lock:
+        return {k: dict(v) for k, v in _stats.items()}
+
+
+def print_http_stats():
+    """엔드포인트별 요청 통계 출력"""
+    stats = get_http_stats()
+    if not stats:
+        return
+    print("\n[HTTP]")
+    for endpoint, stat in sorted(stats.items()):
+        avg_ms = stat['seconds'] / stat['requests'] * 1000 if stat['requests'] else 0
+        print(f"  {endpoint}: {stat['requests']} req, {stat['errors']} err, "
+              f"avg {avg_ms:.0f}ms, {stat['bytes'] / 1024:.1f}KB")
@@ -0,0 +1,269 @@
+"""
+종목별 스트리밍 지표 상태 (market_data/indicator_state.json)
+✅ MA20/MA60 이동합, 14일 상승/하락 합, 20/60일 거래량 합, 최근 종가를 보존
+✅ 새 봉 1개당 O(1) 갱신 → 일일 리포트는 히스토리 로드 없이 상태만으로 행 생성
+✅ 공백(누락 봉)이나 수정주가 변경 시에만 캐시 히스토리로 전체 재구성
+"""
+
+import os
+import json
+from collections import deque
+from datetime import datetime
+
+import pandas as pd
+
+STATE_FILE = 'market_data/indicator_state.json'
+
+# 보관하는 최근 봉 수 (MA60 + 1개월 수익률 계산에 충분)
+WINDOW = 60
+RSI_PERIOD = 14
+
+
+class IndicatorState:
+    """한 종목의 증분 지표 상태"""
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+        self.last_date = None
+        self.bars = 0
+        self.closes = deque(maxlen=WINDOW)
+        self.volumes = deque(maxlen=WINDOW)
+        self.gains = deque(maxlen=RSI_PERIOD)
+        self.losses = deque(maxlen=RSI_PERIOD)
+        self.sum_close_20 = 0.0
+        self.sum_close_60 = 0.0
+        self.sum_volume_20 = 0.0
+        self.sum_volume_60 = 0.0
+        self.sum_gain = 0.0
+        self.sum_loss = 0.0
+
+    @property
+    def last_close(self):
+        return self.closes[-1] if self.closes else None
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+
+    def update(self, date, close, volume):
+        """새 봉 1개 반영 (O(1))"""
+        close = float(close)
+        volume = float(volume)
+
+        if self.closes:
+            delta = close - self.closes[-1]
+            if len(self.gains) == RSI_PERIOD:
+                self.sum_gain -= self.gains[0]
+                self.sum_loss -= self.losses[0]
+            self.gains.append(max(delta, 0.0))
+            self.losses.append(max(-delta, 0.0))
+            self.sum_gain += self.gains[-1]
+            self.sum_loss += self.losses[-1]
+
+        if len(self.closes) >= 20:
+            self.sum_close_20 -= self.closes[-20]
+            self.sum_volume_20 -= self.volumes[-20]
+        if len(self.closes) == WINDOW:
+            self.sum_close_60 -= self.closes[0]
+            self.sum_volume_60 -= self.volumes[0]
+
+        self.closes.append(close)
+        self.volumes.append(volume)
+        self.sum_close_20 += close
+        self.sum_close_60 += close
+        self.sum_volume_20 += volume
+        self.sum_volume_60 += volume
+
+        self.bars += 1
+        self.last_date = pd.Timestamp(date).strftime('%Y-%m-%d')
+
+    def revise_last(self, close, volume):
+        """마지막 봉 값 정정 (장중 수집된 미확정 봉이 확정된 경우, O(1))"""
+        close = float(close)
+        volume = float(volume)
+        close_diff = close - self.closes[-1]
+        volume_diff = volume - self.volumes[-1]
+
+        if self.gains and len(self.closes) >= 2:
+            self.sum_gain -= self.gains[-1]
+            self.sum_loss -= self.losses[-1]
+            delta = close - self.closes[-2]
+            self.gains[-1] = max(delta, 0.0)
+            self.losses[-1] = max(-delta, 0.0)
+            self.sum_gain += self.gains[-1]
+            self.sum_loss += self.losses[-1]
+
+        self.closes[-1] = close
+        self.volumes[-1] = volume
+        self.sum_close_20 += close_diff
+        self.sum_close_60 += close_diff
+        self.sum_volume_20 += volume_diff
+        self.sum_volume_60 += volume_diff
+
+    @classmethod
+    def from_history(cls, ticker, hist):
+        """캐시 히스토리로 전체 재구성 (최근 WINDOW+1개 봉만 재생)"""
+        state = cls(ticker)
+        hist = hist.dropna(subset=['Close'])
+        for date, row in hist.iloc[-(WINDOW + 1):].iterrows():
+            state.update(date, row['Close'], row['Volume'])
+        state.bars = len(hist)
+        return state
+
+    # ------------------------------------------------------------------
+    # 출력
+    # ------------------------------------------------------------------
+
+    def _return(self, n):
+        if len(self.closes) < n or not self.closes[-n]:
+            return float('nan')
+        return (self.closes[-1] / self.closes[-n] - 1) * 100
+
+    def _rsi(self):
+        if self.bars < RSI_PERIOD:
+            return 50.0
+        if self.sum_loss <= 0:
+            return 100.0 if self.sum_gain > 0 else float('nan')
+        rs = self.sum_gain / self.sum_loss
+        return 100 - (100 / (1 + rs))
+
+    def to_indicators(self):
+        """indicators.compute_indicators 의 종목별 행과 같은 키로 현재 지표 반환"""
+        nan = float('nan')
+        n = len(self.closes)
+        ma_20 = self.sum_close_20 / 20 if n >= 20 else nan
+        ma_60 = self.sum_close_60 / WINDOW if n >= WINDOW else nan
+        avg_volume_20 = self.sum_volume_20 / 20 if n >= 20 else nan
+        avg_volume_60 = self.sum_volume_60 / WINDOW if n >= WINDOW else nan
+        return {
+            'bars': self.bars,
+            'price': self.closes[-1],
+            'prev_close': self.closes[-2] if n >= 2 else nan,
+            'change_1d': self._return(2),
+            'change_1w': self._return(5),
+            'change_1m': self._return(21),
+            'ma_20': ma_20,
+            'ma_60': ma_60,
+            'golden_cross': ma_20 > ma_60,
+            'dead_cross': ma_20 < ma_60,
+            'volume': self.volumes[-1],
+            'avg_volume_20': avg_volume_20,
+            'avg_volume_60': avg_volume_60,
+            'rsi': self._rsi(),
+        }
+
+    # ------------------------------------------------------------------
+    # 직렬화
+    # ------------------------------------------------------------------
+
+    def to_dict(self):
+        return {
+            'last_date': self.last_date,
+            'bars': self.bars,
+            'closes': list(self.closes),
+            'volumes': list(self.volumes),
+            'gains': list(self.gains),
+            'losses': list(self.losses),
+        }
+
+    @classmethod
+    def from_dict(cls, ticker, data):
+        """저장된 버퍼에서 복원 (이동합은 버퍼로부터 다시 계산하여 부동소수 오차 제거)"""
+        state = cls(ticker)
+        state.last_date = data['last_date']
+        state.bars = data['bars']
+        state.closes.extend(data['closes'])
+        state.volumes.extend(data['volumes'])
+        state.gains.extend(data['gains'])
+        state.losses.extend(data['losses'])
+        closes = list(state.closes)
+        volumes = list(state.volumes)
+        state.sum_close_20 = sum(closes[-20:])
+        state.sum_close_60 = sum(closes)
+        state.sum_volume_20 = sum(volumes[-20:])
+        state.sum_volume_60 = sum(volumes)
+        state.sum_gain = sum(state.gains)
+        state.sum_loss = sum(state.losses)
+        return state
+
+
+def load_states():
+    """저장된 종목별 상태 로드 ({ticker: IndicatorState})"""
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {t: IndicatorState.from_dict(t, d) for t, d in data.get('states', {}).items()}
+    except Exception:
+        return {}
+
+
+def save_states(states):
+    """종목별 상태 원자적 저장"""
+    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+    data = {
+        'last_updated': datetime.now().isoformat(timespec='seconds'),
+        'states': {t: s.to_dict() for t, s in states.items()},
+    }
+    tmp_file = STATE_FILE + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_file, STATE_FILE)
+
+
+def advance_state(state, tail):
+    """
+    이번 실행에서 받은 꼬리 봉으로 상태 전진
+
+    Returns:
+        True: 증분 갱신 성공 / False: 공백 등으로 전체 재구성 필요
+    """
+    tail = tail.dropna(subset=['Close'])
+    if tail.empty:
+        return True
+
+    last = pd.Timestamp(state.last_date)
+    if last not in tail.index:
+        # 꼬리가 마지막 상태 봉과 이어지지 않음 (누락 구간)
+        return tail.index[-1] <= last
+
+    known = tail.loc[last]
+    if float(known['Close']) != state.last_close or float(known['Volume']) != state.volumes[-1]:
+        state.revise_last(known['Close'], known['Volume'])
+
+    for date, row in tail[tail.index > last].iterrows():
+        state.update(date, row['Close'], row['Volume'])
+    return True
+
+
+def refresh_states(states, tickers, tails, backfilled, load_history):
+    """
+    종목별 상태를 최신화하고 지표 행 DataFrame 반환
+
+    Args:
+        tails: 이번 실행에서 받은 종목별 새 봉
+        backfilled: 전체 백필(콜드 또는 수정주가 변경)된 종목 집합
+        load_history: 재구성이 필요할 때만 호출되는 히스토리 로더
+    """
+    rebuilt = 0
+    rows = {}
+    for ticker in dict.fromkeys(tickers):
+        state = states.get(ticker)
+        tail = tails.get(ticker)
+
+        needs_rebuild = state is None or ticker in backfilled
+        if not needs_rebuild and tail is not None:
+            needs_rebuild = not advance_state(state, tail)
+
+        if needs_rebuild:
+            hist = load_history(ticker)
+            if hist.empty:
+                continue
+            state = IndicatorState.from_history(ticker, hist)
+            states[ticker] = state
+            rebuilt += 1
+
+        if state.closes:
+            rows[ticker] = state.to_indicators()
+
+    print(f"🧮 지표 상태: 증분 {len(rows) - rebuilt}개, 재구성 {rebuilt}개")
+    return pd.DataFrame.from_dict(rows, orient='index')
@@ -0,0 +1,156 @@
+"""
+유니버스 전체 기술적 지표 계산 엔진 (NumPy 벡터화)
+✅ 입력: 날짜 × 종목 형태의 종가/거래량 wide 행렬
+✅ RSI, 이동평균, 골든/데드크로스, 거래량 추세, N일 수익률을 전 종목 동시 계산
+
+모든 지표는 종목별 "자기 거래일" 기준으로 계산한다. 여러 거래소가 섞인 패널에서는
+휴장일이 NaN으로 채워지므로, 각 종목의 유효 봉만 아래쪽으로 모아(오른쪽 정렬)
+iloc[-n] 과 같은 의미가 되도록 맞춘다.
+"""
+
+import numpy as np
+import pandas as pd
+
+# 지표 계산에 사용하는 최근 봉 수 (6개월 수익률 + 여유분)
+DEFAULT_LOOKBACK = 260
+
+
+def panel_field(panel, field):
+    """(ticker, field) MultiIndex 패널에서 한 필드의 날짜 × 종목 wide DataFrame 추출"""
+    if panel.empty:
+        return pd.DataFrame()
+    return panel.xs(field, level='field', axis=1)
+
+
+def right_align(close, volume=None, lookback=DEFAULT_LOOKBACK):
+    """
+    종목별 유효 봉을 행렬 아래쪽으로 모아 (lookback × N) 배열로 반환
+
+    Returns:
+        (close_arr, volume_arr, bars) — bars는 종목별 유효 봉 수
+    """
+    close_arr = close.to_numpy(dtype=float)
+    valid = ~np.isnan(close_arr)
+
+    # False(결측)가 앞으로, True(유효)가 원래 순서대로 뒤로 오도록 안정 정렬
+    order = np.argsort(valid, axis=0, kind='stable')
+    close_arr = np.take_along_axis(close_arr, order, axis=0)[-lookback:]
+
+    volume_arr = None
+    if volume is not None:
+        volume_arr = volume.reindex(index=close.index, columns=close.columns).to_numpy(dtype=float)
+        volume_arr = np.take_along_axis(volume_arr, order, axis=0)[-lookback:]
+
+    bars = valid.sum(axis=0)
+    return close_arr, volume_arr, bars
+
+
+def rolling_mean(values, window):
+    """축 0 방향 이동평균 (창 안에 결측이 있으면 NaN)"""
+    filled = np.nan_to_num(values, nan=0.0)
+    counts = (~np.isnan(values)).astype(float)
+
+    csum = np.cumsum(filled, axis=0)
+    ccount = np.cumsum(counts, axis=0)
+    csum[window:] = csum[window:] - csum[:-window]
+    ccount[window:] = ccount[window:] - ccount[:-window]
+
+    out = np.full(values.shape, np.nan)
+    full = ccount == window
+    out[full] = csum[full] / window
+    return out
+
+
+def last_mean(values, window):
+    """마지막 window개 행의 평균 (봉이 부족하거나 결측이 있으면 NaN)"""
+    if len(values) < window:
+        return np.full(values.shape[1], np.nan)
+    return values[-window:].mean(axis=0)
+
+
+def n_day_return(close, n):
+    """현재가 / n번째 이전 봉(iloc[-n]) - 1 (%)"""
+    if len(close) < n:
+        return np.full(close.shape[1], np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (close[-1] / close[-n] - 1) * 100
+
+
+def rsi_series(close, period=14):
+    """단순 이동평균 방식 RSI 전체 시계열 (결측 차분은 0으로 처리)"""
+    deltas = np.diff(close, axis=0, prepend=np.nan)
+    gain = np.where(deltas > 0, deltas, 0.0)
+    loss = np.where(deltas < 0, -deltas, 0.0)
+
+    avg_gain = rolling_mean(gain, period)
+    avg_loss = rolling_mean(loss, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+def rsi_last(close, bars, period=14):
+    """마지막 봉의 RSI (유효 봉이 period개 미만이면 50)"""
+    if len(close) < period:
+        return np.full(close.shape[1], 50.0)
+    # 마지막 period개 차분만 필요하므로 period+1행만 사용
+    rsi = rsi_series(close[-(period + 1):], period)[-1]
+    return np.where(bars < period, 50.0, rsi)
+
+
+def compute_indicators(close, volume, lookback=DEFAULT_LOOKBACK):
+    """
+    전 종목 지표를 한 번에 계산
+
+    Args:
+        close, volume: index=날짜, columns=티커 인 wide DataFrame
+
+    Returns:
+        index=티커 DataFrame. 봉 수가 부족한 지표는 NaN (대체값은 호출 측에서 결정)
+    """
+    if close.empty:
+        return pd.DataFrame()
+
+    c, v, bars = right_align(close, volume, lookback)
+
+    ma_20 = last_mean(c, 20)
+    ma_60 = last_mean(c, 60)
+    prev_ma_20 = last_mean(c[:-1], 20)
+    prev_ma_60 = last_mean(c[:-1], 60)
+
+    avg_volume_20 = last_mean(v, 20)
+    avg_volume_60 = last_mean(v, 60)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vs_ma20 = (c[-1] / ma_20 - 1) * 100
+        volume_ratio = v[-1] / avg_volume_20 * 100
+        volume_trend = avg_volume_20 / avg_volume_60
+
+    return pd.DataFrame({
+        'bars': bars,
+        'price': c[-1],
+        'prev_close': c[-2] if len(c) >= 2 else np.full(c.shape[1], np.nan),
+        'change_1d': n_day_return(c, 2),
+        'change_1w': n_day_return(c, 5),
+        'change_1m': n_day_return(c, 21),
+        'return_3m': n_day_return(c, 63),
+        'return_6m': n_day_return(c, 126),
+        'ma_20': ma_20,
+        'ma_60': ma_60,
+        'vs_ma20': vs_ma20,
+        'golden_cross': ma_20 > ma_60,
+        'dead_cross': ma_20 < ma_60,
+        'cross_up': (prev_ma_20 <= prev_ma_60) & (ma_20 > ma_60),
+        'cross_down': (prev_ma_20 >= prev_ma_60) & (ma_20 < ma_60),
+        'volume': v[-1],
+        'avg_volume_20': avg_volume_20,
+        'avg_volume_60': avg_volume_60,
+        'volume_ratio': volume_ratio,
+        'volume_trend': volume_trend,
+        'rsi': rsi_last(c, bars, 14),
+    }, index=close.columns)
+
+
+def compute_panel_indicators(panel, lookback=DEFAULT_LOOKBACK):
+    """(ticker, field) OHLCV 패널에서 바로 지표 계산"""
+    return compute_indicators(panel_field(panel, 'Close'), panel_field(panel, 'Volume'), lookback)
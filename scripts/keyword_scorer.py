@@ -0,0 +1,162 @@
+"""
+Compiled keyword relevance scorer for news articles
+✅ 모든 등급(high/medium) 키워드를 트라이 기반 정규식 하나로 1회 컴파일
+✅ 기존과 같은 대소문자 무시 부분 문자열 매칭 (겹치는/접두 키워드 포함)
+✅ 여러 기사를 한 번의 스캔으로 일괄 채점 → 키워드 수 × 기사 수에 비례하지 않음
+✅ 키워드가 적으면(LOOP_MAX_KEYWORDS 이하) 정규식보다 빠른 키워드별 검사로 자동 전환
+✅ 키워드별 등장 횟수 + 가중 점수
+"""
+
+import re
+from bisect import bisect_right
+from collections import Counter
+
+# 등급별 가중치 (dict 순서 = 등급 우선순위)
+TIER_WEIGHTS = {'high': 10, 'medium': 6}
+MIN_SCORE = 1
+# 이 개수 이하에서는 키워드별 부분 문자열 검사가 정규식 스캔보다 빠름 (bench_keyword_scorer 기준)
+LOOP_MAX_KEYWORDS = 150
+
+_END = ''
+
+
+def _build_trie(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[_END] = True
+    return trie
+
+
+def _trie_regex(node):
+    """트라이 → 정규식 (단말 노드 이후는 선택적 그룹이라 가장 긴 키워드를 우선 매칭)"""
+    alts = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.items()) if ch != _END]
+    if not alts:
+        return ''
+    optional = _END in node
+    if len(alts) == 1 and not optional:
+        return alts[0]
+    return '(?:' + '|'.join(alts) + ')' + ('?' if optional else '')
+
+
+class KeywordScorer:
+    """
+    Scores text against tiered keywords
+
+    score는 기존 등급 점수(high 10 / medium 6 / 없음 1)이고, relevance는 매칭된
+    서로 다른 키워드의 가중치 합이다. matched_keywords는 첫 매칭 하나가 아니라
+    매칭된 모든 키워드를 정의 순서로 담는다.
+    """
+
+    def __init__(self, keywords_dict, weights=TIER_WEIGHTS, min_score=MIN_SCORE,
+                 loop_max_keywords=LOOP_MAX_KEYWORDS):
+        self.weights = dict(weights)
+        self.min_score = min_score
+
+        # 소문자 키워드 → (원래 표기, 등급). 중복 시 상위 등급/먼저 나온 표기 유지
+        self.keywords = {}
+        for tier in self.weights:
+            for keyword in keywords_dict.get(tier, []):
+                self.keywords.setdefault(keyword.lower(), (keyword, tier))
+
+        self._order = {word: i for i, word in enumerate(self.keywords)}
+        self._trie = _build_trie(self.keywords)
+        # 같은 위치에서 시작하는 짧은 키워드(접두)도 세기 위한 목록
+        self._prefixes = {word: self._prefix_keywords(word) for word in self.keywords}
+        body = _trie_regex(self._trie)
+        # 전방탐색으로 모든 시작 위치를 검사 → 겹치는 키워드도 부분 문자열 의미 그대로 매칭
+        self.pattern = re.compile(f'(?=({body}))') if body else None
+        self.use_loop = len(self.keywords) <= loop_max_keywords
+        # 자기 자신과 겹칠 수 있는 키워드(예: 'aa')는 str.count가 겹침을 세지 않으므로 따로 표시
+        self._loop_words = [
+            (word, any(word[:i] == word[-i:] for i in range(1, len(word))))
+            for word in self.keywords
+        ]
+
+    def _prefix_keywords(self, word):
+        found = []
+        node = self._trie
+        for i, ch in enumerate(word, 1):
+            node = node[ch]
+            if _END in node:
+                found.append(word[:i])
+        return found
+
+    def _loop_counts(self, text):
+        """키워드별 겹침 포함 등장 횟수 (정규식 스캔과 같은 결과)"""
+        counts = {}
+        for word, overlaps in self._loop_words:
+            if word not in text:
+                continue
+            if not overlaps:
+                counts[word] = text.count(word)
+                continue
+            n = 0
+            pos = text.find(word)
+            while pos != -1:
+                n += 1
+                pos = text.find(word, pos + 1)
+            counts[word] = n
+        return counts
+
+    def _iter_hits(self, text):
+        """(시작 위치, 소문자 키워드)"""
+        if self.pattern is None:
+            return
+        for match in self.pattern.finditer(text):
+            for word in self._prefixes[match.group(1)]:
+                yield match.start(), word
+
+    def _result(self, counts):
+        hits = {}
+        tiers = set()
+        relevance = 0
+        # 키워드 정의 순서로 정렬된 결과 (매칭된 키워드만 순회)
+        for word in sorted(counts, key=self._order.__getitem__):
+            keyword, tier = self.keywords[word]
+            hits[keyword] = counts[word]
+            tiers.add(tier)
+            relevance += self.weights[tier]
+
+        score = self.min_score
+        for tier, weight in self.weights.items():
+            if tier in tiers:
+                score = max(weight, self.min_score)
+                break
+
+        return {
+            'score': score,
+            'relevance': max(relevance, self.min_score),
+            'matched_keywords': list(hits),
+            'keyword_hits': hits,
+        }
+
+    def score(self, text):
+        """단일 텍스트 채점"""
+        text = text.lower()
+        if self.use_loop:
+            return self._result(self._loop_counts(text))
+        return self._result(Counter(word for _, word in self._iter_hits(text)))
+
+    def score_batch(self, texts):
+        """
+        여러 텍스트를 개행으로 이어 한 번에 스캔 (키워드에는 개행이 없으므로 경계를 넘는 매칭 없음)
+
+        Returns:
+            입력 순서의 score() 결과 목록
+        """
+        if self.use_loop:
+            return [self.score(text) for text in texts]
+        texts = [text.replace('\n', ' ').lower() for text in texts]
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+
+        counts = [Counter() for _ in texts]
+        for pos, word in self._iter_hits('\n'.join(texts)):
+            counts[bisect_right(starts, pos) - 1][word] += 1
+        return [self._result(c) for c in counts]
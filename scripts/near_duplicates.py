@@ -0,0 +1,148 @@
+"""
+Near-duplicate news detection (SimHash + LSH)
+✅ 정규화한 제목/설명의 문자 3-gram으로 64비트 SimHash
+✅ 밴드 LSH 인덱스로 후보 쌍만 비교 (해밍 거리 ≤ 임계값이면 같은 기사)
+✅ 중복 묶음은 대표 기사 1개로 합치고 관련 기업 태그를 모두 부착
+"""
+
+import os
+import re
+import hashlib
+from collections import defaultdict
+
+SIMHASH_BITS = 64
+
+# 해밍 거리 임계값. 밴드 수를 임계값+1로 두면 임계값 이내 쌍은 반드시 한 밴드가 일치한다
+NEAR_DUP_HAMMING = int(os.environ.get('NEAR_DUP_HAMMING', 3))
+LSH_BANDS = NEAR_DUP_HAMMING + 1
+
+TITLE_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+DESCRIPTION_CHARS = 200
+
+_PUBLISHER_SUFFIX_RE = re.compile(r'\s+[-|]\s+[^-|]{1,60}$')
+_NON_WORD_RE = re.compile(r'[\W_]+')
+
+
+def normalize(text):
+    """소문자화, 구두점 제거, 공백 정리"""
+    return _NON_WORD_RE.sub(' ', text.lower()).strip()
+
+
+def normalize_title(title):
+    """Google News 제목 끝의 " - 언론사" 꼬리 제거 후 정규화"""
+    return normalize(_PUBLISHER_SUFFIX_RE.sub('', title))
+
+
+def shingles(text, n=3):
+    text = text.replace(' ', '')
+    if len(text) <= n:
+        return [text] if text else []
+    return [text[i:i + n] for i in range(len(text) - n + 1)]
+
+
+def _feature_hash(feature):
+    # 프로세스마다 바뀌는 hash() 대신 고정 해시 → 실행 간 결과 동일
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(weighted_features):
+    """[(feature, weight), ...] → 64비트 정수"""
+    totals = [0] * SIMHASH_BITS
+    for feature, weight in weighted_features:
+        h = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            totals[bit] += weight if h >> bit & 1 else -weight
+    value = 0
+    for bit, total in enumerate(totals):
+        if total > 0:
+            value |= 1 << bit
+    return value
+
+
+def news_fingerprint(news_item):
+    features = [(s, TITLE_WEIGHT) for s in shingles(normalize_title(news_item.get('title', '')))]
+    description = normalize(news_item.get('description', '')[:DESCRIPTION_CHARS])
+    features += [(s, DESCRIPTION_WEIGHT) for s in shingles(description)]
+    return simhash(features)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+
+def _bands(value):
+    width = SIMHASH_BITS // LSH_BANDS
+    mask = (1 << width) - 1
+    return [(i, value >> (i * width) & mask) for i in range(LSH_BANDS)]
+
+
+def find_clusters(items, threshold=NEAR_DUP_HAMMING):
+    """
+    LSH로 후보를 찾고 해밍 거리로 확인해 묶음(union-find) 생성
+
+    Returns:
+        [[index, ...], ...] — 2개 이상인 묶음만, 각 묶음과 묶음 목록은 입력 순서
+    """
+    fingerprints = [news_fingerprint(item) for item in items]
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = defaultdict(list)
+    for i, fp in enumerate(fingerprints):
+        for band in _bands(fp):
+            for j in buckets[band]:
+                if find(i) != find(j) and hamming(fp, fingerprints[j]) <= threshold:
+                    parent[max(find(i), find(j))] = min(find(i), find(j))
+            buckets[band].append(i)
+
+    groups = defaultdict(list)
+    for i in range(len(items)):
+        groups[find(i)].append(i)
+    return [members for _, members in sorted(groups.items()) if len(members) > 1]
+
+
+def _rank(item):
+    return (item.get('score', 0), item.get('relevance', 0), item.get('date', ''))
+
+
+def collapse_near_duplicates(news_by_company):
+    """
+    기업별 기사 목록에서 준중복 기사를 대표 기사 1개로 합침
+
+    대표 기사는 점수(score, relevance, date)가 가장 높은 기사이며 원래 기업 목록에 남고,
+    'companies'에 묶음의 모든 기업이, 'duplicate_links'에 제거된 기사 링크가 기록된다.
+
+    Returns:
+        (deduped_by_company, removed_items)
+    """
+    items = [item for news_list in news_by_company.values() for item in news_list]
+    for item in items:
+        item['companies'] = [item['company']]
+
+    removed = set()
+    for members in find_clusters(items):
+        group = [items[i] for i in members]
+        canonical = max(group, key=_rank)
+        for item in group:
+            if item is canonical:
+                continue
+            removed.add(id(item))
+            if item['company'] not in canonical['companies']:
+                canonical['companies'].append(item['company'])
+            # 여러 기업에 귀속된 같은 기사 사본은 링크가 같으므로 제거 목록에서 제외
+            if item['link'] != canonical['link']:
+                canonical.setdefault('duplicate_links', []).append(item['link'])
+
+    deduped = {}
+    for company, news_list in news_by_company.items():
+        kept = [item for item in news_list if id(item) not in removed]
+        if kept:
+            deduped[company] = kept
+    removed_items = [item for item in items if id(item) in removed]
+    return deduped, removed_items
@@ -0,0 +1,158 @@
+"""
+News query planner
+✅ 겹치는 검색어를 소스가 지원하는 OR 쿼리로 묶어 요청 수 감소
+✅ 요청 예산(NEWS_REQUEST_BUDGET) 안에서 설정된 모든 검색어를 커버
+✅ 묶인 쿼리의 결과는 제목/설명 매칭으로 기업에 다시 귀속
+"""
+
+import os
+import re
+
+# 소스별 OR 쿼리 제한
+MAX_TERMS_PER_QUERY = {'google': 4, 'naver': 3}
+MAX_QUERY_LENGTH = {'google': 200, 'naver': 100}
+
+# 0이면 제한 없음. 예산을 넘으면 쿼리당 검색어 수를 늘려 다시 묶는다
+NEWS_REQUEST_BUDGET = int(os.environ.get('NEWS_REQUEST_BUDGET', 0))
+
+
+def source_for(stock):
+    return 'google' if stock['country'] == 'US' else 'naver'
+
+
+def stock_terms(stock):
+    return stock.get('search_terms') or [stock['name']]
+
+
+def company_aliases(stock):
+    """
+    기사 귀속에 쓰는 기업 별칭
+
+    Returns:
+        (정식 이름 목록, 짧은 별칭 목록) — 짧은 별칭은 각 검색어의 첫 단어 (예: 'SK하이닉스').
+        정식 이름의 첫 단어일 뿐인 별칭('Super Micro'의 'super', 'LS ELECTRIC'의 'ls')은
+        일반 단어와 겹치므로 제외한다.
+    """
+    name = stock['name'].lower()
+    short = [term.split()[0].lower() for term in stock_terms(stock)]
+    return [name], [a for a in dict.fromkeys(short) if a != name and not name.startswith(a + ' ')]
+
+
+def _alias_pattern(aliases):
+    """
+    별칭을 단어 단위로만 매칭하는 정규식 (없으면 None)
+
+    영문/숫자 경계만 검사한다: 'intel'은 'intelligence'에 매칭되지 않지만
+    한글 조사가 붙은 '삼성전자는'에는 매칭된다.
+    """
+    if not aliases:
+        return None
+    alternation = '|'.join(re.escape(a) for a in sorted(aliases, key=len, reverse=True))
+    return re.compile(rf'(?<![0-9a-z])(?:{alternation})(?![0-9a-z])')
+
+
+def format_query(source, terms):
+    """
+    OR 쿼리 문자열 생성
+
+    Google News는 괄호 그룹과 OR를 지원하므로 (a b) OR (c d) 형태로 묶는다.
+    Naver 검색은 그룹 없이 | 만 지원하므로 첫 단어가 같은 검색어끼리만
+    "공통어 나머지1 | 나머지2" 형태로 묶고, 나머지는 묶지 않는다.
+    """
+    if len(terms) == 1:
+        return terms[0]
+    if source == 'google':
+        return ' OR '.join(f'({t})' for t in terms)
+
+    prefix = terms[0].split()[0]
+    rests = [t[len(prefix):].strip() for t in terms]
+    return f"{prefix} {' | '.join(rests)}"
+
+
+def _can_merge(source, group, term):
+    if source == 'naver':
+        # 같은 첫 단어를 공유하고 나머지가 있는 검색어만 묶을 수 있음
+        head = group[0][1].split()
+        words = term.split()
+        if head[0] != words[0] or len(head) < 2 or len(words) < 2:
+            return False
+    return True
+
+
+def _pack(source, entries, max_terms):
+    """(stock, term) 목록을 순서대로 쿼리 그룹으로 묶음"""
+    groups = []
+    for stock, term in entries:
+        if groups:
+            group = groups[-1]
+            terms = [t for _, t in group] + [term]
+            if (len(terms) <= max_terms
+                    and _can_merge(source, group, term)
+                    and len(format_query(source, terms)) <= MAX_QUERY_LENGTH[source]):
+                group.append((stock, term))
+                continue
+        groups.append([(stock, term)])
+    return groups
+
+
+def plan_queries(stocks, budget=None):
+    """
+    검색어를 소스별 OR 쿼리로 묶은 실행 계획 생성
+
+    Returns:
+        [{'source', 'query', 'terms', 'stocks'}, ...] — 원래 검색어 순서 유지
+    """
+    budget = NEWS_REQUEST_BUDGET if budget is None else budget
+
+    entries = {'google': [], 'naver': []}
+    for stock in stocks:
+        for term in stock_terms(stock):
+            entries[source_for(stock)].append((stock, term))
+
+    max_terms = dict(MAX_TERMS_PER_QUERY)
+    groups = {src: _pack(src, items, max_terms[src]) for src, items in entries.items()}
+
+    # 예산 초과 시 쿼리당 검색어 수를 늘려가며 다시 묶음 (길이 제한 내에서)
+    while budget and sum(len(g) for g in groups.values()) > budget:
+        before = sum(len(g) for g in groups.values())
+        for src in groups:
+            max_terms[src] += 1
+            groups[src] = _pack(src, entries[src], max_terms[src])
+        if sum(len(g) for g in groups.values()) >= before:
+            print(f"  [PLAN] request budget {budget} not reachable, using {before} requests")
+            break
+
+    plan = []
+    for src in ('google', 'naver'):
+        for group in groups[src]:
+            terms = [t for _, t in group]
+            plan.append({
+                'source': src,
+                'query': format_query(src, terms),
+                'terms': terms,
+                'stocks': list({id(s): s for s, _ in group}.values()),
+            })
+    return plan
+
+
+def attribute_companies(news_item, candidates):
+    """
+    묶인 쿼리 결과를 기업에 귀속
+
+    제목/설명에서 정식 이름이 단어 단위로 등장하는 후보들, 없으면 짧은 별칭으로
+    다시 확인한 후보들을 쿼리 순서대로 반환한다 (경쟁사 비교 기사는 여러 기업).
+    아무 기업도 매칭되지 않으면 빈 목록 (추측하지 않음 — 호출 측에서 제외).
+    """
+    if len(candidates) == 1:
+        return list(candidates)
+    text = f"{news_item.get('title', '')} {news_item.get('description', '')}".lower()
+    for tier in (0, 1):
+        matched = []
+        for stock in candidates:
+            pattern = _alias_pattern(company_aliases(stock)[tier])
+            if pattern and pattern.search(text):
+                matched.append(stock)
+        if matched:
+            return matched
+    return []
+    return None
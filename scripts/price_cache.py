@@ -0,0 +1,189 @@
+"""
+종목별 OHLCV 디스크 캐시 (market_data/prices/)
+✅ 종목당 Parquet 파일 1개 + 마지막 캐시 봉 날짜를 기록한 manifest
+✅ 콜드 실행: 전체 백필 / 웜 실행: 누락된 꼬리 구간만 일괄 요청 후 병합
+"""
+
+import os
+import json
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from price_fetcher import OHLCV_FIELDS, download_prices, build_panel
+
+PRICE_CACHE_DIR = 'market_data/prices'
+MANIFEST_FILE = f'{PRICE_CACHE_DIR}/_manifest.json'
+
+# 캐시가 없는 종목의 최초 백필 기간 (백테스트용으로 늘릴 때: PRICE_BACKFILL_PERIOD=10y)
+BACKFILL_PERIOD = os.environ.get('PRICE_BACKFILL_PERIOD', '2y')
+
+# 겹치는 확정 봉의 종가가 이 비율 이상 다르면 수정주가 변경(분할/배당)으로 보고 전체 재수집
+ADJUSTMENT_TOLERANCE = 0.005
+
+
+def _cache_path(ticker):
+    safe = ticker.replace('/', '_').replace('^', '_')
+    return f'{PRICE_CACHE_DIR}/{safe}.parquet'
+
+
+def load_manifest():
+    """캐시 manifest 로드 ({ticker: {'last_date', 'rows', 'updated_at'}})"""
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_manifest(manifest):
+    """manifest 원자적 저장 (임시 파일 → rename)"""
+    os.makedirs(PRICE_CACHE_DIR, exist_ok=True)
+    tmp_file = MANIFEST_FILE + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_file, MANIFEST_FILE)
+
+
+def load_history(ticker):
+    """디스크에 캐시된 종목 히스토리 (없으면 빈 DataFrame)"""
+    path = _cache_path(ticker)
+    # 빈 결과도 날짜 인덱스를 가져야 기간 필터(index >= cutoff)가 동작
+    empty = pd.DataFrame(columns=OHLCV_FIELDS, index=pd.DatetimeIndex([]))
+    if not os.path.exists(path):
+        return empty
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        return empty
+
+
+def _write_history(ticker, hist, manifest):
+    os.makedirs(PRICE_CACHE_DIR, exist_ok=True)
+    hist.to_parquet(_cache_path(ticker))
+    manifest[ticker] = {
+        'last_date': hist.index[-1].strftime('%Y-%m-%d'),
+        'rows': int(len(hist)),
+        'updated_at': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def _merge_tail(cached, tail):
+    """캐시 히스토리에 새 꼬리 구간 병합 (겹치는 날짜는 새 값 우선)"""
+    merged = pd.concat([cached, tail])
+    merged = merged[~merged.index.duplicated(keep='last')]
+    return merged.sort_index()
+
+
+def _tail_start(cached):
+    """
+    꼬리 요청 시작일: 마지막에서 두 번째 봉
+
+    마지막 봉은 장중에 수집된 미확정 봉일 수 있으므로 다시 받아 덮어쓰고,
+    그 앞의 확정 봉은 수정주가 변경 여부를 확인하는 기준으로 사용한다.
+    """
+    if len(cached) >= 2:
+        return cached.index[-2]
+    return cached.index[-1]
+
+
+def _adjustment_changed(cached, tail, anchor):
+    if anchor not in tail.index or anchor not in cached.index:
+        return True
+    old = float(cached.loc[anchor, 'Close'])
+    new = float(tail.loc[anchor, 'Close'])
+    if old == 0:
+        return True
+    return abs(new / old - 1) > ADJUSTMENT_TOLERANCE
+
+
+def update_price_cache(tickers):
+    """
+    캐시를 최신 상태로 갱신
+
+    Returns:
+        (tails, failures, backfilled)
+        tails: {ticker: 이번 실행에서 새로 받은 봉 DataFrame (전체 백필 시 전체 히스토리)}
+        failures: {ticker: 실패 사유}
+        backfilled: 전체 백필된 종목 집합 (콜드 또는 수정주가 변경)
+    """
+    manifest = load_manifest()
+    tickers = list(dict.fromkeys(tickers))
+
+    cached = {}
+    cold = []
+    warm_by_start = {}
+    for ticker in tickers:
+        hist = load_history(ticker) if ticker in manifest else pd.DataFrame()
+        if hist.empty:
+            cold.append(ticker)
+            continue
+        cached[ticker] = hist
+        start = _tail_start(hist)
+        warm_by_start.setdefault(start, []).append(ticker)
+
+    tails = {}
+    failures = {}
+    rebuild = []
+    backfilled = set()
+
+    # 웜 종목: 같은 시작일끼리 묶어 꼬리 구간만 요청
+    for start, group in warm_by_start.items():
+        panel, group_failures = download_prices(group, start=start.strftime('%Y-%m-%d'))
+        failures.update(group_failures)
+        for ticker in group:
+            if ticker in group_failures or ticker not in panel.columns.get_level_values(0):
+                continue
+            tail = panel[ticker].dropna(subset=['Close'])
+            if _adjustment_changed(cached[ticker], tail, start):
+                rebuild.append(ticker)
+                continue
+            merged = _merge_tail(cached[ticker], tail)
+            _write_history(ticker, merged, manifest)
+            tails[ticker] = tail
+
+    # 콜드 종목 + 수정주가가 바뀐 종목: 전체 백필
+    backfill = cold + rebuild
+    if backfill:
+        panel, backfill_failures = download_prices(backfill, period=BACKFILL_PERIOD)
+        failures.update(backfill_failures)
+        for ticker in backfill:
+            if ticker in backfill_failures or ticker not in panel.columns.get_level_values(0):
+                continue
+            hist = panel[ticker].dropna(subset=['Close'])
+            if hist.empty:
+                continue
+            _write_history(ticker, hist, manifest)
+            tails[ticker] = hist
+            backfilled.add(ticker)
+
+    save_manifest(manifest)
+    return tails, failures, backfilled
+
+
+def load_price_panel(tickers, period_days=None):
+    """캐시 파일들을 (ticker, field) MultiIndex 패널로 로드"""
+    cutoff = None
+    if period_days:
+        cutoff = pd.Timestamp(datetime.now().date() - timedelta(days=period_days))
+
+    frames = {}
+    for ticker in dict.fromkeys(tickers):
+        hist = load_history(ticker)
+        if cutoff is not None:
+            hist = hist[hist.index >= cutoff]
+        if not hist.empty:
+            frames[ticker] = hist
+    return build_panel(frames, tickers)
+
+
+def get_prices(tickers, period_days=365):
+    """
+    캐시 갱신 후 최근 period_days 구간 패널 반환
+
+    갱신에 실패한 종목도 이전에 캐시된 데이터가 있으면 패널에 포함된다.
+    """
+    tails, failures, _ = update_price_cache(tickers)
+    new_bars = sum(len(t) for t in tails.values())
+    print(f"💾 가격 캐시 갱신: {len(tails)}개 종목, 신규 봉 {new_bars}개")
+    return load_price_panel(tickers, period_days=period_days), failures
@@ -0,0 +1,134 @@
+"""
+주가 일괄 다운로드 모듈
+✅ 거래소 접미사(.KS/.KQ/.HK/.PA/.MI/.TW/US)별로 묶어서 yf.download 호출
+✅ (ticker, field) MultiIndex OHLCV 패널 하나로 정렬하여 반환
+✅ 종목별 실패는 따로 보고하고 나머지 배치는 계속 진행
+"""
+
+import yfinance as yf
+import pandas as pd
+
+from concurrent_fetch import FETCH_WORKERS, get_rate_limiter
+
+OHLCV_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# 한 번의 요청에 묶을 최대 종목 수 (유니버스가 커질 때 URL/응답 크기 제한 회피)
+MAX_TICKERS_PER_REQUEST = 200
+
+
+def exchange_suffix(ticker):
+    """티커의 거래소 접미사 반환 (접미사 없으면 'US')"""
+    if '.' in ticker:
+        return ticker.rsplit('.', 1)[1].upper()
+    return 'US'
+
+
+def group_by_exchange(tickers):
+    """거래소 접미사별로 티커 그룹화 (입력 순서 유지, 중복 제거)"""
+    groups = {}
+    for ticker in dict.fromkeys(tickers):
+        groups.setdefault(exchange_suffix(ticker), []).append(ticker)
+    return groups
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _yf_error(ticker):
+    """yfinance가 기록한 종목별 오류 메시지 (버전에 따라 없을 수 있음)"""
+    try:
+        return yf.shared._ERRORS.get(ticker)
+    except Exception:
+        return None
+
+
+def _download_group(tickers, period=None, start=None):
+    """한 그룹을 한 번의 요청으로 다운로드하여 {ticker: DataFrame} 반환"""
+    kwargs = {'start': start} if start is not None else {'period': period}
+    raw = yf.download(
+        tickers=tickers,
+        group_by='ticker',
+        auto_adjust=True,
+        threads=FETCH_WORKERS,
+        progress=False,
+        **kwargs
+    )
+
+    frames = {}
+    if raw is None or raw.empty:
+        return frames
+
+    if not isinstance(raw.columns, pd.MultiIndex):
+        # 구버전 yfinance는 단일 종목일 때 평평한 컬럼을 반환
+        raw = pd.concat({tickers[0]: raw}, axis=1)
+
+    index = raw.index
+    if getattr(index, 'tz', None) is not None:
+        index = index.tz_localize(None)
+    raw.index = index.normalize()
+
+    available = set(raw.columns.get_level_values(0))
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+        frame = raw[ticker].reindex(columns=OHLCV_FIELDS)
+        frame = frame.dropna(subset=['Close'])
+        if not frame.empty:
+            frames[ticker] = frame
+    return frames
+
+
+def build_panel(frames, tickers):
+    """{ticker: OHLCV DataFrame}를 날짜 합집합으로 정렬된 MultiIndex 패널로 결합"""
+    ordered = [t for t in dict.fromkeys(tickers) if t in frames]
+    if not ordered:
+        columns = pd.MultiIndex.from_product([[], OHLCV_FIELDS], names=['ticker', 'field'])
+        return pd.DataFrame(columns=columns)
+
+    panel = pd.concat({t: frames[t] for t in ordered}, axis=1)
+    panel.columns.names = ['ticker', 'field']
+    panel = panel[~panel.index.duplicated(keep='last')]
+    return panel.sort_index()
+
+
+def download_prices(tickers, period='1y', start=None):
+    """
+    전체 유니버스를 거래소별 묶음 요청으로 다운로드
+
+    Returns:
+        (panel, failures)
+        panel: index=날짜, columns=(ticker, field) MultiIndex OHLCV DataFrame
+        failures: {ticker: 실패 사유}
+    """
+    groups = group_by_exchange(tickers)
+    frames = {}
+    failures = {}
+    limiter = get_rate_limiter('yahoo')
+
+    # yf.download는 전역 상태를 공유하므로 그룹 요청은 순차로 보내고,
+    # 그룹 내부 종목은 yfinance 스레드(FETCH_WORKERS개)로 동시에 받는다.
+    for suffix, group in groups.items():
+        for chunk in _chunks(group, MAX_TICKERS_PER_REQUEST):
+            limiter.acquire()
+            try:
+                fetched = _download_group(chunk, period=period, start=start)
+            except Exception as e:
+                for ticker in chunk:
+                    failures[ticker] = f"{suffix} 그룹 요청 실패: {str(e)[:80]}"
+                continue
+
+            frames.update(fetched)
+            for ticker in chunk:
+                if ticker not in fetched:
+                    failures[ticker] = _yf_error(ticker) or '데이터 없음'
+
+    return build_panel(frames, tickers), failures
+
+
+def ticker_history(panel, ticker):
+    """패널에서 한 종목의 OHLCV 히스토리 추출 (해당 종목 휴장일 행 제거)"""
+    if panel.empty or ticker not in panel.columns.get_level_values(0):
+        return pd.DataFrame(columns=OHLCV_FIELDS)
+    return panel[ticker].dropna(subset=['Close'])
@@ -0,0 +1,90 @@
+"""
+Report signal stage for the daily datacenter report
+✅ 등록된 규칙을 한 번씩만 평가 → 종목 위치 배열 + 개수
+✅ register_signal()로 규칙을 선언적으로 추가
+✅ Excel / Markdown / Telegram 출력은 SignalSet만 보고 렌더링
+"""
+
+import numpy as np
+
+# name → {'when', 'sort_by', 'ascending'} (등록 순서 유지)
+SIGNAL_RULES = {}
+
+
+def register_signal(name, when, sort_by=None, ascending=True):
+    """
+    시그널 규칙 등록
+
+    Args:
+        when: when(cols) → bool 배열. cols는 {컬럼명: numpy 배열}
+        sort_by/ascending: ranked 순서를 만들 정렬 기준 (없으면 원래 순서)
+    """
+    SIGNAL_RULES[name] = {'when': when, 'sort_by': sort_by, 'ascending': ascending}
+
+
+register_signal('up', lambda c: c['change_1d'] > 0, sort_by='change_1d', ascending=False)
+register_signal('down', lambda c: c['change_1d'] < 0, sort_by='change_1d')
+register_signal('flat', lambda c: c['change_1d'] == 0)
+register_signal('golden_cross', lambda c: c['golden_cross'] == True)  # noqa: E712
+register_signal('dead_cross', lambda c: c['dead_cross'] == True)  # noqa: E712
+register_signal('volume_spike', lambda c: c['volume_ratio'] > 200, sort_by='volume_ratio', ascending=False)
+register_signal('rsi_overbought', lambda c: c['rsi'] > 70)
+register_signal('rsi_oversold', lambda c: c['rsi'] < 30)
+register_signal('rsi_extreme', lambda c: (c['rsi'] > 70) | (c['rsi'] < 30))
+
+# 엑셀 시그널 시트 (시트 이름, 시그널, 정렬 순서 사용, 해당 종목이 없어도 시트 생성)
+# 카탈로그 조회에서도 시트 이름 → 시그널 이름 변환에 사용
+EXCEL_SIGNAL_SHEETS = [
+    ('Up_Stocks', 'up', True, True),
+    ('Down_Stocks', 'down', True, True),
+    ('Golden_Cross', 'golden_cross', False, False),
+    ('Volume_Spike', 'volume_spike', False, False),
+    ('RSI_Extreme', 'rsi_extreme', False, False),
+]
+
+
+class SignalResult:
+    """한 규칙의 결과: 원래 순서 위치(indices), 정렬 순서 위치(ranked), 개수"""
+
+    def __init__(self, name, indices, ranked):
+        self.name = name
+        self.indices = indices
+        self.ranked = ranked
+        self.count = len(indices)
+
+
+class SignalSet:
+    """전체 규칙 결과 + 행 조회"""
+
+    def __init__(self, df, results):
+        self.df = df
+        self.results = results
+        self.total = len(df)
+
+    def __getitem__(self, name):
+        return self.results[name]
+
+    def count(self, name):
+        return self.results[name].count
+
+    def rows(self, name, ranked=False):
+        """시그널 해당 행 (ranked=True면 규칙의 정렬 순서)"""
+        result = self.results[name]
+        return self.df.iloc[result.ranked if ranked else result.indices]
+
+
+def compute_signals(df, rules=None):
+    """모든 규칙을 한 번씩 평가해 SignalSet 생성"""
+    rules = SIGNAL_RULES if rules is None else rules
+    cols = {col: df[col].to_numpy() for col in df.columns}
+
+    results = {}
+    for name, rule in rules.items():
+        indices = np.flatnonzero(rule['when'](cols))
+        ranked = indices
+        if rule['sort_by'] is not None and len(indices):
+            # 기존 출력과 같은 순서가 되도록 pandas 정렬 사용 (동순위 처리 동일)
+            order = df[rule['sort_by']].iloc[indices].sort_values(ascending=rule['ascending'])
+            ranked = df.index.get_indexer(order.index)
+        results[name] = SignalResult(name, indices, ranked)
+    return SignalSet(df, results)
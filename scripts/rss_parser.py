@@ -0,0 +1,149 @@
+"""
+Streaming RSS parser for Google News search feeds
+✅ iterparse로 item 단위 처리 → 필요한 필드(title/link/pubDate/source/description)만 추출
+✅ N개 수락 또는 기준일 이전 기사에서 조기 종료, 처리한 item은 즉시 해제
+✅ 정제용 정규식은 모듈 로드 시 1회 컴파일
+✅ XML 오류(잘못된 피드)는 feedparser 경로로 폴백
+"""
+
+import io
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import feedparser
+
+TAG_RE = re.compile(r'<[^>]+>')
+URL_RE = re.compile(r'http[s]?://\S+')
+
+SUMMARY_MAX_LENGTH = 300
+SUMMARY_MIN_LENGTH = 20
+MIN_TITLE_LENGTH = 10
+
+
+def clean_summary(summary):
+    """HTML 태그와 URL 제거 후 300자로 자름 (20자 미만이면 빈 문자열)"""
+    summary = TAG_RE.sub('', summary.strip())
+    summary = URL_RE.sub('', summary)
+    summary = summary.strip()[:SUMMARY_MAX_LENGTH]
+    return summary if len(summary) >= SUMMARY_MIN_LENGTH else ''
+
+
+def parse_pub_date(value):
+    """RFC 822 날짜 → naive UTC datetime (feedparser published_parsed와 동일 기준)"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _build_item(title, link, pub_date, publisher, summary, seen_links, cutoff, canonical=None):
+    """
+    수락 여부 판정 (canonical이 주어지면 정규 URL 기준으로 중복 검사)
+
+    Returns:
+        (news_item | None, too_old)
+    """
+    title = title.strip()
+    link = link.strip()
+    if not title or not link or len(title) < MIN_TITLE_LENGTH:
+        return None, False
+    key = canonical(link) if canonical else link
+    if key in seen_links or link in seen_links:
+        return None, False
+    if pub_date is None:
+        pub_date = datetime.now()
+    elif pub_date < cutoff:
+        return None, True
+
+    return {
+        'title': title,
+        'description': clean_summary(summary),
+        'link': link,
+        'canonical_url': key,
+        'publisher': publisher or 'Google News',
+        'date': pub_date.isoformat(),
+        'source': 'Google News'
+    }, False
+
+
+def _iter_items(content):
+    """<item> 요소를 파싱 순서대로 (title, link, pubDate, source, description) 튜플로 반환"""
+    context = ET.iterparse(io.BytesIO(content), events=('start', 'end'))
+    # 열린 요소 스택 (item의 부모 <channel>을 알기 위해)
+    stack = []
+    for event, elem in context:
+        if event == 'start':
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag != 'item':
+            continue
+        source = elem.find('source')
+        yield (
+            elem.findtext('title', ''),
+            elem.findtext('link', ''),
+            elem.findtext('pubDate', ''),
+            source.text if source is not None and source.text else '',
+            elem.findtext('description', ''),
+        )
+        # 처리한 item은 비우고 부모에서 떼어내 피드 크기와 무관하게 메모리 유지
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+
+def parse_google_news_stream(content, seen_links, max_items, cutoff, stop_at_cutoff=False, canonical=None):
+    """
+    Incremental parse (ET.ParseError는 호출 측으로 전달)
+
+    stop_at_cutoff=True면 첫 기준일 이전 기사에서 파싱을 멈춘다 (날짜순 피드용).
+    """
+    news_list = []
+    for title, link, pub_date, publisher, summary in _iter_items(content):
+        news, too_old = _build_item(title, link, parse_pub_date(pub_date), publisher,
+                                    summary, seen_links, cutoff, canonical)
+        if too_old and stop_at_cutoff:
+            break
+        if news is None:
+            continue
+        news_list.append(news)
+        if len(news_list) >= max_items:
+            break
+    return news_list
+
+
+def parse_google_news_feedparser(content, seen_links, max_items, cutoff, stop_at_cutoff=False, canonical=None):
+    """feedparser 기반 파싱 (잘못된 XML 폴백용)"""
+    feed = feedparser.parse(content)
+    news_list = []
+    for entry in feed.entries:
+        published = entry.get('published_parsed')
+        pub_date = datetime(*published[:6]) if published else None
+        news, too_old = _build_item(
+            entry.get('title', ''), entry.get('link', ''), pub_date,
+            entry.get('source', {}).get('title', ''), entry.get('summary', ''),
+            seen_links, cutoff, canonical
+        )
+        if too_old and stop_at_cutoff:
+            break
+        if news is None:
+            continue
+        news_list.append(news)
+        if len(news_list) >= max_items:
+            break
+    return news_list
+
+
+def parse_google_news(content, seen_links, max_items, cutoff, stop_at_cutoff=False, canonical=None):
+    """스트리밍 파서 우선, XML 오류 시 feedparser로 폴백"""
+    try:
+        return parse_google_news_stream(content, seen_links, max_items, cutoff, stop_at_cutoff, canonical)
+    except ET.ParseError:
+        return parse_google_news_feedparser(content, seen_links, max_items, cutoff, stop_at_cutoff, canonical)
@@ -0,0 +1,110 @@
+"""
+Seen-link store for the news monitor (market_data/news_history.sqlite)
+✅ SQLite 테이블 (link PRIMARY KEY, first_seen) — 전체 재작성 없이 배치 INSERT
+✅ TTL이 지난 링크는 자동 만료 (수집 기간 7일보다 길게 유지)
+✅ 기존 news_history.json은 최초 1회 마이그레이션
+"""
+
+import os
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+SEEN_LINKS_DB = 'market_data/news_history.sqlite'
+LEGACY_HISTORY_FILE = 'market_data/news_history.json'
+
+# 수집 대상이 최근 7일 기사이므로 그보다 충분히 길게 보관
+SEEN_LINK_TTL_DAYS = int(os.environ.get('SEEN_LINK_TTL_DAYS', 30))
+
+
+class SeenLinkStore:
+    """
+    Set-like store of seen links
+
+    유효 기간 내 링크는 열 때 메모리 set으로 올려 `in` 검사를 O(1)로 하고,
+    새 링크는 모아 두었다가 flush() 시 한 번의 executemany로 기록한다.
+    """
+
+    def __init__(self, path=SEEN_LINKS_DB, ttl_days=SEEN_LINK_TTL_DAYS):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.ttl_days = ttl_days
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS seen_links ('
+            'link TEXT PRIMARY KEY, first_seen TEXT NOT NULL)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_first_seen ON seen_links(first_seen)')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self.conn.commit()
+
+        self.migrated = self.migrate_json(LEGACY_HISTORY_FILE)
+        self.expired = self.expire()
+        self.links = {row[0] for row in self.conn.execute('SELECT link FROM seen_links')}
+        self.pending = {}
+
+    # set 인터페이스 -------------------------------------------------------
+
+    def __contains__(self, link):
+        return link in self.links
+
+    def __len__(self):
+        return len(self.links)
+
+    def add(self, link):
+        if link in self.links:
+            return
+        self.links.add(link)
+        self.pending[link] = datetime.now().isoformat(timespec='seconds')
+
+    def add_many(self, links):
+        for link in links:
+            self.add(link)
+
+    # 영속화 ---------------------------------------------------------------
+
+    def flush(self):
+        """새로 본 링크를 배치 INSERT"""
+        if self.pending:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO seen_links (link, first_seen) VALUES (?, ?)',
+                self.pending.items()
+            )
+            self.conn.commit()
+            self.pending = {}
+
+    def expire(self):
+        """TTL이 지난 링크 삭제, 삭제 건수 반환"""
+        cutoff = (datetime.now() - timedelta(days=self.ttl_days)).isoformat(timespec='seconds')
+        cursor = self.conn.execute('DELETE FROM seen_links WHERE first_seen < ?', (cutoff,))
+        self.conn.commit()
+        return cursor.rowcount
+
+    def migrate_json(self, json_path):
+        """기존 JSON 히스토리를 한 번만 가져옴 (first_seen = 파일의 last_updated)"""
+        done = self.conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        if done or not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            return 0
+
+        first_seen = data.get('last_updated') or datetime.now().isoformat()
+        first_seen = first_seen[:19]
+        links = data.get('seen_links', [])
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO seen_links (link, first_seen) VALUES (?, ?)',
+            ((link, first_seen) for link in links)
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+            (datetime.now().isoformat(timespec='seconds'),)
+        )
+        self.conn.commit()
+        return len(links)
+
+    def close(self):
+        self.flush()
+        self.conn.close()
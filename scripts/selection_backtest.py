@@ -0,0 +1,329 @@
+"""
+종목 선정 모델 과거 재현 백테스트 (월말 리밸런싱)
+✅ 가격 캐시(market_data/prices) 패널 한 번으로 전 종목 × 전 월말 지표를 벡터화 계산
+✅ 각 월말에 그 날까지의 봉만 사용 (point-in-time) → 세부영역별 1위 종목 선정
+✅ 선정 종목의 다음 월말까지 수익률, Pool 평균 대비 초과수익, 회전율 집계
+
+시가총액은 과거 값을 따로 저장하지 않으므로 "현재 주식 수 × 당시 가격"으로 근사한다.
+    과거 시가총액 ≈ 현재 시가총액 / 최근 종가 × 월말 종가
+가격 쪽은 월말 시점 값만 쓰므로 미래 가격이 섞이지 않지만, 주식 수는 현재 값으로 고정
+(자사주 매입/유상증자 변화는 반영 안 됨). 가격은 수정주가라 분할은 자동으로 맞춰진다.
+
+Usage:
+    python scripts/selection_backtest.py [--start 2025-01] [--refresh] [--output FILE.xlsx]
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from indicators import rolling_mean, rsi_series, panel_field
+from selection_model import CANDIDATE_POOLS, SECTOR_MAPPING, MIN_BARS, selection_score, volume_trend_value
+
+ANALYSIS_DIR = 'analysis_reports'
+
+# 월말 기준 마지막 봉이 이보다 오래된(패널 행 기준) 종목은 거래 중단으로 보고 제외
+MAX_STALE_SESSIONS = 5
+
+
+# ============================================================================
+# POINT-IN-TIME FEATURES
+# ============================================================================
+
+def month_end_rows(index, start=None):
+    """
+    각 달의 마지막 거래일 행 위치 (start 'YYYY-MM' 이전 달 제외)
+
+    패널의 마지막 날이 그 달의 마지막 영업일보다 앞이면 아직 끝나지 않은 달이므로
+    제외한다 (부분 월 수익률이 실현 월로 집계되지 않도록).
+    """
+    index = pd.DatetimeIndex(index)
+    if len(index) == 0:
+        return np.array([], dtype=int)
+    months = index.to_period('M')
+    last = np.flatnonzero(np.r_[months[1:] != months[:-1], True])
+    if len(last) and index[-1] < index[-1] + pd.offsets.BMonthEnd(0):
+        last = last[:-1]
+    if start:
+        last = last[months[last] >= pd.Period(start, 'M')]
+    return last
+
+
+def _lag(values, n):
+    """축 0 방향으로 n행 뒤로 민 배열 (앞쪽은 NaN)"""
+    out = np.full(values.shape, np.nan)
+    out[n:] = values[:-n]
+    return out
+
+
+def point_in_time_features(close, volume, rows):
+    """
+    지정한 날짜 행마다 그 날까지의 종목별 봉으로 지표 계산
+
+    지표 엔진과 같이 종목별 "자기 거래일" 기준이다. 각 열의 유효 봉을 위로 모아
+    (봉 번호 공간) 이동평균/수익률/RSI를 한 번에 계산하고, 날짜 행마다 그 시점의
+    마지막 봉 번호로 다시 모은다.
+
+    Args:
+        close, volume: index=날짜, columns=티커 wide DataFrame
+        rows: 평가할 날짜 행 위치 배열
+
+    Returns:
+        {지표: (len(rows) × 종목) 배열} — 아직 봉이 없는 칸은 NaN, bars는 0.
+        stale_sessions는 날짜 행과 그 종목 마지막 봉 사이의 패널 행 수 (봉이 없으면 행 번호+1)
+    """
+    c = close.to_numpy(dtype=float)
+    v = volume.reindex(index=close.index, columns=close.columns).to_numpy(dtype=float)
+    valid = ~np.isnan(c)
+
+    positions = np.arange(len(c))[:, None]
+    last_row = np.maximum.accumulate(np.where(valid, positions, -1), axis=0)[rows]
+    stale_sessions = np.asarray(rows)[:, None] - last_row
+
+    # 유효 봉이 원래 순서대로 위로 오도록 안정 정렬
+    order = np.argsort(~valid, axis=0, kind='stable')
+    c = np.take_along_axis(c, order, axis=0)
+    v = np.take_along_axis(v, order, axis=0)
+
+    # 날짜 행 → 그 날까지의 마지막 봉 번호 (-1: 아직 봉 없음)
+    bar_no = np.cumsum(valid, axis=0)[rows] - 1
+    has_bar = bar_no >= 0
+    take = np.where(has_bar, bar_no, 0)
+
+    def at(values):
+        return np.where(has_bar, np.take_along_axis(values, take, axis=0), np.nan)
+
+    # n_day_return(close, n) = close[-1] / close[-n] → n-1봉 전
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return_3m = (c / _lag(c, 62) - 1) * 100
+        return_6m = (c / _lag(c, 125) - 1) * 100
+
+    bars = bar_no + 1
+    rsi = at(rsi_series(c, 14))
+    return {
+        'bars': bars,
+        'stale_sessions': stale_sessions,
+        'price': at(c),
+        'return_3m': at(return_3m),
+        'return_6m': at(return_6m),
+        'ma_20': at(rolling_mean(c, 20)),
+        'ma_60': at(rolling_mean(c, 60)),
+        'avg_volume_20': at(rolling_mean(v, 20)),
+        'avg_volume_60': at(rolling_mean(v, 60)),
+        'rsi': np.where(bars < 14, 50.0, rsi),
+    }
+
+
+def approximate_market_caps(price, latest_price, market_caps):
+    """
+    현재 주식 수 × 당시 가격으로 과거 시가총액 근사
+
+    Args:
+        price: (날짜 × 종목) 당시 종가
+        latest_price: 종목별 최근 종가
+        market_caps: 종목별 현재 시가총액 (없으면 0 → 최저 구간, 당일 선정과 동일)
+    """
+    market_caps = np.asarray(market_caps, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = np.where(latest_price > 0, market_caps / latest_price, 0.0)
+    return np.nan_to_num(shares * price, nan=0.0)
+
+
+# ============================================================================
+# BACKTEST
+# ============================================================================
+
+def _nanmean(values, axis):
+    """결측 제외 평균 (전부 결측이면 NaN, 경고 없음)"""
+    counts = (~np.isnan(values)).sum(axis=axis)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(counts > 0, np.nansum(values, axis=axis) / counts, np.nan)
+
+
+def pool_matrix(pools, tickers):
+    """세부영역 × 후보 칸의 종목 열 위치 (빈 칸 -1, Pool 순서 유지)"""
+    column = {ticker: i for i, ticker in enumerate(tickers)}
+    width = max(len(candidates) for candidates in pools.values())
+    matrix = np.full((len(pools), width), -1)
+    for s, candidates in enumerate(pools.values()):
+        cols = [column[c['ticker']] for c in candidates if c['ticker'] in column]
+        matrix[s, :len(cols)] = cols
+    return matrix
+
+
+class BacktestResult:
+    """
+    picks: 월말 × 세부영역 선정 결과 (종목, 점수, 다음 달 수익률, Pool 평균, 교체 여부)
+    portfolio: 월말별 동일가중 포트폴리오 수익률 / Pool 평균 / 회전율
+    """
+
+    def __init__(self, picks, portfolio):
+        self.picks = picks
+        self.portfolio = portfolio
+
+    def summary(self):
+        realized = self.portfolio.dropna(subset=['forward_return'])
+        if realized.empty:
+            return {'months': 0}
+        returns = realized['forward_return'] / 100
+        pool = realized['pool_return'] / 100
+        return {
+            'months': int(len(realized)),
+            'mean_return': float(returns.mean() * 100),
+            'cumulative_return': float(((1 + returns).prod() - 1) * 100),
+            'pool_cumulative_return': float(((1 + pool).prod() - 1) * 100),
+            'hit_rate': float((returns > pool).mean() * 100),
+            'avg_turnover': float(self.portfolio['turnover'].iloc[1:].mean() * 100),
+        }
+
+
+def run_backtest(close, volume, market_caps, pools=None, start=None):
+    """
+    월말마다 당일 선정 규칙을 재현
+
+    Args:
+        close, volume: index=날짜, columns=티커 wide DataFrame (수정주가)
+        market_caps: {ticker: 현재 시가총액}
+        pools: {세부영역: [{'name', 'ticker', ...}]} (기본 CANDIDATE_POOLS)
+        start: 첫 리밸런싱 월 'YYYY-MM' (없으면 전체)
+
+    패널 마지막 달이 끝나지 않았으면 그 달은 리밸런싱에서 제외된다.
+    """
+    pools = pools or CANDIDATE_POOLS
+    tickers = list(close.columns)
+    names = {c['ticker']: c['name'] for candidates in pools.values() for c in candidates}
+    rows = month_end_rows(close.index, start)
+
+    f = point_in_time_features(close, volume, rows)
+    latest_price = close.ffill().iloc[-1].to_numpy(dtype=float)
+    market_cap = approximate_market_caps(
+        f['price'], latest_price, [market_caps.get(t) or 0 for t in tickers])
+
+    score = selection_score(
+        market_cap,
+        volume_trend_value(f['avg_volume_20'], f['avg_volume_60']),
+        f['return_3m'], f['return_6m'],
+        f['ma_20'] > f['ma_60'], f['rsi'], f['price'], f['ma_20'],
+    ).astype(float)
+    # 봉 부족 / 상장폐지·거래정지로 봉이 끊긴 종목은 선정 대상에서 제외
+    score[(f['bars'] < MIN_BARS) | (f['stale_sessions'] > MAX_STALE_SESSIONS)] = np.nan
+
+    # 다음 리밸런싱 월말까지 수익률 (마지막 월말은 NaN)
+    forward = np.full(score.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        forward[:-1] = (f['price'][1:] / f['price'][:-1] - 1) * 100
+
+    # (월말 × 세부영역 × 후보) 점수 → 동점이면 Pool 앞 순서 (당일 선정의 안정 정렬과 동일)
+    members = pool_matrix(pools, tickers)
+    pool_scores = np.where(members >= 0, score[:, members], np.nan)
+    has_pick = ~np.isnan(pool_scores).all(axis=2)
+    best = np.nanargmax(np.where(has_pick[:, :, None], pool_scores, 0), axis=2)
+    pick_col = np.where(has_pick, members[np.arange(len(members)), best], -1)
+
+    eligible_forward = np.where(members >= 0, forward[:, members], np.nan)
+    eligible_forward[np.isnan(pool_scores)] = np.nan
+    pool_forward = _nanmean(eligible_forward, axis=2)
+    month_idx = np.arange(len(rows))[:, None]
+    pick_forward = np.where(has_pick, forward[month_idx, pick_col], np.nan)
+    pick_score = np.where(has_pick, score[month_idx, pick_col], np.nan)
+    changed = np.zeros(has_pick.shape, dtype=bool)
+    changed[1:] = has_pick[1:] & has_pick[:-1] & (pick_col[1:] != pick_col[:-1])
+
+    dates = close.index[rows]
+    sub_sectors = list(pools)
+    pick_tickers = [tickers[c] if c >= 0 else None for c in pick_col.ravel()]
+    picks = pd.DataFrame({
+        'date': np.repeat(dates, len(sub_sectors)),
+        'category': [SECTOR_MAPPING.get(s, {}).get('category') for s in sub_sectors] * len(rows),
+        'sub_sector': np.tile(sub_sectors, len(rows)),
+        'name': [names.get(t) for t in pick_tickers],
+        'ticker': pick_tickers,
+        'score': pick_score.ravel(),
+        'forward_return': pick_forward.ravel(),
+        'pool_return': pool_forward.ravel(),
+        'changed': changed.ravel(),
+    })
+    picks = picks[picks['ticker'].notna()].reset_index(drop=True)
+
+    # 세부영역 선정 종목 동일가중 (여러 영역에서 뽑힌 종목은 비중 합산)
+    weights = np.zeros(score.shape)
+    counts = has_pick.sum(axis=1, keepdims=True)
+    share = np.where(has_pick, 1 / np.maximum(counts, 1), 0)
+    np.add.at(weights, (np.broadcast_to(month_idx, pick_col.shape)[has_pick], pick_col[has_pick]), share[has_pick])
+    turnover = np.r_[np.nan, np.abs(np.diff(weights, axis=0)).sum(axis=1) / 2]
+
+    portfolio = pd.DataFrame({
+        'date': dates,
+        'picks': counts[:, 0],
+        'forward_return': (np.nan_to_num(forward) * weights).sum(axis=1),
+        'pool_return': _nanmean(np.where(has_pick, pool_forward, np.nan), axis=1),
+        'turnover': turnover,
+    })
+    if len(portfolio):
+        portfolio.loc[portfolio.index[-1], 'forward_return'] = np.nan
+    return BacktestResult(picks, portfolio)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def _rounded(df):
+    return df.round(dict.fromkeys(df.select_dtypes('number').columns, 2))
+
+
+def load_inputs(refresh=False):
+    """가격 캐시 패널 + 시가총액 캐시 (refresh=True면 가격 캐시 꼬리 갱신 후 로드)"""
+    from price_cache import load_price_panel, update_price_cache
+    from fundamentals_cache import load_fundamentals_cache
+
+    tickers = list(dict.fromkeys(c['ticker'] for candidates in CANDIDATE_POOLS.values() for c in candidates))
+    if refresh:
+        update_price_cache(tickers)
+    panel = load_price_panel(tickers)
+    fundamentals = load_fundamentals_cache()
+    market_caps = {t: fundamentals.get(t, {}).get('market_cap') for t in tickers}
+    return panel_field(panel, 'Close'), panel_field(panel, 'Volume'), market_caps
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay the stock selection model at every month-end')
+    parser.add_argument('--start', help='첫 리밸런싱 월 (YYYY-MM)')
+    parser.add_argument('--refresh', action='store_true', help='가격 캐시 갱신 후 실행 (네트워크 사용)')
+    parser.add_argument('--output', help='엑셀 출력 경로 (기본 analysis_reports/selection_backtest_YYYYMMDD.xlsx)')
+    args = parser.parse_args(argv)
+
+    close, volume, market_caps = load_inputs(args.refresh)
+    if close.empty:
+        print("가격 캐시가 비어 있습니다 (--refresh 또는 종목 선정/리포트를 먼저 실행)")
+        return 1
+    missing = [t for t, cap in market_caps.items() if not cap]
+    if missing:
+        print(f"⚠️ 시가총액 캐시 없음 {len(missing)}개 (최저 구간으로 채점): {', '.join(missing[:10])}")
+
+    result = run_backtest(close, volume, market_caps, start=args.start)
+    summary = result.summary()
+    print(f"📅 {close.index[0].date()} ~ {close.index[-1].date()}, 종목 {close.shape[1]}개, "
+          f"리밸런싱 {len(result.portfolio)}회")
+    if summary['months']:
+        print(f"📈 월평균 {summary['mean_return']:+.2f}%, 누적 {summary['cumulative_return']:+.2f}% "
+              f"(Pool 평균 누적 {summary['pool_cumulative_return']:+.2f}%)")
+        print(f"🎯 Pool 평균 대비 승률 {summary['hit_rate']:.1f}%, 평균 회전율 {summary['avg_turnover']:.1f}%")
+
+    output = args.output or f"{ANALYSIS_DIR}/selection_backtest_{datetime.now().strftime('%Y%m%d')}.xlsx"
+    from excel_writer import WorkbookWriter
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with WorkbookWriter(output) as book:
+        book.write_sheet('Portfolio', _rounded(result.portfolio))
+        book.write_sheet('Picks', _rounded(result.picks))
+        book.write_sheet('Summary', pd.DataFrame([summary]).round(2))
+    print(f"✅ Excel: {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
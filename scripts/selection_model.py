@@ -0,0 +1,186 @@
+"""
+종목 선정 모델: 후보 Pool + 100점 만점 점수 규칙
+✅ stock_selection_system.py(당일 선정)와 selection_backtest.py(과거 재현)가 같은 규칙 사용
+✅ 구간 점수는 (기준값, 점수) 표로 선언 → 스칼라/NumPy 배열 모두 같은 함수로 채점
+"""
+
+import numpy as np
+
+# 각 세부영역별 후보 종목 Pool
+CANDIDATE_POOLS = {
+    'GPU': [
+        {'name': 'NVIDIA', 'ticker': 'NVDA', 'exchange': 'US'},
+        {'name': 'AMD', 'ticker': 'AMD', 'exchange': 'US'},
+    ],
+    'CPU': [
+        {'name': 'Intel', 'ticker': 'INTC', 'exchange': 'US'},
+        {'name': 'AMD', 'ticker': 'AMD', 'exchange': 'US'},
+    ],
+    '서버제조': [
+        {'name': 'Super Micro', 'ticker': 'SMCI', 'exchange': 'US'},
+        {'name': 'Dell', 'ticker': 'DELL', 'exchange': 'US'},
+        {'name': 'HPE', 'ticker': 'HPE', 'exchange': 'US'},
+        {'name': 'Lenovo', 'ticker': '0992.HK', 'exchange': 'HK'},
+    ],
+    '전력관리': [
+        {'name': 'Vertiv', 'ticker': 'VRT', 'exchange': 'US'},
+        {'name': 'Eaton', 'ticker': 'ETN', 'exchange': 'US'},
+        {'name': 'Schneider Electric', 'ticker': 'SU.PA', 'exchange': 'EU'},
+    ],
+    '전력기기': [
+        {'name': 'LS ELECTRIC', 'ticker': '010120.KS', 'exchange': 'KR'},
+        {'name': 'LS', 'ticker': '006260.KS', 'exchange': 'KR'},
+    ],
+    '발전기': [
+        {'name': 'Cummins', 'ticker': 'CMI', 'exchange': 'US'},
+        {'name': 'Generac', 'ticker': 'GNRC', 'exchange': 'US'},
+        {'name': 'Caterpillar', 'ticker': 'CAT', 'exchange': 'US'},
+    ],
+    'HVAC': [
+        {'name': 'Johnson Controls', 'ticker': 'JCI', 'exchange': 'US'},
+        {'name': 'Trane Tech', 'ticker': 'TT', 'exchange': 'US'},
+        {'name': 'Carrier Global', 'ticker': 'CARR', 'exchange': 'US'},
+    ],
+    '스위치': [
+        {'name': 'Arista Networks', 'ticker': 'ANET', 'exchange': 'US'},
+        {'name': 'Cisco', 'ticker': 'CSCO', 'exchange': 'US'},
+        {'name': 'Juniper', 'ticker': 'JNPR', 'exchange': 'US'},
+    ],
+    '네트워크칩': [
+        {'name': 'Broadcom', 'ticker': 'AVGO', 'exchange': 'US'},
+        {'name': 'Marvell', 'ticker': 'MRVL', 'exchange': 'US'},
+        {'name': 'Microchip', 'ticker': 'MCHP', 'exchange': 'US'},
+    ],
+    '광트랜시버': [
+        {'name': 'HFR', 'ticker': '230240.KQ', 'exchange': 'KR'},
+        {'name': '옵트론텍', 'ticker': '082210.KQ', 'exchange': 'KR'},
+    ],
+    '광섬유케이블': [
+        {'name': 'Corning', 'ticker': 'GLW', 'exchange': 'US'},
+        {'name': 'Prysmian', 'ticker': 'PRY.MI', 'exchange': 'EU'},
+    ],
+    '광학부품': [
+        {'name': 'Lumentum', 'ticker': 'LITE', 'exchange': 'US'},
+        {'name': 'II-VI', 'ticker': 'COHR', 'exchange': 'US'},
+    ],
+    'HBM메모리': [
+        {'name': 'SK hynix', 'ticker': '000660.KS', 'exchange': 'KR'},
+        {'name': 'Samsung', 'ticker': '005930.KS', 'exchange': 'KR'},
+        {'name': 'Micron', 'ticker': 'MU', 'exchange': 'US'},
+    ],
+    '반도체패키징': [
+        {'name': '한미반도체', 'ticker': '042700.KQ', 'exchange': 'KR'},
+        {'name': 'Amkor', 'ticker': 'AMKR', 'exchange': 'US'},
+        {'name': 'ASE Technology', 'ticker': '3711.TW', 'exchange': 'TW'},
+    ],
+    '스토리지': [
+        {'name': 'Western Digital', 'ticker': 'WDC', 'exchange': 'US'},
+        {'name': 'Seagate', 'ticker': 'STX', 'exchange': 'US'},
+        {'name': 'NetApp', 'ticker': 'NTAP', 'exchange': 'US'},
+    ],
+    '데이터센터REIT': [
+        {'name': 'Digital Realty', 'ticker': 'DLR', 'exchange': 'US'},
+        {'name': 'Equinix', 'ticker': 'EQIX', 'exchange': 'US'},
+        {'name': 'CyrusOne', 'ticker': 'CONE', 'exchange': 'US'},
+    ],
+}
+
+# 세부영역과 대분류/중분류 매핑
+SECTOR_MAPPING = {
+    'GPU': {'category': 'AI 인프라', 'sector': 'AI칩'},
+    'CPU': {'category': 'AI 인프라', 'sector': 'AI칩'},
+    '서버제조': {'category': 'AI 인프라', 'sector': 'AI서버'},
+    '전력관리': {'category': '전력/쿨링', 'sector': '전력'},
+    '전력기기': {'category': '전력/쿨링', 'sector': '전력'},
+    '발전기': {'category': '전력/쿨링', 'sector': '발전'},
+    'HVAC': {'category': '전력/쿨링', 'sector': '쿨링'},
+    '스위치': {'category': '네트워크', 'sector': '네트워크'},
+    '네트워크칩': {'category': '네트워크', 'sector': '네트워크'},
+    '광트랜시버': {'category': '네트워크', 'sector': '광통신'},
+    '광섬유케이블': {'category': '네트워크', 'sector': '광섬유'},
+    '광학부품': {'category': '네트워크', 'sector': '광통신'},
+    'HBM메모리': {'category': '메모리/스토리지', 'sector': 'HBM'},
+    '반도체패키징': {'category': '메모리/스토리지', 'sector': '패키징'},
+    '스토리지': {'category': '메모리/스토리지', 'sector': 'SSD'},
+    '데이터센터REIT': {'category': 'DC 부동산', 'sector': 'DC REIT'},
+}
+
+
+# ============================================================================
+# SCORING RULES (100점 만점)
+# ============================================================================
+
+# 구간표: 위에서부터 처음 만족하는 (기준값 이상, 점수) 적용, 모두 미달이면 FLOOR
+# 1. 시가총액 (30점)
+MARKET_CAP_TIERS = [
+    (100_000_000_000, 30),
+    (50_000_000_000, 25),
+    (10_000_000_000, 20),
+    (5_000_000_000, 15),
+    (1_000_000_000, 10),
+]
+MARKET_CAP_FLOOR = 5
+
+# 2. 거래량 추세 = 최근 20일 / 60일 평균 거래량 (20점)
+VOLUME_TREND_TIERS = [(1.5, 20), (1.2, 15), (1.0, 10)]
+VOLUME_TREND_FLOOR = 5
+
+# 3. 3개월 수익률 % (20점)
+RETURN_3M_TIERS = [(30, 20), (20, 17), (10, 14), (0, 10), (-10, 5)]
+RETURN_3M_FLOOR = 0
+
+# 4. 6개월 수익률 % (15점)
+RETURN_6M_TIERS = [(40, 15), (25, 12), (10, 9), (0, 6), (-15, 3)]
+RETURN_6M_FLOOR = 0
+
+# 5. 기술적 지표 (15점): 골든크로스 + RSI 구간 + 20일선 위
+GOLDEN_CROSS_POINTS = 6
+RSI_NEUTRAL_BAND = (40, 60)
+RSI_NEUTRAL_POINTS = 6
+RSI_WIDE_BAND = (30, 70)
+RSI_WIDE_POINTS = 3
+ABOVE_MA20_POINTS = 3
+
+# 점수 계산에 필요한 최소 봉 수 (6개월 수익률)
+MIN_BARS = 126
+
+
+def tier_points(values, tiers, floor):
+    """구간표 점수 (스칼라면 0차원 배열, 배열이면 같은 모양)"""
+    values = np.asarray(values, dtype=float)
+    return np.select([values >= threshold for threshold, _ in tiers],
+                     [points for _, points in tiers], default=floor)
+
+
+def technical_points(golden_cross, rsi, price, ma_20):
+    """기술적 지표 점수 (결측 비교는 False → 해당 항목 0점)"""
+    rsi = np.asarray(rsi, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        above_ma20 = (np.asarray(price, dtype=float) / ma_20 - 1) * 100 > 0
+    points = np.where(golden_cross, GOLDEN_CROSS_POINTS, 0)
+    points = points + np.select(
+        [(rsi >= RSI_NEUTRAL_BAND[0]) & (rsi <= RSI_NEUTRAL_BAND[1]),
+         (rsi >= RSI_WIDE_BAND[0]) & (rsi <= RSI_WIDE_BAND[1])],
+        [RSI_NEUTRAL_POINTS, RSI_WIDE_POINTS], default=0)
+    return points + np.where(above_ma20, ABOVE_MA20_POINTS, 0)
+
+
+def volume_trend_value(avg_volume_20, avg_volume_60):
+    """최근 20일 / 60일 평균 거래량 (60일 평균이 0 이하/결측이면 1)"""
+    avg_volume_60 = np.asarray(avg_volume_60, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trend = np.asarray(avg_volume_20, dtype=float) / avg_volume_60
+    return np.where(avg_volume_60 > 0, trend, 1.0)
+
+
+def selection_score(market_cap, volume_trend, return_3m, return_6m, golden_cross, rsi, price, ma_20):
+    """
+    종목 선정 점수 (100점 만점)
+
+    모든 인자는 스칼라 또는 같은 모양의 배열 (브로드캐스트 가능)
+    """
+    return (tier_points(market_cap, MARKET_CAP_TIERS, MARKET_CAP_FLOOR)
+            + tier_points(volume_trend, VOLUME_TREND_TIERS, VOLUME_TREND_FLOOR)
+            + tier_points(return_3m, RETURN_3M_TIERS, RETURN_3M_FLOOR)
+            + tier_points(return_6m, RETURN_6M_TIERS, RETURN_6M_FLOOR)
+            + technical_points(golden_cross, rsi, price, ma_20))
@@ -0,0 +1,353 @@
+"""
+종목 선정 점수 가중치/구간 기준 일괄 재채점 (오프라인)
+✅ 보관된 종목 선정 결과(all_candidates)의 원시 지표만 사용 → 네트워크 호출 없음
+✅ 가중치 × 구간 기준 배율 조합 수천 개를 배열 브로드캐스트로 한 번에 채점
+✅ 조합별 세부영역 1위 종목, 기본 규칙 대비 순위 안정성(1위 일치율, 순위 상관), 월간 1위 유지율
+
+조합 정의:
+    가중치: 5개 항목(시가총액/거래량/3개월/6개월/기술적) 배점 배율 → 합계 100점으로 정규화,
+            각 구간 점수는 기본 구간표를 같은 비율로 늘리거나 줄임
+    구간 기준 배율: 4개 구간표의 기준값에 곱함 (예: 1.2 → 3개월 30/20/10/0/-10% → 36/24/12/0/-12%)
+
+Usage:
+    python scripts/selection_sweep.py [--weight-factors 0.5,1,1.5] [--threshold-scales 0.8,1,1.2]
+                                      [--start 2026-01] [--output FILE.xlsx]
+"""
+
+import os
+import sys
+import glob
+import json
+import argparse
+import itertools
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from selection_model import (
+    MARKET_CAP_TIERS, MARKET_CAP_FLOOR, VOLUME_TREND_TIERS, VOLUME_TREND_FLOOR,
+    RETURN_3M_TIERS, RETURN_3M_FLOOR, RETURN_6M_TIERS, RETURN_6M_FLOOR,
+    GOLDEN_CROSS_POINTS, RSI_NEUTRAL_POINTS, ABOVE_MA20_POINTS, technical_points,
+)
+from snapshot_archive import PARTITION_COLUMN, read_dataset
+
+MARKET_DATA_DIR = 'market_data'
+ANALYSIS_DIR = 'analysis_reports'
+
+# 구간표 항목 (지표 열, 구간표, 최저 점수) — 가중치/배율 배열의 열 순서
+LADDERS = [
+    ('market_cap', MARKET_CAP_TIERS, MARKET_CAP_FLOOR),
+    ('volume_trend', VOLUME_TREND_TIERS, VOLUME_TREND_FLOOR),
+    ('return_3m', RETURN_3M_TIERS, RETURN_3M_FLOOR),
+    ('return_6m', RETURN_6M_TIERS, RETURN_6M_FLOOR),
+]
+COMPONENTS = [name for name, _, _ in LADDERS] + ['technical']
+BASE_WEIGHTS = np.array(
+    [max(p for _, p in tiers) for _, tiers, _ in LADDERS]
+    + [GOLDEN_CROSS_POINTS + RSI_NEUTRAL_POINTS + ABOVE_MA20_POINTS], dtype=float)
+
+FEATURE_COLUMNS = ['market_cap', 'volume_trend', 'return_3m', 'return_6m',
+                   'golden_cross', 'rsi', 'price', 'ma_20']
+
+# 한 번에 채점할 조합 수 (메모리 상한: 조합 × 행 × 구간 bool 배열)
+CONFIG_CHUNK = 2048
+
+
+# ============================================================================
+# DATA
+# ============================================================================
+
+def load_candidates(start=None, end=None):
+    """
+    보관된 종목 선정 후보 (date 열 포함, 날짜/파일 내 원래 순서 유지)
+
+    market_data/stock_selection_YYYYMMDD.json 을 우선 읽고, JSON이 없는 날짜는
+    Parquet 보관소(dataset=stock_selection)에서 채운다.
+    """
+    frames = {}
+    for path in sorted(glob.glob(f'{MARKET_DATA_DIR}/stock_selection_*.json')):
+        stamp = os.path.basename(path)[len('stock_selection_'):-len('.json')]
+        if not (len(stamp) == 8 and stamp.isdigit()):
+            continue
+        date = f'{stamp[:4]}-{stamp[4:6]}-{stamp[6:]}'
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = json.load(f).get('all_candidates', [])
+        if rows:
+            frames[date] = pd.DataFrame(rows)
+
+    try:
+        archived = read_dataset('stock_selection', start=start, end=end)
+    except Exception as e:
+        print(f"  [WARN] archive stock_selection: {str(e)[:80]}")
+        archived = pd.DataFrame(columns=[PARTITION_COLUMN])
+    for date, frame in archived.groupby(PARTITION_COLUMN, sort=True):
+        frames.setdefault(date, frame.drop(columns=[PARTITION_COLUMN]))
+
+    dates = sorted(d for d in frames
+                   if (not start or d[:len(start)] >= start) and (not end or d[:len(end)] <= end))
+    if not dates:
+        return pd.DataFrame(columns=['date', 'sub_sector', 'ticker'] + FEATURE_COLUMNS)
+    return pd.concat([frames[d].assign(date=d) for d in dates], ignore_index=True)
+
+
+# ============================================================================
+# CONFIG GRID
+# ============================================================================
+
+def build_grid(weight_factors=(0.5, 1.0, 1.5), threshold_scales=(0.8, 1.0, 1.2)):
+    """
+    가중치 배율 × 구간 기준 배율의 전체 조합
+
+    Returns:
+        (weights (C × 5), scales (C × 4)) — 0번 행은 항상 기본 규칙(30/20/20/15/15, 배율 1)
+    """
+    weights = np.array(list(itertools.product(weight_factors, repeat=len(COMPONENTS)))) * BASE_WEIGHTS
+    weights = weights[weights.sum(axis=1) > 0]
+    weights = weights * (100 / weights.sum(axis=1, keepdims=True))
+    # 비율이 같은 가중치 조합은 정규화 후 같아지므로 하나만 남김
+    weights = np.unique(np.round(weights, 6), axis=0)
+    scales = np.array(list(itertools.product(threshold_scales, repeat=len(LADDERS))), dtype=float)
+
+    weights = np.repeat(weights, len(scales), axis=0)
+    scales = np.tile(scales, (len(weights) // len(scales), 1))
+    base = np.all(np.isclose(weights, BASE_WEIGHTS) & np.all(scales == 1, axis=1, keepdims=True), axis=1)
+    order = np.r_[np.flatnonzero(base), np.flatnonzero(~base)]
+    weights, scales = weights[order], scales[order]
+    if not base.any():
+        weights = np.vstack([BASE_WEIGHTS, weights])
+        scales = np.vstack([np.ones(len(LADDERS)), scales])
+    # 기본 규칙은 기준 점수가 정확히 재현되도록 원래 값 그대로
+    weights[0], scales[0] = BASE_WEIGHTS, 1.0
+    return weights, scales
+
+
+# ============================================================================
+# SCORING
+# ============================================================================
+
+def ladder_points(values, thresholds, points, floor):
+    """
+    조합별 구간표 점수 (if/elif 구간표와 같이 처음 만족하는 구간 적용)
+
+    Args:
+        values: (N,) 지표 값
+        thresholds, points: (C × K) 조합별 기준값/점수
+        floor: (C,) 모두 미달일 때 점수
+
+    Returns:
+        (C × N)
+    """
+    met = values[None, :, None] >= thresholds[:, None, :]
+    first = met.argmax(axis=2)
+    return np.where(met.any(axis=2), np.take_along_axis(points, first, axis=1), floor[:, None])
+
+
+def score_grid(features, weights, scales):
+    """
+    전체 조합 점수 (C × N)
+
+    Args:
+        features: {지표: (N,) 배열} — FEATURE_COLUMNS
+        weights: (C × 5) 항목별 배점, scales: (C × 4) 구간 기준 배율
+    """
+    factors = weights / BASE_WEIGHTS
+    with np.errstate(invalid='ignore'):
+        total = factors[:, -1:] * technical_points(
+            features['golden_cross'], features['rsi'], features['price'], features['ma_20'])[None, :]
+        for i, (name, tiers, floor) in enumerate(LADDERS):
+            thresholds = np.array([t for t, _ in tiers], dtype=float)
+            points = np.array([p for _, p in tiers], dtype=float)
+            total = total + ladder_points(
+                np.asarray(features[name], dtype=float),
+                scales[:, i:i + 1] * thresholds[None, :],
+                factors[:, i:i + 1] * points[None, :],
+                factors[:, i] * floor)
+    return total
+
+
+def average_ranks(scores):
+    """행별 평균 순위 (동점은 평균 순위, 작은 값이 1)"""
+    less = (scores[:, None, :] < scores[:, :, None]).sum(axis=2)
+    equal = (scores[:, None, :] == scores[:, :, None]).sum(axis=2)
+    return less + (equal + 1) / 2
+
+
+def rank_correlation(ranks, base_ranks):
+    """조합별 순위와 기본 순위의 상관계수 (Spearman, 분산 0이면 NaN)"""
+    a = ranks - ranks.mean(axis=1, keepdims=True)
+    b = base_ranks - base_ranks.mean()
+    denom = np.sqrt((a ** 2).sum(axis=1) * (b ** 2).sum())
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (a * b).sum(axis=1) / denom
+
+
+def pool_groups(candidates):
+    """
+    (날짜, 세부영역) 그룹별 후보 행 위치 (C × G × K 선택용, 빈 칸 -1)
+
+    행 순서는 파일 내 순서 = 후보 Pool 순서이므로 동점 처리가 당일 선정과 같다.
+    """
+    groups = candidates.groupby(['date', 'sub_sector'], sort=False).indices
+    keys = sorted(groups, key=lambda key: groups[key].min())
+    members = [np.sort(groups[key]) for key in keys]
+    width = max(len(m) for m in members)
+    matrix = np.full((len(members), width), -1)
+    for g, idx in enumerate(members):
+        matrix[g, :len(idx)] = idx
+    return keys, matrix
+
+
+class SweepResult:
+    """
+    configs: 조합별 가중치/배율 + 안정성 지표 + 최근 날짜 세부영역별 1위
+    winners: (조합 × 날짜-세부영역 그룹) 1위 종목 티커
+    """
+
+    def __init__(self, configs, winners, groups):
+        self.configs = configs
+        self.winners = winners
+        self.groups = groups
+
+    def winner_share(self):
+        """최근 날짜 세부영역별 종목이 1위가 된 조합 비율 (%)"""
+        latest = max(date for date, _ in self.groups)
+        rows = []
+        for g, (date, sub_sector) in enumerate(self.groups):
+            if date != latest:
+                continue
+            counts = pd.Series(self.winners[:, g]).value_counts(normalize=True) * 100
+            for ticker, share in counts.items():
+                rows.append({'sub_sector': sub_sector, 'ticker': ticker, 'share': share,
+                             'baseline': ticker == self.winners[0, g]})
+        return pd.DataFrame(rows)
+
+
+def run_sweep(candidates, weights, scales, chunk=CONFIG_CHUNK):
+    """
+    모든 조합을 채점하고 조합별 1위/안정성 집계
+
+    Args:
+        candidates: load_candidates() 결과 (date, sub_sector, ticker + FEATURE_COLUMNS)
+        weights, scales: build_grid() 결과 (0번 행 = 기본 규칙)
+    """
+    candidates = candidates.reset_index(drop=True)
+    features = {col: candidates[col].to_numpy(dtype=float) for col in FEATURE_COLUMNS}
+    tickers = candidates['ticker'].to_numpy()
+    keys, members = pool_groups(candidates)
+    dates = sorted(set(candidates['date']))
+
+    # 순위 상관은 날짜별 고유 종목 기준 (여러 세부영역에 있는 종목 중복 제외)
+    row_dates = candidates['date'].to_numpy()
+    first = ~candidates.duplicated(['date', 'ticker']).to_numpy()
+    unique_rows = {d: np.flatnonzero((row_dates == d) & first) for d in dates}
+
+    base_scores = score_grid(features, weights[:1], scales[:1])
+    base_ranks = {d: average_ranks(base_scores[:, rows])[0] for d, rows in unique_rows.items()}
+
+    winner_rows = np.empty((len(weights), len(keys)), dtype=int)
+    correlations = np.empty((len(weights), len(dates)))
+    for lo in range(0, len(weights), chunk):
+        hi = min(lo + chunk, len(weights))
+        scores = score_grid(features, weights[lo:hi], scales[lo:hi])
+        grouped = np.where(members >= 0, scores[:, members], -np.inf)
+        best = grouped.argmax(axis=2)
+        winner_rows[lo:hi] = members[np.arange(len(keys)), best]
+        for j, d in enumerate(dates):
+            ranks = average_ranks(scores[:, unique_rows[d]])
+            correlations[lo:hi, j] = rank_correlation(ranks, base_ranks[d])
+
+    winners = tickers[winner_rows]
+    agreement = (winners == winners[:1]).mean(axis=1) * 100
+
+    configs = pd.DataFrame(np.round(weights, 2), columns=[f'w_{c}' for c in COMPONENTS])
+    for i, (name, _, _) in enumerate(LADDERS):
+        configs[f'scale_{name}'] = scales[:, i]
+    configs['winner_agreement'] = agreement
+    valid = ~np.isnan(correlations)
+    with np.errstate(invalid='ignore'):
+        configs['rank_corr'] = np.nansum(correlations, axis=1) / valid.sum(axis=1)
+
+    # 연속 날짜 사이 1위 유지율 (날짜가 2개 이상일 때)
+    group_index = {key: g for g, key in enumerate(keys)}
+    pairs = [(group_index[(a, s)], group_index[(b, s)])
+             for a, b in zip(dates, dates[1:]) for (d, s) in keys if d == b and (a, s) in group_index]
+    if pairs:
+        prev, curr = np.array(pairs).T
+        configs['winner_persistence'] = (winners[:, prev] == winners[:, curr]).mean(axis=1) * 100
+
+    latest_groups = [(g, s) for g, (d, s) in enumerate(keys) if d == dates[-1]]
+    for g, sub_sector in latest_groups:
+        configs[sub_sector] = winners[:, g]
+    configs.index.name = 'config'
+    return SweepResult(configs, winners, keys)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def _floats(text):
+    return tuple(float(x) for x in text.split(','))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rescore archived selection candidates under many weight/threshold settings')
+    parser.add_argument('--weight-factors', type=_floats, default=(0.5, 1.0, 1.5),
+                        help='항목별 배점 배율 후보 (쉼표 구분)')
+    parser.add_argument('--threshold-scales', type=_floats, default=(0.8, 1.0, 1.2),
+                        help='구간 기준값 배율 후보 (쉼표 구분)')
+    parser.add_argument('--start', help='시작 날짜 (YYYY-MM 또는 YYYY-MM-DD)')
+    parser.add_argument('--end', help='끝 날짜')
+    parser.add_argument('--output', help='엑셀 출력 경로 (기본 analysis_reports/selection_sweep_YYYYMMDD.xlsx)')
+    args = parser.parse_args(argv)
+
+    candidates = load_candidates(args.start, args.end)
+    if candidates.empty:
+        print("보관된 종목 선정 결과가 없습니다 (market_data/stock_selection_*.json 또는 archive)")
+        return 1
+    missing = [col for col in FEATURE_COLUMNS if col not in candidates.columns]
+    if missing:
+        print(f"필요한 지표 열이 없습니다: {', '.join(missing)}")
+        return 1
+
+    weights, scales = build_grid(args.weight_factors, args.threshold_scales)
+    dates = sorted(set(candidates['date']))
+    print(f"📂 선정 결과 {len(dates)}일 ({dates[0]} ~ {dates[-1]}), 후보 {len(candidates)}행")
+    print(f"🧮 조합 {len(weights)}개 채점 중...")
+
+    started = datetime.now()
+    result = run_sweep(candidates, weights, scales)
+    elapsed = (datetime.now() - started).total_seconds()
+
+    if 'score' in candidates.columns:
+        base = score_grid({c: candidates[c].to_numpy(dtype=float) for c in FEATURE_COLUMNS},
+                          weights[:1], scales[:1])[0]
+        same = np.allclose(base, candidates['score'].to_numpy(dtype=float))
+        print(f"✅ 기본 규칙 재채점 = 보관된 점수: {same}")
+
+    configs = result.configs
+    print(f"⏱️ {elapsed:.2f}초")
+    print(f"🎯 기본 규칙 대비 1위 일치율: 평균 {configs['winner_agreement'].mean():.1f}%, "
+          f"최저 {configs['winner_agreement'].min():.1f}%")
+    print(f"📈 순위 상관: 평균 {configs['rank_corr'].mean():.3f}, 최저 {configs['rank_corr'].min():.3f}")
+
+    share = result.winner_share()
+    print(f"\n🏆 {dates[-1]} 세부영역별 1위 (조합 비율)")
+    for sub_sector, group in share.groupby('sub_sector', sort=False):
+        top = group.sort_values('share', ascending=False)
+        print(f"  {sub_sector:12s} " + ', '.join(
+            f"{row.ticker}{'*' if row.baseline else ''} {row.share:.0f}%" for row in top.itertuples()))
+
+    output = args.output or f"{ANALYSIS_DIR}/selection_sweep_{datetime.now().strftime('%Y%m%d')}.xlsx"
+    from excel_writer import WorkbookWriter
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with WorkbookWriter(output) as book:
+        book.write_sheet('Configs', configs.round(3), index=True)
+        book.write_sheet('Winner_Share', share.round(1))
+    print(f"\n✅ Excel: {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
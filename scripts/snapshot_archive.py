@@ -0,0 +1,134 @@
+"""
+Date-partitioned Parquet archive of daily run outputs (market_data/archive/)
+✅ dataset=<이름>/date=YYYY-MM-DD/part.parquet 구조 (같은 날 재실행 시 덮어씀)
+✅ 읽기: 날짜 범위로 파티션을 먼저 거르고, 필요한 열/종목만 읽음
+✅ 기존 JSON 출력은 EXPORT_JSON=0이 아니면 계속 함께 저장
+"""
+
+import os
+import json
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+ARCHIVE_DIR = 'market_data/archive'
+PART_FILE = 'part.parquet'
+# 읽기 결과에 붙이는 파티션 날짜 열 (뉴스 레코드의 'date'(기사 pubDate)와 겹치지 않게)
+PARTITION_COLUMN = 'snapshot_date'
+
+# JSON 출력 유지 여부 (기본 유지)
+EXPORT_JSON = os.environ.get('EXPORT_JSON', '1') != '0'
+
+
+def _partition_dir(dataset, date):
+    return f'{ARCHIVE_DIR}/dataset={dataset}/date={date}'
+
+
+def _date_key(value):
+    """datetime / 'YYYYMMDD' / 'YYYY-MM-DD' → 'YYYY-MM-DD'"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d')
+    value = str(value)
+    if len(value) == 8 and value.isdigit():
+        return f'{value[:4]}-{value[4:6]}-{value[6:]}'
+    return value[:10]
+
+
+def records_to_frame(records):
+    """
+    dict 목록 → 보관용 DataFrame
+
+    dict 값(예: keyword_hits)은 JSON 문자열로, 리스트 값은 그대로(list 열) 저장한다.
+    """
+    rows = []
+    for record in records:
+        rows.append({
+            k: json.dumps(v, ensure_ascii=False) if isinstance(v, dict) else v
+            for k, v in record.items()
+        })
+    return pd.DataFrame(rows)
+
+
+def write_snapshot(dataset, df, date=None):
+    """
+    하루치 스냅샷 기록 (임시 파일 → rename)
+
+    Returns:
+        기록한 파일 경로 (행이 없으면 None)
+    """
+    if df is None or len(df) == 0:
+        return None
+    date = _date_key(date or datetime.now())
+    part_dir = _partition_dir(dataset, date)
+    os.makedirs(part_dir, exist_ok=True)
+    path = f'{part_dir}/{PART_FILE}'
+    tmp_file = path + '.tmp'
+    df.reset_index(drop=True).to_parquet(tmp_file, index=False)
+    os.replace(tmp_file, path)
+    return path
+
+
+def list_dates(dataset):
+    """보관된 날짜 목록 (오름차순, 'YYYY-MM-DD')"""
+    base = f'{ARCHIVE_DIR}/dataset={dataset}'
+    if not os.path.isdir(base):
+        return []
+    dates = []
+    for name in os.listdir(base):
+        if name.startswith('date=') and os.path.exists(f'{base}/{name}/{PART_FILE}'):
+            dates.append(name[len('date='):])
+    return sorted(dates)
+
+
+def read_dataset(dataset, start=None, end=None, columns=None, filters=None):
+    """
+    날짜 범위의 스냅샷을 하나의 DataFrame으로 (PARTITION_COLUMN 열 추가)
+
+    Args:
+        start/end: 포함 범위 (datetime 또는 'YYYY-MM-DD'/'YYYYMMDD'), 파티션 단위로 먼저 거름
+        columns: 읽을 열 (없으면 전체)
+        filters: pyarrow 행 필터, 예: [('ticker', '=', 'NVDA')]
+    """
+    start = _date_key(start) if start else None
+    end = _date_key(end) if end else None
+
+    frames = []
+    for date in list_dates(dataset):
+        if (start and date < start) or (end and date > end):
+            continue
+        path = f'{_partition_dir(dataset, date)}/{PART_FILE}'
+        try:
+            frame = pd.read_parquet(path, columns=columns, filters=filters)
+        except Exception as e:
+            # 해당 날짜에 요청한 열이 없는 등 스키마 차이는 건너뜀
+            print(f"  [WARN] archive {dataset} {date}: {str(e)[:80]}")
+            continue
+        if len(frame):
+            frame.insert(0, PARTITION_COLUMN, date)
+            frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=[PARTITION_COLUMN] + list(columns or []))
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_ticker_history(dataset, ticker, days, columns=None):
+    """최근 N일 중 특정 종목 행만"""
+    start = datetime.now() - timedelta(days=days)
+    if columns is not None and 'ticker' not in columns:
+        columns = ['ticker'] + list(columns)
+    return read_dataset(dataset, start=start, columns=columns, filters=[('ticker', '=', ticker)])
+
+
+def load_month(dataset, month, columns=None, filters=None):
+    """월 단위 (month: 'YYYY-MM')"""
+    return read_dataset(dataset, start=f'{month}-01', end=f'{month}-31', columns=columns, filters=filters)
+
+
+def save_json(path, data):
+    """선택적 JSON 출력 (EXPORT_JSON=0이면 건너뛰고 None 반환)"""
+    if not EXPORT_JSON:
+        return None
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return path
@@ -4,13 +4,19 @@
 ✅ 월 1회 실행하여 각 세부영역별 최적 종목 선정
 """
 
-import yfinance as yf
 import pandas as pd
-import requests
 import os
 import json
 from datetime import datetime, timedelta
 import warnings
+import http_client
+from price_cache import get_prices
+from indicators import compute_panel_indicators
+from fundamentals_cache import load_fundamentals_cache, save_fundamentals_cache, refresh_expired
+from excel_writer import WorkbookWriter
+from snapshot_archive import write_snapshot, records_to_frame, save_json
+from data_catalog import record_run
+from selection_model import CANDIDATE_POOLS, SECTOR_MAPPING, MIN_BARS, selection_score, volume_trend_value
 warnings.filterwarnings('ignore')
 
 print("="*80)
@@ -30,210 +36,38 @@ os.makedirs(MARKET_DATA_DIR, exist_ok=True)
 os.makedirs(ANALYSIS_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# 각 세부영역별 후보 종목 Pool
-CANDIDATE_POOLS = {
-    'GPU': [
-        {'name': 'NVIDIA', 'ticker': 'NVDA', 'exchange': 'US'},
-        {'name': 'AMD', 'ticker': 'AMD', 'exchange': 'US'},
-    ],
-    'CPU': [
-        {'name': 'Intel', 'ticker': 'INTC', 'exchange': 'US'},
-        {'name': 'AMD', 'ticker': 'AMD', 'exchange': 'US'},
-    ],
-    '서버제조': [
-        {'name': 'Super Micro', 'ticker': 'SMCI', 'exchange': 'US'},
-        {'name': 'Dell', 'ticker': 'DELL', 'exchange': 'US'},
-        {'name': 'HPE', 'ticker': 'HPE', 'exchange': 'US'},
-        {'name': 'Lenovo', 'ticker': '0992.HK', 'exchange': 'HK'},
-    ],
-    '전력관리': [
-        {'name': 'Vertiv', 'ticker': 'VRT', 'exchange': 'US'},
-        {'name': 'Eaton', 'ticker': 'ETN', 'exchange': 'US'},
-        {'name': 'Schneider Electric', 'ticker': 'SU.PA', 'exchange': 'EU'},
-    ],
-    '전력기기': [
-        {'name': 'LS ELECTRIC', 'ticker': '010120.KS', 'exchange': 'KR'},
-        {'name': 'LS', 'ticker': '006260.KS', 'exchange': 'KR'},
-    ],
-    '발전기': [
-        {'name': 'Cummins', 'ticker': 'CMI', 'exchange': 'US'},
-        {'name': 'Generac', 'ticker': 'GNRC', 'exchange': 'US'},
-        {'name': 'Caterpillar', 'ticker': 'CAT', 'exchange': 'US'},
-    ],
-    'HVAC': [
-        {'name': 'Johnson Controls', 'ticker': 'JCI', 'exchange': 'US'},
-        {'name': 'Trane Tech', 'ticker': 'TT', 'exchange': 'US'},
-        {'name': 'Carrier Global', 'ticker': 'CARR', 'exchange': 'US'},
-    ],
-    '스위치': [
-        {'name': 'Arista Networks', 'ticker': 'ANET', 'exchange': 'US'},
-        {'name': 'Cisco', 'ticker': 'CSCO', 'exchange': 'US'},
-        {'name': 'Juniper', 'ticker': 'JNPR', 'exchange': 'US'},
-    ],
-    '네트워크칩': [
-        {'name': 'Broadcom', 'ticker': 'AVGO', 'exchange': 'US'},
-        {'name': 'Marvell', 'ticker': 'MRVL', 'exchange': 'US'},
-        {'name': 'Microchip', 'ticker': 'MCHP', 'exchange': 'US'},
-    ],
-    '광트랜시버': [
-        {'name': 'HFR', 'ticker': '230240.KQ', 'exchange': 'KR'},
-        {'name': '옵트론텍', 'ticker': '082210.KQ', 'exchange': 'KR'},
-    ],
-    '광섬유케이블': [
-        {'name': 'Corning', 'ticker': 'GLW', 'exchange': 'US'},
-        {'name': 'Prysmian', 'ticker': 'PRY.MI', 'exchange': 'EU'},
-    ],
-    '광학부품': [
-        {'name': 'Lumentum', 'ticker': 'LITE', 'exchange': 'US'},
-        {'name': 'II-VI', 'ticker': 'COHR', 'exchange': 'US'},
-    ],
-    'HBM메모리': [
-        {'name': 'SK hynix', 'ticker': '000660.KS', 'exchange': 'KR'},
-        {'name': 'Samsung', 'ticker': '005930.KS', 'exchange': 'KR'},
-        {'name': 'Micron', 'ticker': 'MU', 'exchange': 'US'},
-    ],
-    '반도체패키징': [
-        {'name': '한미반도체', 'ticker': '042700.KQ', 'exchange': 'KR'},
-        {'name': 'Amkor', 'ticker': 'AMKR', 'exchange': 'US'},
-        {'name': 'ASE Technology', 'ticker': '3711.TW', 'exchange': 'TW'},
-    ],
-    '스토리지': [
-        {'name': 'Western Digital', 'ticker': 'WDC', 'exchange': 'US'},
-        {'name': 'Seagate', 'ticker': 'STX', 'exchange': 'US'},
-        {'name': 'NetApp', 'ticker': 'NTAP', 'exchange': 'US'},
-    ],
-    '데이터센터REIT': [
-        {'name': 'Digital Realty', 'ticker': 'DLR', 'exchange': 'US'},
-        {'name': 'Equinix', 'ticker': 'EQIX', 'exchange': 'US'},
-        {'name': 'CyrusOne', 'ticker': 'CONE', 'exchange': 'US'},
-    ],
-}
-
-# 세부영역과 대분류/중분류 매핑
-SECTOR_MAPPING = {
-    'GPU': {'category': 'AI 인프라', 'sector': 'AI칩'},
-    'CPU': {'category': 'AI 인프라', 'sector': 'AI칩'},
-    '서버제조': {'category': 'AI 인프라', 'sector': 'AI서버'},
-    '전력관리': {'category': '전력/쿨링', 'sector': '전력'},
-    '전력기기': {'category': '전력/쿨링', 'sector': '전력'},
-    '발전기': {'category': '전력/쿨링', 'sector': '발전'},
-    'HVAC': {'category': '전력/쿨링', 'sector': '쿨링'},
-    '스위치': {'category': '네트워크', 'sector': '네트워크'},
-    '네트워크칩': {'category': '네트워크', 'sector': '네트워크'},
-    '광트랜시버': {'category': '네트워크', 'sector': '광통신'},
-    '광섬유케이블': {'category': '네트워크', 'sector': '광섬유'},
-    '광학부품': {'category': '네트워크', 'sector': '광통신'},
-    'HBM메모리': {'category': '메모리/스토리지', 'sector': 'HBM'},
-    '반도체패키징': {'category': '메모리/스토리지', 'sector': '패키징'},
-    '스토리지': {'category': '메모리/스토리지', 'sector': 'SSD'},
-    '데이터센터REIT': {'category': 'DC 부동산', 'sector': 'DC REIT'},
-}
-
 
-def calculate_selection_score(ticker, name, exchange):
-    """종목 선정 점수 계산 (100점 만점)"""
+def calculate_selection_score(ticker, name, exchange, ind, market_cap):
+    """
+    종목 선정 점수 계산 (100점 만점)
+    ind: 지표 엔진의 종목별 지표 행, market_cap: 펀더멘털 캐시의 시가총액
+    """
     try:
-        stock = yf.Ticker(ticker)
-        
-        # 기본 정보
-        info = stock.info
-        market_cap = info.get('marketCap', 0)
-        
         # 가격 데이터
-        hist = stock.history(period="1y")
-        if hist.empty or len(hist) < 126:
+        if ind is None or ind['bars'] < MIN_BARS:
             print(f"  ⚠️ {name}: 데이터 부족")
             return None
         
-        current = hist['Close'].iloc[-1]
+        current = ind['price']
         
         # 수익률
-        return_3m = ((current / hist['Close'].iloc[-63]) - 1) * 100 if len(hist) >= 63 else 0
-        return_6m = ((current / hist['Close'].iloc[-126]) - 1) * 100 if len(hist) >= 126 else 0
+        return_3m = ind['return_3m']
+        return_6m = ind['return_6m']
         
         # 거래량
-        avg_volume_20 = hist['Volume'].rolling(20).mean().iloc[-1]
-        avg_volume_60 = hist['Volume'].rolling(60).mean().iloc[-1]
-        volume_trend = (avg_volume_20 / avg_volume_60) if avg_volume_60 > 0 else 1
+        volume_trend = float(volume_trend_value(ind['avg_volume_20'], ind['avg_volume_60']))
         
         # 이동평균
-        ma_20 = hist['Close'].rolling(20).mean().iloc[-1]
-        ma_60 = hist['Close'].rolling(60).mean().iloc[-1]
+        ma_20 = ind['ma_20']
+        ma_60 = ind['ma_60']
         golden_cross = ma_20 > ma_60
         
         # RSI
-        delta = hist['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        rsi_value = rsi.iloc[-1]
-        
-        # 점수 계산
-        score = 0
-        
-        # 1. 시가총액 점수 (30점)
-        if market_cap >= 100_000_000_000:
-            score += 30
-        elif market_cap >= 50_000_000_000:
-            score += 25
-        elif market_cap >= 10_000_000_000:
-            score += 20
-        elif market_cap >= 5_000_000_000:
-            score += 15
-        elif market_cap >= 1_000_000_000:
-            score += 10
-        else:
-            score += 5
-        
-        # 2. 거래량 점수 (20점)
-        if volume_trend >= 1.5:
-            score += 20
-        elif volume_trend >= 1.2:
-            score += 15
-        elif volume_trend >= 1.0:
-            score += 10
-        else:
-            score += 5
-        
-        # 3. 3개월 수익률 점수 (20점)
-        if return_3m >= 30:
-            score += 20
-        elif return_3m >= 20:
-            score += 17
-        elif return_3m >= 10:
-            score += 14
-        elif return_3m >= 0:
-            score += 10
-        elif return_3m >= -10:
-            score += 5
-        
-        # 4. 6개월 수익률 점수 (15점)
-        if return_6m >= 40:
-            score += 15
-        elif return_6m >= 25:
-            score += 12
-        elif return_6m >= 10:
-            score += 9
-        elif return_6m >= 0:
-            score += 6
-        elif return_6m >= -15:
-            score += 3
-        
-        # 5. 기술적 지표 점수 (15점)
-        tech_score = 0
-        if golden_cross:
-            tech_score += 6
-        if 40 <= rsi_value <= 60:
-            tech_score += 6
-        elif 30 <= rsi_value <= 70:
-            tech_score += 3
-        
-        price_vs_ma20 = (current / ma_20 - 1) * 100
-        if price_vs_ma20 > 0:
-            tech_score += 3
+        rsi_value = ind['rsi']
         
-        score += tech_score
+        # 점수 계산 (구간표는 selection_model 참고)
+        score = selection_score(market_cap, volume_trend, return_3m, return_6m,
+                                golden_cross, rsi_value, current, ma_20)
         
         return {
             'name': name,
@@ -256,12 +90,75 @@ def calculate_selection_score(ticker, name, exchange):
         return None
 
 
+def plan_unique_candidates():
+    """
+    전체 Pool에서 고유 종목 집합 수집 (최초 등장 순서 유지)
+
+    Returns:
+        {ticker: {'name', 'ticker', 'exchange', 'sub_sectors': [...]}}
+    """
+    plan = {}
+    for sub_sector, candidates in CANDIDATE_POOLS.items():
+        for candidate in candidates:
+            entry = plan.setdefault(candidate['ticker'], {**candidate, 'sub_sectors': []})
+            entry['sub_sectors'].append(sub_sector)
+    return plan
+
+
+def score_unique_candidates(plan):
+    """고유 종목별로 한 번씩만 가격 조회 및 점수 계산"""
+    tickers = list(plan)
+    print(f"📥 가격 데이터 일괄 다운로드 중... ({len(tickers)}개 종목)")
+    price_panel, fetch_failures = get_prices(tickers)
+    for ticker, reason in fetch_failures.items():
+        print(f"  ⚠️ {ticker}: {str(reason)[:80]}")
+    indicators = compute_panel_indicators(price_panel)
+    
+    # 시가총액: 가격 데이터가 충분한 종목 중 TTL 만료분만 .info 재조회
+    eligible = [t for t in tickers if t in indicators.index and indicators.loc[t, 'bars'] >= MIN_BARS]
+    fundamentals = load_fundamentals_cache()
+    cache_stats, revalidation = refresh_expired(fundamentals, eligible)
+    print(f"🏦 시가총액 캐시: 유효 {cache_stats['fresh']}개, 이전값 사용(백그라운드 재조회) "
+          f"{cache_stats['revalidating']}개, 조회 {cache_stats['refreshed']}개, "
+          f"조회 실패·이전값 {cache_stats['stale']}개, 없음 {cache_stats['missing']}개")
+    
+    scores = {}
+    for idx, (ticker, entry) in enumerate(plan.items(), 1):
+        print(f"  [{idx}/{len(plan)}] 분석 중: {entry['name']:20s} ... ", end='')
+        result = calculate_selection_score(
+            ticker,
+            entry['name'],
+            entry['exchange'],
+            indicators.loc[ticker] if ticker in indicators.index else None,
+            fundamentals.get(ticker, {}).get('market_cap') or 0
+        )
+        scores[ticker] = result
+        if result:
+            print(f"✅ {result['score']:.1f}점")
+        else:
+            print("❌")
+    
+    # 점수 계산 동안 진행된 재조회 결과는 다음 실행부터 사용
+    revalidated = revalidation.wait()
+    save_fundamentals_cache(fundamentals)
+    if cache_stats['revalidating']:
+        print(f"🏦 시가총액 재조회: 갱신 {revalidated['revalidated']}개, 실패 {revalidated['failed']}개")
+    return scores
+
+
 def select_best_stocks_per_sector():
     """각 세부영역별로 최고 점수 종목 선정"""
     
     selected_stocks = []
     all_candidates_data = []
     
+    plan = plan_unique_candidates()
+    total_listings = sum(len(entry['sub_sectors']) for entry in plan.values())
+    print(f"🗂️ 후보 등록 {total_listings}건 → 고유 종목 {len(plan)}개 "
+          f"(중복 조회 {total_listings - len(plan)}건 절약)\n")
+    
+    scores = score_unique_candidates(plan)
+    
     for sub_sector, candidates in CANDIDATE_POOLS.items():
         print(f"\n{'='*60}")
         print(f"📂 세부영역: {sub_sector}")
@@ -271,23 +168,20 @@ def select_best_stocks_per_sector():
         sector_results = []
         
         for candidate in candidates:
-            print(f"  분석 중: {candidate['name']:20s} ... ", end='')
-            result = calculate_selection_score(
-                candidate['ticker'],
-                candidate['name'],
-                candidate['exchange']
-            )
+            scored = scores.get(candidate['ticker'])
+            if not scored:
+                print(f"  {candidate['name']:20s} ... ❌")
+                continue
             
-            if result:
-                result['sub_sector'] = sub_sector
-                result['category'] = SECTOR_MAPPING[sub_sector]['category']
-                result['sector'] = SECTOR_MAPPING[sub_sector]['sector']
-                
-                sector_results.append(result)
-                all_candidates_data.append(result)
-                print(f"✅ {result['score']:.1f}점")
-            else:
-                print("❌")
+            # 같은 종목이 여러 세부영역에 있으므로 영역별 사본에 분류 정보 부여
+            result = dict(scored)
+            result['sub_sector'] = sub_sector
+            result['category'] = SECTOR_MAPPING[sub_sector]['category']
+            result['sector'] = SECTOR_MAPPING[sub_sector]['sector']
+            
+            sector_results.append(result)
+            all_candidates_data.append(result)
+            print(f"  {candidate['name']:20s} ... ✅ {result['score']:.1f}점")
         
         # 점수 순으로 정렬
         sector_results.sort(key=lambda x: x['score'], reverse=True)
@@ -342,9 +236,18 @@ json_data = {
     'selected_stocks': selected,
     'all_candidates': all_candidates
 }
-with open(json_file, 'w', encoding='utf-8') as f:
-    json.dump(json_data, f, indent=2, ensure_ascii=False)
-print(f"✅ JSON: {json_file}")
+json_file = save_json(json_file, json_data)
+if json_file:
+    print(f"✅ JSON: {json_file}")
+
+# 날짜 파티션 Parquet 보관 (전체 후보 + 선정 여부)
+selected_ids = {id(stock) for stock in selected}
+archive_df = records_to_frame(all_candidates)
+if len(archive_df):
+    archive_df['selected'] = [id(stock) in selected_ids for stock in all_candidates]
+archive_file = write_snapshot('stock_selection', archive_df, now)
+if archive_file:
+    print(f"✅ Archive: {os.path.dirname(archive_file)}")
 
 # 2. Excel 저장 (analysis_reports/)
 df_selected = pd.DataFrame(selected)
@@ -352,7 +255,7 @@ df_all = pd.DataFrame(all_candidates)
 
 excel_file = f'{ANALYSIS_DIR}/stock_selection_{date_str}.xlsx'
 
-with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
+with WorkbookWriter(excel_file) as book:
     # Sheet 1: 선정 결과
     df_export = df_selected[[
         'name', 'ticker', 'category', 'sector', 'sub_sector',
@@ -368,7 +271,7 @@ with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
     ]
     
     df_export = df_export.round(2)
-    df_export.to_excel(writer, sheet_name='선정결과', index=False)
+    book.write_sheet('선정결과', df_export)
     
     # Sheet 2: 전체 후보 종목
     df_all_export = df_all[[
@@ -376,7 +279,7 @@ with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
         'score', 'market_cap', 'return_3m', 'return_6m'
     ]].copy()
     df_all_export['market_cap'] = df_all_export['market_cap'] / 1e9
-    df_all_export.to_excel(writer, sheet_name='전체후보종목', index=False)
+    book.write_sheet('전체후보종목', df_all_export)
     
     # Sheet 3: 대분류별 통계
     category_stats = df_selected.groupby('category').agg({
@@ -385,14 +288,14 @@ with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
         'name': 'count'
     }).round(2)
     category_stats.columns = ['평균점수', '평균3개월수익률', '종목수']
-    category_stats.to_excel(writer, sheet_name='대분류별통계')
+    book.write_sheet('대분류별통계', category_stats, index=True)
     
     # Sheet 4: 점수 상위 종목
     top_scores = df_selected.nlargest(10, 'score')[[
         'name', 'category', 'sub_sector', 'score', 'return_3m'
     ]].copy()
     top_scores.columns = ['종목명', '대분류', '세부분류', '점수', '3개월수익률']
-    top_scores.to_excel(writer, sheet_name='점수TOP10', index=False)
+    book.write_sheet('점수TOP10', top_scores)
     
     # Sheet 5: 선정 기준
     criteria_df = pd.DataFrame({
@@ -406,7 +309,7 @@ with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
             '골든크로스, RSI 중립구간, 20일선 상향'
         ]
     })
-    criteria_df.to_excel(writer, sheet_name='선정기준', index=False)
+    book.write_sheet('선정기준', criteria_df)
 
 print(f"✅ Excel: {excel_file}")
 
@@ -480,7 +383,8 @@ for idx, (_, row) in enumerate(df_selected.nlargest(5, 'score').iterrows(), 1):
     summary += f"{idx}. {row['name']} ({row['score']:.1f}점)\n"
 
 summary += f"\n💾 저장:\n"
-summary += f"- JSON: {os.path.basename(json_file)}\n"
+if json_file:
+    summary += f"- JSON: {os.path.basename(json_file)}\n"
 summary += f"- Excel: {os.path.basename(excel_file)}\n"
 summary += f"- Markdown: {os.path.basename(md_file)}\n\n"
 summary += f"✅ GitHub에 push 완료\n"
@@ -490,7 +394,7 @@ url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
 payload = {"chat_id": TELEGRAM_CHAT_ID, "text": summary}
 
 try:
-    response = requests.post(url, data=payload)
+    response = http_client.post(url, data=payload)
     if response.status_code == 200:
         print("✅ 텔레그램 전송 성공!")
     else:
@@ -498,6 +402,15 @@ try:
 except Exception as e:
     print(f"❌ 오류: {e}")
 
+# 카탈로그 갱신
+record_run(
+    'stock_selection', now, len(all_candidates), [c['ticker'] for c in all_candidates],
+    [json_file, excel_file, md_file, archive_file],
+    extra={'selected': {s['sub_sector']: s['ticker'] for s in selected}},
+)
+
+http_client.print_http_stats()
+
 print("\n" + "="*80)
 print("✅ 작업 완료 - Data saved to repo, summary sent to Telegram")
 print("💡 Tip: 매월 1일에 이 스크립트를 실행하여 종목을 업데이트하세요.")
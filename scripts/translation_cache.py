@@ -0,0 +1,81 @@
+"""
+Persistent translation cache for Papago (market_data/translation_cache.json)
+✅ 원문 + 언어쌍 + 절단 길이의 해시를 키로 하는 content-addressed 캐시
+✅ 최대 항목 수 기반 LRU 제거
+✅ 적중률 / 절약한 문자 수 통계
+"""
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+
+TRANSLATION_CACHE_FILE = 'market_data/translation_cache.json'
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.environ.get('TRANSLATION_CACHE_MAX_ENTRIES', 5000))
+
+
+def cache_key(text, source, target, max_length):
+    """Cache key: sha256 of language pair, truncation length and source text"""
+    raw = f'{source}\x1f{target}\x1f{max_length}\x1f{text}'
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+
+class TranslationCache:
+    """Size-bounded LRU translation cache persisted as JSON"""
+
+    def __init__(self, path=TRANSLATION_CACHE_FILE, max_entries=TRANSLATION_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.saved_chars = 0
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # 파일에는 오래된 항목부터 저장되어 있음
+            self.entries = OrderedDict(data.get('entries', []))
+        except Exception:
+            self.entries = OrderedDict()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {
+            'last_updated': datetime.now().isoformat(),
+            'entries': list(self.entries.items()),
+        }
+        tmp_file = self.path + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_file, self.path)
+
+    def get(self, key, source_text=''):
+        """Return cached translation (and mark as recently used) or None"""
+        translated = self.entries.get(key)
+        if translated is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        self.saved_chars += len(source_text)
+        return translated
+
+    def put(self, key, translated):
+        self.entries[key] = translated
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0.0,
+            'saved_chars': self.saved_chars,
+        }
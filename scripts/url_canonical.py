@@ -0,0 +1,85 @@
+"""
+Canonical URL resolution for seen-link dedupe
+✅ 추적용 쿼리 파라미터(utm_*, fbclid, oc 등) 제거, 호스트/스킴 정규화
+✅ Google News /articles/ 래퍼 링크는 ID(base64 protobuf)에 원문 URL이 있으면 풀어냄
+✅ 네트워크 조회 없는 순수 문자열 변환 → 캐시 없이 매번 계산
+"""
+
+import base64
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+TRACKING_PARAM_PREFIXES = ('utm_',)
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'ocid', 'cmpid',
+    'oc', 'ref', 'ref_src', 'rssfeed',
+}
+HOST_PREFIXES = ('www.', 'm.', 'mobile.')
+
+GOOGLE_NEWS_HOST = 'news.google.com'
+# 구형 기사 ID: 0x08 0x13 0x22 <길이> <URL> ...
+_GOOGLE_ID_PREFIX = b'\x08\x13\x22'
+
+
+def normalize_url(url):
+    """스킴/호스트 소문자화, www./m. 제거, 추적 파라미터·프래그먼트 제거, 쿼리 정렬"""
+    url = url.strip()
+    parts = urlsplit(url)
+    if not parts.netloc:
+        return url
+
+    host = (parts.hostname or '').lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PARAM_PREFIXES)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while pos < len(data):
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+    raise ValueError('truncated varint')
+
+
+def decode_google_news_url(url):
+    """
+    Google News 기사 래퍼에서 원문 URL 추출 (가능한 경우만)
+
+    ID가 원문 URL을 직접 담은 구형 형식만 풀 수 있고, 서버 조회가 필요한
+    신형 ID(AU_yqL...)는 None을 반환한다.
+    """
+    parts = urlsplit(url)
+    if (parts.hostname or '').lower() != GOOGLE_NEWS_HOST or '/articles/' not in parts.path:
+        return None
+    article_id = parts.path.rsplit('/articles/', 1)[1].split('/')[0]
+    try:
+        data = base64.urlsafe_b64decode(article_id + '=' * (-len(article_id) % 4))
+    except (ValueError, TypeError):
+        return None
+    if not data.startswith(_GOOGLE_ID_PREFIX):
+        return None
+    try:
+        length, pos = _read_varint(data, len(_GOOGLE_ID_PREFIX))
+        original = data[pos:pos + length].decode('utf-8')
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return original if original.startswith(('http://', 'https://')) else None
+
+
+def canonical_url(url):
+    """수집 링크 → 중복 검사용 정규 URL (Google 래퍼는 풀 수 있으면 원문 기준)"""
+    return normalize_url(decode_google_news_url(url) or url)